@@ -0,0 +1,221 @@
+"""law_processor 성능 측정 스크립트
+
+기본적으로 law_mock_server 의 대체 서버를 같은 프로세스에서 띄워 측정한다.
+--no-server 를 주면 LAW_BASE 로 지정한 서버(또는 law.go.kr)를 그대로 사용한다.
+
+사용법:
+    python app/law_benchmark.py e2e --laws 300 --latency 0.05
+    python app/law_benchmark.py e2e --workers 1 --workers 8
+    python app/law_benchmark.py parse --laws 20 --articles 600
+    python app/law_benchmark.py processes --laws 100 --articles 200 --processes 4
+    python app/law_benchmark.py chunks --laws 50 --articles 200 --find 법원
+    python app/law_benchmark.py terms --laws 60 --articles 100 --terms 1 --terms 16 --terms 256
+    LAW_BASE=http://127.0.0.1:8800 python app/law_benchmark.py e2e --no-server
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+import law_mock_server
+import law_processor
+
+def quiet():
+    """law_processor 의 디버깅 출력 숨기기"""
+    return contextlib.redirect_stdout(io.StringIO())
+
+def timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    with quiet():
+        result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def report(label, seconds, server=None, extra=""):
+    line = f"{label:<32} {seconds:8.3f}s"
+    if server is not None:
+        stats = server.stats
+        line += f"  요청 {stats['requests']:5d}  연결 {stats['connections']:4d}  오류 {stats['errors']:3d}"
+    print(line + (f"  {extra}" if extra else ""))
+    if server is not None:
+        server.reset_stats()
+
+def bench_e2e(args, server):
+    """검색/개정문 생성 전체 소요 시간 (캐시 없음 → 캐시 있음)"""
+    for workers in args.workers or [law_processor.FETCH_WORKERS]:
+        law_processor.configure_cache(cache_dir=tempfile.mkdtemp(prefix="law-bench-"))
+        law_processor.invalidate_law_list_cache()
+        law_processor.invalidate_parsed_law_cache()
+        law_processor.configure_http()
+        seconds, result = timed(law_processor.run_amendment_logic, args.find, args.replace, max_workers=workers)
+        report(f"amend cold (workers={workers})", seconds, server, f"법률 {len(result)}개")
+        seconds, result = timed(law_processor.run_search_logic, args.find, max_workers=workers)
+        report(f"search warm (workers={workers})", seconds, server, f"법률 {len(result)}개")
+        law_processor.invalidate_law_list_cache()
+        law_processor.invalidate_parsed_law_cache()
+        seconds, result = timed(law_processor.run_amendment_logic, args.find, args.replace, max_workers=workers)
+        report(f"amend disk-cache (workers={workers})", seconds, server, f"법률 {len(result)}개")
+        law_processor.invalidate_law_list_cache()
+        seconds, result = timed(law_processor.run_amendment_logic, args.find, args.replace, max_workers=workers)
+        report(f"amend parsed-cache (workers={workers})", seconds, server, f"법률 {len(result)}개")
+
+def bench_parse(args, server):
+    """법령 본문 파싱 → 조문 구조 생성 → 검색/개정문 생성 엔진 소요 시간 (XML 파서별, 네트워크 없음)"""
+    corpus = law_mock_server.build_corpus(laws=args.laws, articles=args.articles)
+    size = sum(len(law["xml"]) for law in corpus)
+    backends = ["etree"] + (["lxml"] if law_processor.lxml_etree is not None else [])
+    baseline = None
+    for backend in backends:
+        def parse_only():
+            return sum(1 for law in corpus for _ in law_processor.iter_law_articles(law["xml"], backend))
+
+        def parse_law():
+            return [tuple(law_processor.build_law_article(article)
+                          for article in law_processor.iter_law_articles(law["xml"], backend))
+                    for law in corpus]
+
+        seconds, count = timed(parse_only)
+        report(f"parse ({backend})", seconds, extra=f"조문 {count}개, {size / 1e6:.1f}MB")
+        build_seconds, parsed = timed(parse_law)
+        report(f"parse+build ({backend})", build_seconds)
+        seconds, rules = timed(lambda: [law_processor.build_amendment_rules(articles, args.find, args.replace)
+                                        for articles in parsed])
+        report(f"amend ({backend})", seconds)
+        seconds, hits = timed(lambda: [law_processor.build_search_results(articles, args.find) for articles in parsed])
+        report(f"search ({backend})", seconds)
+        if baseline is None:
+            baseline = (rules, hits)
+            law_processor.configure_cache(cache_dir=tempfile.mkdtemp(prefix="law-bench-"))
+            for law, articles in zip(corpus, parsed):
+                law_processor.put_cached_parsed_law(law["MST"], articles)
+            seconds, loaded = timed(lambda: [law_processor.get_cached_parsed_law(law["MST"]) for law in corpus])
+            report("load parsed (disk cache)", seconds, extra=f"parse+build 의 {seconds / build_seconds:.0%}")
+        elif baseline != (rules, hits):
+            print(f"  ⚠️ {backend} 결과가 {backends[0]} 와 다름")
+    if len(backends) == 1:
+        print("lxml 이 설치되어 있지 않아 etree 만 측정")
+
+def bench_processes(args, server):
+    """본문이 캐시된 상태에서 파싱/매칭을 스레드 파이프라인 대 프로세스 풀로 실행"""
+    law_processor.configure_cache(cache_dir=tempfile.mkdtemp(prefix="law-bench-"))
+    law_processor.configure_http()
+    timed(law_processor.run_amendment_logic, args.find, args.replace)  # 본문 캐시 채우기
+    if server is not None:
+        server.reset_stats()
+    baseline = None
+    for processes in [0] + (args.processes or [2, 4]):
+        label = f"processes={processes}" if processes else "threads"
+        for run in ("cold", "warm"):
+            # cold: 파싱된 법령 캐시 없음 (XML 파싱부터), warm: 디스크/메모리의 파싱된 법령 사용
+            law_processor.invalidate_law_list_cache()
+            law_processor.invalidate_parsed_law_cache()
+            if run == "cold":
+                law_processor.configure_cache(cache_dir=law_processor.CACHE_DIR)
+                for path, _ in list(law_processor._iter_cache_files()):
+                    if os.sep + "parsed" + os.sep in path:
+                        os.remove(path)
+            seconds, result = timed(law_processor.run_amendment_logic, args.find, args.replace, processes=processes)
+            report(f"amend {run} ({label})", seconds, server, f"법률 {len(result)}개")
+            if baseline is None:
+                baseline = result
+            elif result != baseline:
+                print(f"  ⚠️ {label} 결과가 threads 와 다름")
+    law_processor.shutdown_process_pool()
+
+def bench_chunks(args, server):
+    """검색어가 든 단어 하나에서 덩어리/조사/접미사를 가르는 데 드는 시간 (extract_chunk_and_josa, 네트워크 없음)"""
+    corpus = law_mock_server.build_corpus(laws=args.laws, articles=args.articles)
+    tokens = []
+    for law in corpus:
+        articles = law_processor.parse_law({"MST": law["MST"]}, law["xml"], cache=False)
+        for _, text, _ in law_processor.iter_law_text_records(articles, include_부칙=False):
+            if text and args.find in text:
+                tokens.extend(law_processor.iter_matching_tokens(text, args.find))
+    repeat = max(1, 200000 // max(len(tokens), 1))
+
+    def classify():
+        for _ in range(repeat):
+            for token in tokens:
+                law_processor.extract_chunk_and_josa(token, args.find)
+
+    seconds, _ = timed(classify)
+    calls = repeat * len(tokens)
+    report("extract_chunk_and_josa", seconds,
+           extra=f"단어 {len(tokens)}개 x {repeat}회, 단어당 {seconds / max(calls, 1) * 1e9:.0f}ns")
+
+def bench_terms(args, server):
+    """찾을 단어 수에 따른 여러 단어 개정문 생성 시간 - 단어마다 훑기 대 오토마톤으로 한 번 훑기 (네트워크 없음)
+    - 찾을 단어는 --find 와 임의로 만든 2~4글자 낱말들 (고정 시드, 대부분 본문에 없어 훑는 비용만 늘어남)
+    """
+    corpus = law_mock_server.build_corpus(laws=args.laws, articles=args.articles)
+    parsed = [law_processor.parse_law({"MST": law["MST"]}, law["xml"], cache=False) for law in corpus]
+    texts = [text for articles in parsed
+             for _, text, _ in law_processor.iter_law_text_records(articles, include_부칙=False) if text]
+    rng = random.Random(0)
+    vocabulary = ["".join(chr(0xAC00 + rng.randrange(11172)) for _ in range(rng.randint(2, 4)))
+                  for _ in range(max(args.terms or [256]))]
+    saved = law_processor.AUTOMATON_MIN_TERMS
+    try:
+        for count in args.terms or [1, 4, 16, 64, 256]:
+            words = [args.find] + vocabulary[:count - 1]
+            pairs = [(word, word + "청") for word in words]
+            seconds, _ = timed(lambda: [word in text for text in texts for word in words])
+            report(f"scan {count} terms (str in)", seconds, extra=f"본문 {len(texts)}개")
+            automaton = law_processor.TermAutomaton(words)
+            seconds, _ = timed(lambda: [automaton.find(text) for text in texts])
+            report(f"scan {count} terms (automaton)", seconds)
+            results = []
+            for label, min_terms in (("str in", len(pairs) + 1), ("automaton", 1)):
+                law_processor.AUTOMATON_MIN_TERMS = min_terms
+                seconds, result = timed(lambda: [law_processor.build_batch_amendment_rules(articles, pairs)
+                                                 for articles in parsed])
+                report(f"batch {count} terms ({label})", seconds)
+                results.append(result)
+            if results[0] != results[1]:
+                print(f"  ⚠️ {count}개 단어에서 오토마톤 결과가 다름")
+    finally:
+        law_processor.AUTOMATON_MIN_TERMS = saved
+
+BENCHMARKS = {
+    "e2e": bench_e2e,
+    "parse": bench_parse,
+    "processes": bench_processes,
+    "chunks": bench_chunks,
+    "terms": bench_terms,
+}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="law_processor 성능 측정")
+    parser.add_argument("scenario", choices=sorted(BENCHMARKS), nargs="?", default="e2e")
+    parser.add_argument("--no-server", action="store_true", help="대체 서버를 띄우지 않고 LAW_BASE 사용")
+    parser.add_argument("--laws", type=int, default=200, help="대체 서버의 법률 수")
+    parser.add_argument("--articles", type=int, default=30, help="법률당 평균 조문 수")
+    parser.add_argument("--latency", type=float, default=0.02, help="대체 서버 응답 지연 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="대체 서버 503 응답 확률")
+    parser.add_argument("--workers", type=int, action="append", help="동시 수집 개수 (여러 번 지정 가능)")
+    parser.add_argument("--processes", type=int, action="append", help="processes 시나리오의 프로세스 수 (여러 번 지정 가능)")
+    parser.add_argument("--terms", type=int, action="append", help="terms 시나리오의 찾을 단어 수 (여러 번 지정 가능)")
+    parser.add_argument("--find", default="지방법원")
+    parser.add_argument("--replace", default="지역법원")
+    args = parser.parse_args(argv)
+
+    server = None
+    if not args.no_server:
+        server = law_mock_server.start_server(laws=args.laws, articles=args.articles,
+                                              latency=args.latency, error_rate=args.error_rate)
+        law_processor.BASE = server.base_url
+        print(f"대체 서버: {server.base_url} (법률 {args.laws}개, 지연 {args.latency}s, 오류율 {args.error_rate})")
+    else:
+        print(f"서버: {law_processor.BASE}")
+    try:
+        BENCHMARKS[args.scenario](args, server)
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,21 +1,41 @@
 import streamlit as st
 import os
+import sys
 import importlib.util
 
 st.set_page_config(layout="wide")
 
 st.markdown("<h1 style='font-size:20px;'>📘 부칙개정 도우미 (100.001.14.12)</h1>", unsafe_allow_html=True)
 
-base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
-processor_path = os.path.join(base_dir, "law_processor.py")
-spec = importlib.util.spec_from_file_location("law_processor", processor_path)
-law_processor = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(law_processor)
+@st.cache_resource
+def load_law_processor():
+    """law_processor 모듈을 프로세스당 한 번만 로드 (HTTP 연결 풀을 세션/재실행 간에 공유)"""
+    base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "app"))
+    processor_path = os.path.join(base_dir, "law_processor.py")
+    spec = importlib.util.spec_from_file_location("law_processor", processor_path)
+    module = importlib.util.module_from_spec(spec)
+    # LAW_PROCESS_WORKERS 사용 시 작업 프로세스가 같은 모듈을 이름으로 import 할 수 있도록 등록
+    sys.modules["law_processor"] = module
+    if base_dir not in sys.path:
+        sys.path.append(base_dir)
+    spec.loader.exec_module(module)
+    return module
+
+law_processor = load_law_processor()
 
 run_amendment_logic = law_processor.run_amendment_logic
+run_batch_amendment_logic = law_processor.run_batch_amendment_logic
 # run_search_logic = lambda q, u: {}  # placeholder (기본형에서 미사용)
 run_search_logic = law_processor.run_search_logic 
 
+def show_fetch_error(e):
+    """LawFetchError 안내 → 함께 받은 나머지 결과 (목록을 받지 못했으면 None)"""
+    if e.results is None:
+        st.error(f"법제처 서버에서 자료를 받지 못했습니다. 잠시 후 다시 시도해주세요. ({e})")
+        return None
+    st.warning(f"법제처 서버에서 일부 법률의 본문을 받지 못해 아래 결과에서 빠졌습니다. 잠시 후 다시 시도해주세요. ({e})")
+    return e.results
+
 with st.expander("ℹ️ 사용법 안내"):
     st.markdown(      
              "- 이 앱은 다음 두 가지 기능을 제공합니다:\n"
@@ -24,22 +44,34 @@ with st.expander("ℹ️ 사용법 안내"):
         "     - 다중검색어 또는 논리연산자(AND, OR, NOT 등)는 지원하지 않습니다. 빠르지 않은 시간 내에 개선예정입니다. \n" 
         "  2. **개정문 생성**: 특정 단어를 다른 단어로 대체하는 부칙 개정문을 자동 생성합니다.\n"
         "     - 21번째 항목부터는 원문자가 아닌 일반숫자로 항목 번호가 표기됩니다. 오류가 아닙니다. 개선예정.\n" 
+        "     - 여러 단어를 한꺼번에 바꿀 때는 아래 '여러 단어 개정문 생성'에 한 줄에 한 쌍씩 입력하세요. 같은 단어를 두 쌍 이상이 바꾸는 곳은 ⚠️ 로 표시됩니다.\n" 
         "- 이 앱은 업무망에서는 작동하지 않습니다. 인터넷망에서 사용해주세요. \n"
         "- 속도가 느립니다. 네트워크 속도나 시스템 성능 탓이 아닙니다. 손으로 하는 것보다는 빠르겠지 싶은 경우에만 사용해주세요. \n"
         "- 오류가 있을 수 있습니다. 오류를 발견하시는 분은 사법법제과 김재우(jwkim@assembly.go.kr)로 알려주시면 감사하겠습니다. (캡쳐파일도 같이 주시면 좋아요)"
     )
   
+if law_processor.OFFLINE:
+    manifest = law_processor.load_mirror_manifest()
+    if manifest:
+        st.info(f"📦 오프라인 모드: 로컬 미러 사용 (법률 {len(manifest['laws'])}개, 마지막 동기화 {manifest['synced_at']})")
+    else:
+        st.warning("오프라인 모드이지만 로컬 미러가 없습니다. 인터넷망에서 'python app/law_processor.py sync' 로 먼저 동기화해주세요.")
+
 st.header("🔍 검색 기능")
 search_query = st.text_input("검색어 입력", key="search_query")
 do_search = st.button("검색 시작")
 if do_search and search_query:
     with st.spinner("🔍 검색 중..."):
-        result = law_processor.run_search_logic(search_query, unit="법률")
-        st.success(f"{len(result)}개의 법률을 찾았습니다")
-        for law_name, sections in result.items():
-            with st.expander(f"📄 {law_name}"):
-                for html in sections:
-                    st.markdown(html, unsafe_allow_html=True)
+        try:
+            result = law_processor.run_search_logic(search_query, unit="법률")
+            st.success(f"{len(result)}개의 법률을 찾았습니다")
+        except law_processor.LawFetchError as e:
+            result = show_fetch_error(e)
+        if result is not None:
+            for law_name, sections in result.items():
+                with st.expander(f"📄 {law_name}"):
+                    for html in sections:
+                        st.markdown(html, unsafe_allow_html=True)
 
 st.header("✏️ 타법개정문 생성")
 find_word = st.text_input("찾을 단어")
@@ -48,7 +80,32 @@ do_amend = st.button("개정문 생성")
 
 if do_amend and find_word and replace_word:
     with st.spinner("🛠 개정문 생성 중..."):
-        result = run_amendment_logic(find_word, replace_word)
-        st.success("개정문 생성 완료")
-        for amend in result:
-            st.markdown(amend, unsafe_allow_html=True)
+        try:
+            result = run_amendment_logic(find_word, replace_word)
+            st.success("개정문 생성 완료")
+        except law_processor.LawFetchError as e:
+            result = show_fetch_error(e)
+        if result is not None:
+            for amend in result:
+                st.markdown(amend, unsafe_allow_html=True)
+
+st.header("🗂 여러 단어 개정문 생성")
+pair_text = st.text_area("찾을 단어와 바꿀 단어 (한 줄에 한 쌍, 예: 지방법원 지역법원 또는 지방법원=지역법원)")
+do_batch = st.button("여러 단어 개정문 생성")
+
+if do_batch and pair_text.strip():
+    try:
+        pairs = law_processor.parse_amendment_pairs(pair_text)
+    except ValueError as e:
+        st.error(str(e))
+        pairs = []
+    if pairs:
+        with st.spinner(f"🛠 {len(pairs)}쌍의 개정문 생성 중..."):
+            try:
+                result = run_batch_amendment_logic(pairs)
+                st.success("개정문 생성 완료")
+            except law_processor.LawFetchError as e:
+                result = show_fetch_error(e)
+            if result is not None:
+                for amend in result:
+                    st.markdown(amend, unsafe_allow_html=True)
@@ -0,0 +1,289 @@
+"""law.go.kr DRF 대체 로컬 서버 (오프라인 성능 측정 및 개발용)
+
+lawSearch.do / lawService.do 를 같은 XML 스키마로 흉내낸다.
+지연시간, 오류율, 응답 크기를 조절할 수 있다.
+
+사용법:
+    python app/law_mock_server.py --port 8800 --laws 300 --latency 0.05 --error-rate 0.05
+    LAW_BASE=http://127.0.0.1:8800 python app/law_processor.py amend 지방법원 지역법원
+    LAW_BASE=http://127.0.0.1:8800 streamlit run app/law_editor_app.py
+
+LAW_BASE 를 바꾸면 law_processor 의 캐시와 미러는 hosts/127.0.0.1_8800 아래에 따로 쌓인다.
+"""
+import argparse
+import random
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+# 본문에 섞어 넣을 검색어 후보
+TERMS = ["지방법원", "법원", "행정기관", "지방자치단체", "검사", "대법원장", "법원행정처장", "공무원"]
+
+# 검색어 뒤에 붙일 조사/접미사/덩어리 후보 (extract_chunk_and_josa 의 모든 분기를 거치도록 구성)
+TAILS = ["", "을", "를", "과", "와", "이", "가", "이나", "나", "으로", "로", "은", "는",
+         "란", "이란", "라", "이라", "로서", "으로서", "로써", "으로써",
+         "의", "에", "에서", "에게", "등", "등의", "등인", "등만", "등에",
+         "만", "만을", "만이", "만은", "만에", "만으로", "장", "판사", "소속", "및"]
+
+HEADS = ["", "", "", "", "각급", "관할", "소속"]
+
+FILLER = ["이 법에서 정하는 바에 따라", "대통령령으로 정하는 경우", "다음 각 호의 어느 하나에 해당하는",
+          "필요한 사항은", "해당 사무를 처리하며", "그 밖에 필요한 조치를 하여야 한다",
+          "신청을 받은 날부터 30일 이내에", "관계 서류를 제출하여야 한다"]
+
+CIRCLED = "①②③④⑤⑥⑦⑧⑨⑩⑪⑫⑬⑭⑮⑯⑰⑱⑲⑳"
+GANADA = "가나다라마바사아자차카타파하"
+
+def _sentence(rng, term_rate):
+    """검색어가 섞인 임의의 문장 생성"""
+    parts = []
+    for _ in range(rng.randint(2, 5)):
+        parts.append(rng.choice(FILLER))
+        if rng.random() < term_rate:
+            term = rng.choice(TERMS)
+            head = rng.choice(HEADS)
+            tail = rng.choice(TAILS)
+            if rng.random() < 0.05:
+                parts.append(f'"{head}{term}"{tail}')
+            else:
+                parts.append(f"{head}{term}{tail}")
+    return " ".join(parts) + "."
+
+def _build_law_xml(rng, mst, law_id, name, articles, paragraph_scale, term_rate):
+    """lawService.do 응답과 같은 형식의 법령 XML 생성"""
+    out = ['<?xml version="1.0" encoding="UTF-8"?>',
+           f'<법령 법령키="{law_id}{mst}">',
+           "<기본정보>",
+           f"<법령ID>{law_id}</법령ID>",
+           f"<법령명_한글><![CDATA[{name}]]></법령명_한글>",
+           "<법종구분 법종구분코드=\"A0002\">법률</법종구분>",
+           "</기본정보>",
+           "<조문>"]
+    조번호 = 0
+    for n in range(articles):
+        조번호 += 1
+        if n and n % 15 == 0:
+            # 장 제목 (전문)
+            out.append("<조문단위>")
+            out.append(f"<조문번호>{조번호}</조문번호>")
+            out.append("<조문여부>전문</조문여부>")
+            out.append(f"<조문내용>제{n // 15}장 {escape(rng.choice(TERMS))}</조문내용>")
+            out.append("</조문단위>")
+        가지 = ["0"]
+        if rng.random() < 0.1:
+            가지.append(str(rng.randint(2, 3)))
+        for 가지번호 in 가지:
+            out.append("<조문단위>")
+            out.append(f"<조문번호>{조번호}</조문번호>")
+            if 가지번호 != "0":
+                out.append(f"<조문가지번호>{가지번호}</조문가지번호>")
+            out.append("<조문여부>조문</조문여부>")
+            if rng.random() < 0.02:
+                out.append("<조문명>부칙</조문명>")
+            title = rng.choice(["목적", "정의", "적용 범위", "관할"])
+            if rng.random() < term_rate / 2:
+                title = f"{rng.choice(TERMS)}{rng.choice(['', '의', '등', '장'])} {title}"
+            out.append(f"<조문제목>{escape(title)}</조문제목>")
+            article_label = f"제{조번호}조" + (f"의{가지번호}" if 가지번호 != "0" else "")
+            n_clauses = rng.choice([0, 1, 1, 2, 3, 4][: 2 + paragraph_scale])
+            if n_clauses == 0:
+                out.append(f"<조문내용>{escape(article_label + '(' + title + ') ' + _sentence(rng, term_rate))}</조문내용>")
+            else:
+                out.append(f"<조문내용>{escape(article_label + '(' + title + ')')}</조문내용>")
+            for c in range(n_clauses):
+                out.append("<항>")
+                numbered = n_clauses > 1
+                if numbered:
+                    out.append(f"<항번호>{CIRCLED[c]}</항번호>")
+                    out.append(f"<항내용>{escape(CIRCLED[c] + ' ' + _sentence(rng, term_rate))}</항내용>")
+                elif rng.random() < 0.5:
+                    out.append(f"<항내용>{escape(_sentence(rng, term_rate))}</항내용>")
+                n_items = rng.choice([0, 0, 2, 3, 5][: 3 + paragraph_scale])
+                for h in range(n_items):
+                    attrs = ""
+                    호번호 = f"{h + 1}."
+                    r = rng.random()
+                    if r < 0.05:
+                        attrs = ' 구분="각목외의부분"'
+                    elif r < 0.1:
+                        호번호 = f"{h + 1}의2."
+                    elif r < 0.12:
+                        attrs = ' 가지번호="2"'
+                    out.append(f"<호{attrs}>")
+                    out.append(f"<호번호>{호번호}</호번호>")
+                    out.append(f"<호내용>{escape(호번호 + ' ' + _sentence(rng, term_rate))}</호내용>")
+                    n_sub = rng.choice([0, 0, 0, 2, 3])
+                    for m in range(n_sub):
+                        out.append("<목>")
+                        out.append(f"<목번호>{GANADA[m]}.</목번호>")
+                        lines = [f"{GANADA[m]}. {_sentence(rng, term_rate)}"]
+                        if rng.random() < 0.3:
+                            lines.append(f"  1) {_sentence(rng, term_rate)}")
+                            lines.append(f"  2) {_sentence(rng, term_rate)}")
+                        out.append(f"<목내용><![CDATA[{chr(10).join(lines)}]]></목내용>")
+                        out.append("</목>")
+                    out.append("</호>")
+                out.append("</항>")
+            out.append("</조문단위>")
+    out.append("</조문>")
+    out.append("<부칙>")
+    for b in range(rng.randint(1, 3)):
+        out.append("<부칙단위>")
+        out.append(f"<부칙내용><![CDATA[부칙 제{b + 1}조 {_sentence(rng, term_rate)}]]></부칙내용>")
+        out.append("</부칙단위>")
+    out.append("</부칙>")
+    out.append("</법령>")
+    return "\n".join(out).encode("utf-8")
+
+def build_corpus(laws=200, articles=30, paragraph_scale=2, term_rate=0.15, seed=0):
+    """고정 시드로 가상의 법률 corpus 생성: [{"MST", "법령ID", "법령명", "xml", "text"}]"""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(laws):
+        mst = str(200000 + i * 7)
+        law_id = str(1000 + i)
+        name = f"{rng.choice(TERMS)} {rng.choice(['조직', '설치', '운영', '관리'])}에 관한 법률 {i + 1}"
+        n_articles = max(1, int(articles * rng.uniform(0.5, 1.5)))
+        xml = _build_law_xml(rng, mst, law_id, name, n_articles, paragraph_scale, term_rate)
+        corpus.append({"MST": mst, "법령ID": law_id, "법령명": name, "xml": xml,
+                       "text": xml.decode("utf-8")})
+    return corpus
+
+class MockLawServer(ThreadingHTTPServer):
+    """연결 수와 요청 수를 집계하는 대체 서버"""
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address, corpus, latency=0.0, jitter=0.0, error_rate=0.0, seed=0):
+        super().__init__(address, _Handler)
+        self.corpus = corpus
+        self.by_mst = {law["MST"]: law for law in corpus}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {"connections": 0, "requests": 0, "lawSearch": 0, "lawService": 0, "errors": 0}
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def process_request(self, request, client_address):
+        with self.lock:
+            self.stats["connections"] += 1
+        super().process_request(request, client_address)
+
+    def handle_error(self, request, client_address):
+        # 클라이언트가 타임아웃으로 먼저 연결을 끊는 경우는 무시
+        pass
+
+    def reset_stats(self):
+        with self.lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # keep-alive 연결에서 헤더/본문 분할 전송 시 지연(Nagle) 방지
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type="application/xml; charset=UTF-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        parsed = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        endpoint = parsed.path.rsplit("/", 1)[-1].replace(".do", "")
+        with server.lock:
+            server.stats["requests"] += 1
+            if endpoint in server.stats:
+                server.stats[endpoint] += 1
+            fail = server.error_rate and server.rng.random() < server.error_rate
+            delay = server.latency + (server.rng.uniform(0, server.jitter) if server.jitter else 0)
+            if fail:
+                server.stats["errors"] += 1
+        if delay:
+            time.sleep(delay)
+        if fail:
+            self._send(503, "Service Unavailable".encode("utf-8"), "text/plain; charset=UTF-8")
+            return
+        if endpoint == "lawSearch":
+            self._send(200, self._search(params))
+        elif endpoint == "lawService":
+            law = server.by_mst.get(params.get("MST", ""))
+            if law is None:
+                self._send(200, "<Law>일치하는 법령이 없습니다. 법령명을 확인하여 주십시오.</Law>".encode("utf-8"))
+            else:
+                self._send(200, law["xml"])
+        else:
+            self._send(404, b"Not Found", "text/plain")
+
+    def _search(self, params):
+        query = params.get("query", "").strip().strip('"')
+        display = int(params.get("display", "20"))
+        page = int(params.get("page", "1"))
+        hits = [law for law in self.server.corpus if not query or query in law["text"]]
+        sliced = hits[(page - 1) * display: page * display]
+        out = ['<?xml version="1.0" encoding="UTF-8"?>', "<LawSearch>", "<target>law</target>",
+               f"<키워드>{escape(query)}</키워드>", "<section>lawNm</section>",
+               f"<totalCnt>{len(hits)}</totalCnt>", f"<page>{page}</page>"]
+        for idx, law in enumerate(sliced, start=(page - 1) * display + 1):
+            out.append(f'<law id="{idx}">')
+            out.append(f"<법령일련번호>{law['MST']}</법령일련번호>")
+            out.append(f"<법령명한글><![CDATA[{law['법령명']}]]></법령명한글>")
+            out.append(f"<법령ID>{law['법령ID']}</법령ID>")
+            out.append("<법령구분명>법률</법령구분명>")
+            out.append("</law>")
+        out.append("</LawSearch>")
+        return "\n".join(out).encode("utf-8")
+
+def start_server(host="127.0.0.1", port=0, laws=200, articles=30, paragraph_scale=2,
+                 term_rate=0.15, latency=0.0, jitter=0.0, error_rate=0.0, seed=0):
+    """백그라운드 스레드에서 대체 서버 실행 (server.base_url, server.stats, server.shutdown())"""
+    corpus = build_corpus(laws, articles, paragraph_scale, term_rate, seed)
+    server = MockLawServer((host, port), corpus, latency, jitter, error_rate, seed)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="law.go.kr DRF 대체 로컬 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--laws", type=int, default=200, help="법률 수")
+    parser.add_argument("--articles", type=int, default=30, help="법률당 평균 조문 수 (응답 크기)")
+    parser.add_argument("--paragraph-scale", type=int, default=2, help="항/호 분량 (0-3)")
+    parser.add_argument("--term-rate", type=float, default=0.15, help="문장에 검색어가 섞일 확률")
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연 (초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="추가 지연 최대값 (초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 응답 확률")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.laws, args.articles, args.paragraph_scale, args.term_rate, args.seed)
+    server = MockLawServer((args.host, args.port), corpus, args.latency, args.jitter,
+                           args.error_rate, args.seed)
+    print(f"대체 서버 실행 중: {server.base_url} (법률 {len(corpus)}개)")
+    print(f"LAW_BASE={server.base_url} 로 설정하면 law_processor 가 이 서버를 사용합니다.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,70 +1,1508 @@
 import requests
+from requests.adapters import HTTPAdapter
 import xml.etree.ElementTree as ET
-from urllib.parse import quote
+from urllib.parse import quote, urlsplit
 import re
 import os
+import hashlib
+import io
+import json
+import queue
+import lzma
+import marshal
+import multiprocessing
+import random
+import tempfile
+import threading
+import time
 import unicodedata
-from collections import defaultdict
+import zlib
+from collections import OrderedDict, defaultdict, deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+from itertools import chain, groupby, islice, product
+
+try:
+    from lxml import etree as lxml_etree  # 선택 설치: 있으면 법령 본문 파싱에 사용 가능
+except ImportError:
+    lxml_etree = None
 
 OC = os.getenv("OC", "chetera")
-BASE = "http://www.law.go.kr"
+DEFAULT_BASE = "http://www.law.go.kr"
+BASE = os.getenv("LAW_BASE", DEFAULT_BASE).rstrip("/")  # 대체 서버(law_mock_server.py) 사용 시 변경
+
+# HTTP 연결 설정 (환경변수로 조정 가능)
+HTTP_POOL_SIZE = int(os.getenv("LAW_HTTP_POOL_SIZE", "10"))  # 호스트당 유지할 keep-alive 연결 수
+HTTP_TIMEOUT = float(os.getenv("LAW_HTTP_TIMEOUT", "10"))  # 요청당 기본 타임아웃 (초)
+FETCH_WORKERS = int(os.getenv("LAW_FETCH_WORKERS", "8"))  # 법령 본문 동시 수집 개수 (1이면 순차)
+PARSE_WORKERS = int(os.getenv("LAW_PARSE_WORKERS", "1"))  # XML 파싱 단계 스레드 수
+MATCH_WORKERS = int(os.getenv("LAW_MATCH_WORKERS", "1"))  # 검색어 매칭 단계 스레드 수
+PIPELINE_QUEUE_SIZE = int(os.getenv("LAW_PIPELINE_QUEUE_SIZE", "8"))  # 단계 사이 대기열 크기
+PROCESS_WORKERS = int(os.getenv("LAW_PROCESS_WORKERS", "0"))  # 1 이상이면 파싱/매칭을 프로세스 풀에서 실행
+AUTOMATON_MIN_TERMS = int(os.getenv("LAW_AUTOMATON_MIN_TERMS", "32"))  # 검색어가 이만큼 이상이면 한 번에 찾는 오토마톤 사용
+
+# 재시도 및 요청 속도 제한 설정
+RETRY_MAX = int(os.getenv("LAW_RETRY_MAX", "3"))  # 실패 시 재시도 횟수
+RETRY_BACKOFF = float(os.getenv("LAW_RETRY_BACKOFF", "0.5"))  # 첫 재시도 대기 상한 (초, 재시도마다 2배)
+RETRY_BACKOFF_MAX = float(os.getenv("LAW_RETRY_BACKOFF_MAX", "8"))  # 재시도 대기 최대값 (초)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}  # 잠시 후 다시 시도하면 성공할 수 있는 상태 코드
+RATE_LIMIT = float(os.getenv("LAW_RATE_LIMIT", "20"))  # 호스트당 초당 요청 수 (0이면 제한 없음)
+RATE_BURST = float(os.getenv("LAW_RATE_BURST", "0")) or max(RATE_LIMIT, 1)  # 한꺼번에 보낼 수 있는 요청 수
+BREAKER_THRESHOLD = int(os.getenv("LAW_BREAKER_THRESHOLD", "5"))  # 연속 실패가 이만큼 쌓이면 차단 (0이면 사용 안 함)
+BREAKER_COOLDOWN = float(os.getenv("LAW_BREAKER_COOLDOWN", "30"))  # 차단 후 다시 시험 요청을 보내기까지 대기 (초)
+
+# 캐시된 이전 자료를 쓴 법령에 붙이는 안내문
+STALE_NOTICE = "법제처 서버에 연결할 수 없어 캐시된 이전 자료를 사용했습니다. 최신 법령과 다를 수 있습니다."
+
+# 법령 본문 디스크 캐시 설정 (MST 는 법령의 한 버전을 가리키므로 캐시는 만료되지 않음)
+# BASE 가 law.go.kr 이 아니면 캐시와 미러 모두 hosts/<호스트> 아래에 따로 저장 (base_cache_dir)
+CACHE_ENABLED = os.getenv("LAW_CACHE", "1") != "0"
+CACHE_DIR = os.getenv("LAW_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "law_processor"))
+CACHE_COMPRESSION = os.getenv("LAW_CACHE_COMPRESSION", "zlib")  # none, zlib, lzma
+CACHE_MAX_BYTES = int(os.getenv("LAW_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))  # 초과 시 오래 안 쓴 것부터 삭제
+
+# 법률 목록 검색 결과 캐시 설정 (검색과 개정문 생성이 공유, 0이면 사용 안 함)
+LIST_CACHE_TTL = float(os.getenv("LAW_LIST_CACHE_TTL", "3600"))  # 초
+LIST_CACHE_MAX_ENTRIES = int(os.getenv("LAW_LIST_CACHE_MAX_ENTRIES", "256"))
+
+# 파싱된 법령(조문 목록) 메모리 캐시 - MST 별로 프로세스에서 한 번만 파싱 (0이면 사용 안 함)
+PARSED_CACHE_MAX_ENTRIES = int(os.getenv("LAW_PARSED_CACHE_MAX_ENTRIES", "500"))
+
+# 현행 법률 전체 로컬 미러 (sync 명령으로 동기화, 용량 상한에 따른 삭제 대상 아님)
+MIRROR_DIR = os.getenv("LAW_MIRROR_DIR", os.path.join(CACHE_DIR, "mirror"))
+OFFLINE = os.getenv("LAW_OFFLINE", "0") == "1"  # 1이면 law.go.kr 대신 로컬 미러만 사용
+
+# 법령 본문 XML 파서 (etree, lxml, auto=lxml 이 있으면 lxml) - lxml 이 없으면 항상 etree
+# lxml 은 파싱 자체는 빠르지만 조문을 훑는 동안 요소마다 Python 객체를 새로 만들어 전체로는 더 느림
+XML_BACKEND = os.getenv("LAW_XML_BACKEND", "etree")
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def configure_http(pool_size=None, timeout=None):
+    """HTTP 연결 설정 변경 (기존 세션은 닫고 다음 요청부터 새 설정으로 연결)"""
+    global HTTP_POOL_SIZE, HTTP_TIMEOUT, _http_session
+    with _http_session_lock:
+        if pool_size is not None:
+            HTTP_POOL_SIZE = int(pool_size)
+        if timeout is not None:
+            HTTP_TIMEOUT = timeout
+        if _http_session is not None:
+            _http_session.close()
+            _http_session = None
+
+def get_http_session():
+    """law.go.kr 호출에 공용으로 쓰는 keep-alive 세션 반환
+    - 연결 풀 크기는 HTTP_POOL_SIZE 로 제한 (풀이 가득 차면 반납될 때까지 대기)
+    """
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=HTTP_POOL_SIZE, pool_block=True)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _http_session = session
+        return _http_session
+
+class LawFetchError(Exception):
+    """재시도 후에도 law.go.kr 에서 자료를 받지 못한 경우
+    - laws: 목록 조회는 받아온 만큼의 법률 목록, 본문 조회는 본문을 받지 못한 법률 목록
+    - results: 본문을 받지 못한 법률만 빼고 만든 결과 (run_search_logic, run_batch_amendment_logic 에서만, 그 밖에는 None)
+    """
+
+    def __init__(self, message, laws=None, results=None):
+        super().__init__(message)
+        self.laws = laws or []
+        self.results = results
+
+class CircuitOpenError(LawFetchError):
+    """연속 실패로 차단기가 열려 요청을 보내지 않은 경우"""
+
+class CircuitBreaker:
+    """연속 실패 횟수가 threshold 에 이르면 cooldown 초 동안 요청을 바로 실패시키는 차단기
+    - closed: 정상, open: 차단 중, half-open: cooldown 이 지나 시험 요청 하나만 허용
+    """
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self.lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                return "half-open"
+            return "open"
+
+    def allow(self):
+        """요청을 보내도 되는지 확인 (half-open 상태에서는 시험 요청 하나만 허용)"""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if not self.trial_running and time.monotonic() - self.opened_at >= self.cooldown:
+                self.trial_running = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            if self.opened_at is not None:
+                print("차단기 해제: 서버 응답 정상")
+            self.failures = 0
+            self.opened_at = None
+            self.trial_running = False
+
+    def release_trial(self):
+        """결과를 기록하지 못하고 끝난 시험 요청을 풀어 다음 요청이 다시 시험하도록 함"""
+        with self.lock:
+            self.trial_running = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            self.trial_running = False
+            if self.opened_at is not None or self.failures >= self.threshold:
+                if self.opened_at is None:
+                    print(f"차단기 작동: 연속 {self.failures}회 실패, {self.cooldown:.0f}초 동안 요청 중단")
+                self.opened_at = time.monotonic()
+
+_circuit_breakers = {}
+_circuit_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(url):
+    """호스트별 차단기 반환 (BREAKER_THRESHOLD 가 0이면 None)"""
+    if BREAKER_THRESHOLD <= 0:
+        return None
+    host = urlsplit(url).netloc
+    with _circuit_breakers_lock:
+        breaker = _circuit_breakers.get(host)
+        if breaker is None:
+            breaker = _circuit_breakers[host] = CircuitBreaker(BREAKER_THRESHOLD, BREAKER_COOLDOWN)
+        return breaker
+
+def reset_circuit_breakers():
+    """모든 차단기 초기화"""
+    with _circuit_breakers_lock:
+        _circuit_breakers.clear()
+
+class TokenBucket:
+    """초당 rate 개씩 토큰이 채워지는 토큰 버킷 (burst 개까지 모아둘 수 있음)"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """토큰 하나를 얻을 때까지 대기"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+def configure_fetch_policy(retry_max=None, backoff=None, backoff_max=None, rate_limit=None, burst=None):
+    """재시도/속도 제한 설정 변경 (속도 제한은 다음 요청부터 새 설정 적용)
+    - burst 를 주지 않으면 기존 값 유지 (0 이면 초당 요청 수에 맞춤)
+    """
+    global RETRY_MAX, RETRY_BACKOFF, RETRY_BACKOFF_MAX, RATE_LIMIT, RATE_BURST
+    if retry_max is not None:
+        RETRY_MAX = int(retry_max)
+    if backoff is not None:
+        RETRY_BACKOFF = backoff
+    if backoff_max is not None:
+        RETRY_BACKOFF_MAX = backoff_max
+    if rate_limit is not None or burst is not None:
+        with _rate_limiters_lock:
+            if rate_limit is not None:
+                RATE_LIMIT = rate_limit
+            if burst is not None:
+                RATE_BURST = burst or max(RATE_LIMIT, 1)
+            _rate_limiters.clear()
+
+def _wait_for_rate_limit(url):
+    """호스트별 토큰 버킷으로 초당 요청 수 제한"""
+    if RATE_LIMIT <= 0:
+        return
+    host = urlsplit(url).netloc
+    with _rate_limiters_lock:
+        limiter = _rate_limiters.get(host)
+        if limiter is None:
+            limiter = _rate_limiters[host] = TokenBucket(RATE_LIMIT, RATE_BURST)
+    limiter.acquire()
+
+def backoff_delay(attempt, response=None):
+    """재시도 대기 시간: 지수 증가 상한 안에서 무작위 (full jitter), Retry-After 가 있으면 그 이상"""
+    delay = random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * (2 ** attempt)))
+    retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+    if retry_after.strip().isdigit():
+        delay = max(delay, min(float(retry_after), RETRY_BACKOFF_MAX))
+    return delay
+
+def http_get(url, timeout=None, retries=None):
+    """공용 세션으로 GET 요청
+    - timeout 미지정 시 HTTP_TIMEOUT 적용
+    - 연결 오류, 타임아웃, RETRYABLE_STATUS 응답은 retries 번 (기본 RETRY_MAX) 까지 재시도
+    - 재시도가 끝나면 마지막 응답을 그대로 반환하거나 마지막 예외를 다시 발생
+    - 호스트 차단기가 열려 있으면 기다리지 않고 CircuitOpenError
+    - 차단기에는 재시도까지 마친 요청 하나를 실패 한 번으로 기록
+    """
+    if timeout is None:
+        timeout = HTTP_TIMEOUT
+    if retries is None:
+        retries = RETRY_MAX
+    breaker = get_circuit_breaker(url)
+    trial = False  # half-open 시험 요청이면 결과를 기록할 때까지 True
+    attempt = 0
+    try:
+        while True:
+            # 재시도 중에는 다른 요청이 차단기를 연 경우에만 중단 (half-open 시험 요청은 계속 재시도)
+            if breaker is not None:
+                if attempt == 0 and breaker.allow():
+                    trial = breaker.state != "closed"
+                elif attempt == 0 or breaker.state == "open":
+                    raise CircuitOpenError(f"연속 실패로 {urlsplit(url).netloc} 요청을 잠시 중단했습니다")
+            _wait_for_rate_limit(url)
+            try:
+                res = get_http_session().get(url, timeout=timeout)
+            except Exception as e:
+                if not isinstance(e, (requests.ConnectionError, requests.Timeout)) or attempt >= retries:
+                    if breaker is not None:
+                        trial = False
+                        breaker.record_failure()
+                    raise
+                delay = backoff_delay(attempt)
+                print(f"요청 실패, {delay:.1f}초 후 재시도 ({attempt + 1}/{retries}): {e}")
+            else:
+                if res.status_code not in RETRYABLE_STATUS or attempt >= retries:
+                    if breaker is not None:
+                        trial = False
+                        if res.status_code in RETRYABLE_STATUS:
+                            breaker.record_failure()
+                        else:
+                            breaker.record_success()
+                    return res
+                delay = backoff_delay(attempt, res)
+                print(f"상태 코드 {res.status_code}, {delay:.1f}초 후 재시도 ({attempt + 1}/{retries})")
+                res.close()
+            time.sleep(delay)
+            attempt += 1
+    finally:
+        if trial:
+            # 시험 요청이 결과 없이 끝나면 (KeyboardInterrupt 등) 다음 시험 요청을 허용
+            breaker.release_trial()
+
+# ---------------------------------------------------------------------------
+# 디스크 캐시
+# 파일 형식: 매직(4) + 압축방식(1) + 원본 sha256(32) + 본문
+# ---------------------------------------------------------------------------
+_BLOB_MAGIC = b"LAW1"
+_BLOB_HEADER_SIZE = len(_BLOB_MAGIC) + 1 + 32
+_BLOB_CODECS = {
+    "none": (b"n", lambda data: data, lambda data: data),
+    "zlib": (b"z", lambda data: zlib.compress(data, 6), zlib.decompress),
+    "lzma": (b"x", lzma.compress, lzma.decompress),
+}
+_BLOB_DECODERS = {code: decode for code, _, decode in _BLOB_CODECS.values()}
+
+_cache_lock = threading.Lock()
+_cache_size = None  # 현재 캐시 용량 (처음 쓸 때 디렉터리를 훑어 계산)
+
+def configure_cache(cache_dir=None, compression=None, max_bytes=None, enabled=None):
+    """디스크 캐시 설정 변경"""
+    global CACHE_DIR, CACHE_COMPRESSION, CACHE_MAX_BYTES, CACHE_ENABLED, _cache_size
+    if compression is not None and compression not in _BLOB_CODECS:
+        raise ValueError(f"지원하지 않는 압축 방식: {compression} (none, zlib, lzma 중 선택)")
+    with _cache_lock:
+        if cache_dir is not None:
+            CACHE_DIR = cache_dir
+            _cache_size = None
+        if compression is not None:
+            CACHE_COMPRESSION = compression
+        if max_bytes is not None:
+            CACHE_MAX_BYTES = int(max_bytes)
+        if enabled is not None:
+            CACHE_ENABLED = bool(enabled)
+
+def encode_blob(data, compression=None):
+    """바이트열을 캐시 파일 형식으로 변환 (무결성 확인용 sha256 포함)"""
+    code, compress, _ = _BLOB_CODECS.get(compression or CACHE_COMPRESSION, _BLOB_CODECS["none"])
+    return _BLOB_MAGIC + code + hashlib.sha256(data).digest() + compress(data)
+
+def decode_blob(blob):
+    """캐시 파일 내용을 원본 바이트열로 복원 (형식 오류나 sha256 불일치 시 None)"""
+    if len(blob) < _BLOB_HEADER_SIZE or not blob.startswith(_BLOB_MAGIC):
+        return None
+    code = blob[len(_BLOB_MAGIC):len(_BLOB_MAGIC) + 1]
+    digest = blob[len(_BLOB_MAGIC) + 1:_BLOB_HEADER_SIZE]
+    decode = _BLOB_DECODERS.get(code)
+    if decode is None:
+        return None
+    try:
+        data = decode(blob[_BLOB_HEADER_SIZE:])
+    except (zlib.error, lzma.LZMAError):
+        return None
+    if hashlib.sha256(data).digest() != digest:
+        return None
+    return data
+
+def read_blob(path):
+    """캐시 파일 읽기 (없거나 손상된 파일이면 None, 손상된 파일은 삭제)"""
+    try:
+        with open(path, "rb") as f:
+            blob = f.read()
+    except OSError:
+        return None
+    data = decode_blob(blob)
+    if data is None:
+        print(f"손상된 캐시 파일 삭제: {path}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return data
+
+def write_file_atomic(path, data):
+    """파일 쓰기 (임시 파일에 쓴 뒤 교체하므로 중간에 끊겨도 깨진 파일이 남지 않음)"""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def write_blob(path, data, compression=None):
+    """캐시 파일 쓰기
+    - 반환값: 기록된 파일 크기에서 기존 파일 크기를 뺀 값
+    """
+    blob = encode_blob(data, compression)
+    try:
+        old_size = os.path.getsize(path)
+    except OSError:
+        old_size = 0
+    write_file_atomic(path, blob)
+    return len(blob) - old_size
+
+_LAW_GO_KR_HOSTS = {"www.law.go.kr", "law.go.kr"}
+
+def base_cache_dir(root):
+    """현재 BASE 의 자료를 저장할 디렉터리
+    - law.go.kr 이면 root, 대체 서버면 root/hosts/<호스트_포트> (대체 서버 자료가 실제 캐시와 섞이지 않음)
+    """
+    host = urlsplit(BASE).netloc.lower()
+    if host in _LAW_GO_KR_HOSTS:
+        return root
+    return os.path.join(root, "hosts", re.sub(r"[^0-9a-z.-]", "_", host) or "_")
+
+def _law_xml_cache_path(mst):
+    if not re.fullmatch(r"[0-9A-Za-z_-]+", str(mst)):
+        return None
+    return os.path.join(base_cache_dir(CACHE_DIR), "xml", f"{mst}.law")
+
+_LAW_ID_PATTERN = re.compile("<법령ID>\\s*([0-9A-Za-z_-]+)\\s*<".encode("utf-8"))
+
+def _law_id_alias_path(law_id):
+    if not re.fullmatch(r"[0-9A-Za-z_-]+", str(law_id)):
+        return None
+    return os.path.join(base_cache_dir(CACHE_DIR), "by_id", str(law_id))
+
+def get_cached_mst_by_law_id(law_id):
+    """법령ID 로 마지막에 캐시한 버전의 MST 조회 (없으면 None)"""
+    path = _law_id_alias_path(law_id) if CACHE_ENABLED else None
+    if path is None:
+        return None
+    data = read_blob(path)
+    return data.decode("ascii") if data else None
+
+def get_cached_law_xml(mst):
+    """디스크 캐시에서 법령 본문 XML 조회 (없으면 None)"""
+    path = _law_xml_cache_path(mst) if CACHE_ENABLED else None
+    if path is None:
+        return None
+    data = read_blob(path)
+    if data is not None:
+        try:
+            os.utime(path)  # 최근 사용 시각 갱신 (LRU 삭제 기준)
+        except OSError:
+            pass
+    return data
+
+def put_cached_law_xml(mst, xml_data):
+    """법령 본문 XML 을 디스크 캐시에 저장하고 용량 상한을 넘으면 오래 안 쓴 것부터 삭제"""
+    path = _law_xml_cache_path(mst) if CACHE_ENABLED else None
+    if path is None:
+        return
+    try:
+        delta = write_blob(path, xml_data)
+        # 서버 장애 시 이전 버전을 찾을 수 있도록 법령ID -> MST 기록
+        law_id = _LAW_ID_PATTERN.search(xml_data[:4096])
+        alias_path = _law_id_alias_path(law_id.group(1).decode("ascii")) if law_id else None
+        if alias_path:
+            write_blob(alias_path, str(mst).encode("ascii"), "none")
+    except OSError as e:
+        print(f"캐시 저장 실패 (MST: {mst}): {e}")
+        return
+    _add_cache_size(delta)
+
+def _add_cache_size(delta):
+    """캐시에 기록한 만큼 용량을 더하고 상한을 넘으면 오래 안 쓴 것부터 삭제"""
+    global _cache_size
+    with _cache_lock:
+        if _cache_size is None:
+            _cache_size = _scan_cache_size()
+        else:
+            _cache_size += delta
+        over_limit = _cache_size > CACHE_MAX_BYTES
+    if over_limit:
+        evict_law_cache()
+
+def _iter_cache_files():
+    # 용량 상한 대상: 모든 BASE 의 법령 본문 XML 과 파싱된 법령 (by_id 별칭은 작아서 제외)
+    try:
+        roots = [CACHE_DIR] + [entry.path for entry in os.scandir(os.path.join(CACHE_DIR, "hosts")) if entry.is_dir()]
+    except OSError:
+        roots = [CACHE_DIR]
+    for root, name in product(roots, ("xml", "parsed")):
+        try:
+            entries = list(os.scandir(os.path.join(root, name)))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_file() and not entry.name.startswith(".tmp-"):
+                try:
+                    yield entry.path, entry.stat()
+                except OSError:
+                    continue
+
+def _scan_cache_size():
+    return sum(st.st_size for _, st in _iter_cache_files())
+
+def evict_law_cache(max_bytes=None):
+    """캐시 용량이 상한을 넘으면 최근에 사용하지 않은 파일부터 삭제 (상한의 90%까지)"""
+    global _cache_size
+    limit = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    with _cache_lock:
+        files = sorted(_iter_cache_files(), key=lambda item: item[1].st_mtime)
+        total = sum(st.st_size for _, st in files)
+        if total > limit:
+            target = int(limit * 0.9)
+            for path, st in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                    total -= st.st_size
+                except OSError:
+                    continue
+        _cache_size = total
+
+# ---------------------------------------------------------------------------
+# 동시 요청 합치기 (single-flight)
+# 여러 세션이 같은 법률 목록/본문을 동시에 요청하면 한 번만 받아와 결과를 나눠 준다.
+# ---------------------------------------------------------------------------
+class _FlightCall:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출을 하나로 합쳐 실행하고 결과를 함께 받는다"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        """key 에 대해 진행 중인 호출이 있으면 그 결과를 기다리고, 없으면 fn 을 실행"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _FlightCall()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self):
+        """현재 진행 중인 호출 수"""
+        with self._lock:
+            return len(self._calls)
+
+_law_flight = SingleFlight()
 
 def highlight(text, query):
-    """검색어를 HTML로 하이라이트 처리해주는 함수"""
-    if not query or not text:
+    """검색어를 HTML로 하이라이트 처리해주는 함수 (공백 무시, 예: "지방 법원" 도 지방법원으로 표시)"""
+    return mark_matches(text, clean(text), clean(query))
+
+def mark_matches(text, text_공백제거, keyword_공백제거):
+    """공백을 뺀 글자에서 찾은 검색어 위치를 원문 위치로 되돌려 <mark> 로 표시
+    - text_공백제거 는 clean(text), keyword_공백제거 는 clean(검색어)
+    - 원문 위치는 검색어가 있을 때만 계산 (공백 아닌 글자의 원문 위치 목록)
+    - 찾은 부분이 줄바꿈에 걸치면 줄마다 따로 표시
+    """
+    if not keyword_공백제거 or not text:
         return text
-    # 정규식 특수문자 이스케이프
-    escaped_query = re.escape(query)
-    # 대소문자 구분없이 검색
-    pattern = re.compile(f'({escaped_query})', re.IGNORECASE)
-    return pattern.sub(r'<mark>\1</mark>', text)
-
-def get_law_list_from_api(query):
-    exact_query = f'"{query}"'
-    encoded_query = quote(exact_query)
-    page = 1
+    start = text_공백제거.find(keyword_공백제거)
+    if start < 0:
+        return text
+    offsets = [i for i, ch in enumerate(text) if not ch.isspace()]
+    parts = []
+    pos = 0
+    while start >= 0:
+        end = start + len(keyword_공백제거)
+        begin, stop = offsets[start], offsets[end - 1] + 1
+        parts.append(text[pos:begin])
+        for piece in text[begin:stop].splitlines(True):
+            line = piece.splitlines()[0]
+            core = line.strip()
+            if core:
+                lead = line[:len(line) - len(line.lstrip())]
+                parts.append(f"{lead}<mark>{core}</mark>{line[len(lead) + len(core):]}")
+            else:
+                parts.append(line)
+            parts.append(piece[len(line):])
+        pos = stop
+        start = text_공백제거.find(keyword_공백제거, end)
+    parts.append(text[pos:])
+    return "".join(parts)
+
+LIST_PAGE_SIZE = 100  # lawSearch.do 한 페이지당 건수 (display 최대값)
+
+def fetch_law_list_page(encoded_query, page, timeout=None):
+    """lawSearch.do 한 페이지 조회 → (법률 목록, 전체 건수)
+    - 상태 코드가 200이 아니면 (None, None)
+    - 응답에 totalCnt 가 없으면 전체 건수는 None
+    """
+    # encoded_query 가 None 이면 현행 법률 전체 목록
+    search_part = f"&search=2&knd=A0002&query={encoded_query}" if encoded_query is not None else "&knd=A0002"
+    url = f"{BASE}/DRF/lawSearch.do?OC={OC}&target=law&type=XML&display={LIST_PAGE_SIZE}&page={page}{search_part}"
+    res = http_get(url, timeout=timeout)
+    res.encoding = 'utf-8'
+    if res.status_code != 200:
+        return None, None
+    root = ET.fromstring(res.content)
     laws = []
-    while True:
-        url = f"{BASE}/DRF/lawSearch.do?OC={OC}&target=law&type=XML&display=100&page={page}&search=2&knd=A0002&query={encoded_query}"
+    for law in root.findall("law"):
+        laws.append({
+            "법령명": law.findtext("법령명한글", "").strip(),
+            "MST": law.findtext("법령일련번호", ""),
+            "법령ID": (law.findtext("법령ID") or "").strip()
+        })
+    total = (root.findtext("totalCnt") or "").strip()
+    return laws, int(total) if total.isdigit() else None
+
+def fetch_law_list(query, timeout=None, max_workers=None):
+    """검색어가 본문에 포함된 법률 목록을 law.go.kr 에서 조회 → (법률 목록, 모든 페이지 성공 여부)
+    - query 가 None 이면 현행 법률 전체 목록
+    - 첫 페이지의 totalCnt 로 전체 페이지 수를 구한 뒤 나머지 페이지는 병렬 조회
+    - 여러 페이지에 걸쳐 중복된 MST 는 제거 (페이지 순서 유지)
+    """
+    encoded_query = quote(f'"{query}"') if query is not None else None
+
+    def fetch_page(page):
         try:
-            res = requests.get(url, timeout=10)
-            res.encoding = 'utf-8'
-            if res.status_code != 200:
-                break
-            root = ET.fromstring(res.content)
-            for law in root.findall("law"):
-                laws.append({
-                    "법령명": law.findtext("법령명한글", "").strip(),
-                    "MST": law.findtext("법령일련번호", "")
-                })
-            if len(root.findall("law")) < 100:
-                break
-            page += 1
+            page_laws, _ = fetch_law_list_page(encoded_query, page, timeout)
+            return page_laws
         except Exception as e:
-            print(f"법률 검색 중 오류 발생: {e}")
-            break
+            print(f"법률 검색 중 오류 발생 (page {page}): {e}")
+            return None
+
+    try:
+        first_page, total = fetch_law_list_page(encoded_query, 1, timeout)
+    except Exception as e:
+        print(f"법률 검색 중 오류 발생: {e}")
+        first_page, total = None, None
+
+    pages = [first_page]
+    if first_page and total is None:
+        # totalCnt 가 없는 응답이면 100건 미만 페이지가 나올 때까지 순차 조회
+        page = 1
+        while pages[-1] and len(pages[-1]) >= LIST_PAGE_SIZE:
+            page += 1
+            pages.append(fetch_page(page))
+    elif first_page and total > LIST_PAGE_SIZE:
+        last_page = -(-total // LIST_PAGE_SIZE)
+        workers = max(1, min(max_workers or FETCH_WORKERS, last_page - 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pages.extend(pool.map(fetch_page, range(2, last_page + 1)))
+
+    laws = []
+    seen_msts = set()
+    for page_laws in pages:
+        for law in page_laws or []:
+            if law["MST"] in seen_msts:
+                continue
+            seen_msts.add(law["MST"])
+            laws.append(law)
+    return laws, all(page_laws is not None for page_laws in pages)
+
+_list_cache = OrderedDict()  # (BASE, 검색어) -> (만료 시각, 법률 목록)
+_list_cache_lock = threading.Lock()
+
+def invalidate_law_list_cache(query=None):
+    """법률 목록 캐시 비우기 (query 지정 시 해당 검색어만)"""
+    with _list_cache_lock:
+        if query is None:
+            _list_cache.clear()
+        else:
+            for key in [key for key in _list_cache if key[1] == query]:
+                del _list_cache[key]
+
+def get_law_list_from_api(query, timeout=None, max_workers=None):
+    """검색어가 본문에 포함된 법률 목록 조회
+    - LIST_CACHE_TTL 초 동안은 같은 검색어의 결과를 캐시에서 반환
+    - 재시도 후에도 일부 페이지를 받지 못하면 LawFetchError (목록이 잘린 채로 진행하지 않음)
+    - 단, 만료된 캐시라도 있으면 그 목록을 쓰고 각 법령에 "stale_list": True 표시
+    - OFFLINE 이면 로컬 미러에서 검색
+    """
+    key = ("mirror" if OFFLINE else BASE, query)
+    laws = None
+    if LIST_CACHE_TTL > 0:
+        with _list_cache_lock:
+            entry = _list_cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                _list_cache.move_to_end(key)
+                laws = entry[1]
+        if laws is not None:
+            print(f"법률 목록 캐시 사용: {query}")
+
+    if laws is None:
+        def fetch_and_store():
+            if OFFLINE:
+                fetched, complete = search_law_mirror(query, max_workers)
+            else:
+                fetched, complete = fetch_law_list(query, timeout, max_workers)
+            if not complete:
+                raise LawFetchError(f"법률 목록을 모두 가져오지 못했습니다 (검색어: {query}, 받은 법률 {len(fetched)}개)", fetched)
+            if LIST_CACHE_TTL > 0:
+                with _list_cache_lock:
+                    _list_cache[key] = (time.monotonic() + LIST_CACHE_TTL, fetched)
+                    _list_cache.move_to_end(key)
+                    while len(_list_cache) > LIST_CACHE_MAX_ENTRIES:
+                        _list_cache.popitem(last=False)
+            return fetched
+
+        # 다른 세션이 같은 검색어를 조회 중이면 그 결과를 함께 사용
+        try:
+            laws = _law_flight.do(("list",) + key, fetch_and_store)
+        except LawFetchError as e:
+            with _list_cache_lock:
+                entry = _list_cache.get(key)
+            if entry is None:
+                raise
+            print(f"법률 목록 조회 실패, 캐시된 이전 목록 사용: {query} ({e})")
+            laws = [dict(law, stale_list=True) for law in entry[1]]
+
     # 디버깅을 위해 검색된 법률 목록 출력
     print(f"검색된 법률 수: {len(laws)}")
     for idx, law in enumerate(laws):
         print(f"{idx+1}. {law['법령명']}")
-    return laws
+    # 호출한 쪽에서 목록을 고쳐도 캐시가 바뀌지 않도록 복사본 반환
+    return [dict(law) for law in laws]
+
+def get_law_text_by_mst(mst, timeout=None):
+    """법령 본문 XML 조회
+    - 로컬 미러나 디스크 캐시에 있으면 네트워크를 쓰지 않음 (OFFLINE 이면 네트워크를 전혀 쓰지 않음)
+    - 다른 세션이 같은 MST 를 받는 중이면 그 결과를 함께 사용
+    """
+    cached = get_mirrored_law_xml(mst)
+    if cached is None:
+        cached = get_cached_law_xml(mst)
+    if cached is not None or OFFLINE:
+        return cached
+    return _law_flight.do(("law", BASE, mst), download_law_text, mst, timeout)
 
-def get_law_text_by_mst(mst):
+def download_law_text(mst, timeout=None, cache=True):
+    """lawService.do 에서 법령 본문 XML 받기
+    - cache 면 성공 시 디스크 캐시에 저장
+    - 재시도 후에도 받지 못하면 LawFetchError (목록 조회와 같은 기준)
+    """
     url = f"{BASE}/DRF/lawService.do?OC={OC}&target=law&MST={mst}&type=XML"
     try:
-        res = requests.get(url, timeout=10)
-        res.encoding = 'utf-8'
-        if res.status_code == 200:
-            return res.content
-        else:
-            print(f"법령 XML 가져오기 실패: 상태 코드 {res.status_code}")
-            return None
+        res = http_get(url, timeout=timeout)
+    except LawFetchError:
+        raise
     except Exception as e:
-        print(f"법령 XML 가져오기 중 오류 발생: {e}")
+        raise LawFetchError(f"법령 본문을 받지 못했습니다 (MST: {mst}): {e}") from e
+    res.encoding = 'utf-8'
+    if res.status_code != 200:
+        raise LawFetchError(f"법령 본문을 받지 못했습니다 (MST: {mst}, 상태 코드 {res.status_code})")
+    # "일치하는 법령이 없습니다" 같은 안내 응답은 캐시하지 않음
+    if cache and is_law_xml(res.content):
+        put_cached_law_xml(mst, res.content)
+    return res.content
+
+def is_law_xml(xml_data):
+    """lawService.do 응답이 법령 본문인지 확인 ("일치하는 법령이 없습니다" 같은 안내 응답 제외)"""
+    return bool(xml_data) and "<법령".encode("utf-8") in xml_data[:1024]
+
+def fetch_law_text(law, timeout=None):
+    """목록 항목의 법령 본문 XML 조회
+    - 받지 못하면 같은 법령(법령ID)의 이전 버전 캐시를 대신 반환하고 law["stale_body"] = True 표시
+    - 이전 버전도 없으면 LawFetchError 를 그대로 다시 발생
+    """
+    try:
+        xml_data = get_law_text_by_mst(law["MST"], timeout)
+        error = None
+    except LawFetchError as e:
+        xml_data, error = None, e
+    if xml_data is None and law.get("법령ID"):
+        stale_mst = get_cached_mst_by_law_id(law["법령ID"])
+        if stale_mst and stale_mst != law["MST"]:
+            xml_data = get_cached_law_xml(stale_mst)
+            if xml_data is not None:
+                print(f"캐시된 이전 버전 사용: {law['법령명']} (MST: {stale_mst})")
+                law["stale_body"] = True
+    if xml_data is None and error is not None:
+        raise error
+    return xml_data
+
+def iter_law_texts(laws, max_workers=None, fetch=None):
+    """법령 본문 XML 을 스레드 풀로 미리 받아오면서 입력 순서대로 (law, xml_data) 반환
+    - 동시 요청 수는 max_workers (기본 FETCH_WORKERS) 로 제한
+    - 미리 받아두는 양은 동시 요청 수의 2배까지만 (메모리 제한)
+    - fetch 로 법령별 조회 함수를 바꿀 수 있음 (기본 fetch_law_text)
+    - 본문을 받지 못한 법령(LawFetchError)은 멈추지 않고 xml_data None 과 law["fetch_error"] 에 사유 표시
+    """
+    fetch = fetch or fetch_law_text
+
+    def fetch_one(law):
+        try:
+            return fetch(law)
+        except LawFetchError as e:
+            print(f"법령 본문 수집 실패: {law['법령명']} ({e})")
+            law["fetch_error"] = str(e)
+            return None
+
+    workers = max(1, max_workers or FETCH_WORKERS)
+    if workers == 1:
+        for law in laws:
+            yield law, fetch_one(law)
+        return
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        remaining = iter(laws)
+        pending = deque((law, pool.submit(fetch_one, law))
+                        for law in islice(remaining, workers * 2))
+        while pending:
+            law, future = pending.popleft()
+            for next_law in islice(remaining, 1):
+                pending.append((next_law, pool.submit(fetch_one, next_law)))
+            yield law, future.result()
+
+# ---------------------------------------------------------------------------
+# 로컬 미러
+# 현행 법률 전체를 내려받아 두고 OFFLINE 모드에서 검색/개정문 생성에 사용한다.
+# manifest.json 에 법률 목록을, xml/<MST>.law 에 본문을 저장한다.
+# ---------------------------------------------------------------------------
+_XML_MARKUP_PATTERN = re.compile(rb"<!\[CDATA\[|\]\]>|<[^>]*>")
+
+def _mirror_xml_path(mst):
+    if not re.fullmatch(r"[0-9A-Za-z_-]+", str(mst)):
+        return None
+    return os.path.join(base_cache_dir(MIRROR_DIR), "xml", f"{mst}.law")
+
+def _mirror_manifest_path():
+    return os.path.join(base_cache_dir(MIRROR_DIR), "manifest.json")
+
+def get_mirrored_law_xml(mst):
+    """로컬 미러에서 법령 본문 XML 조회 (없으면 None)"""
+    path = _mirror_xml_path(mst)
+    if path is None or not os.path.exists(path):
+        return None
+    return read_blob(path)
+
+def load_mirror_manifest():
+    """로컬 미러 목록 읽기 → {"synced_at", "laws": [...]} (동기화한 적 없으면 None)"""
+    try:
+        with open(_mirror_manifest_path(), "rb") as f:
+            return json.loads(f.read().decode("utf-8"))
+    except (OSError, ValueError):
         return None
 
+def _mirrored_msts():
+    try:
+        names = os.listdir(os.path.join(base_cache_dir(MIRROR_DIR), "xml"))
+    except OSError:
+        return set()
+    return {name[:-len(".law")] for name in names if name.endswith(".law") and not name.startswith(".tmp-")}
+
+def sync_law_mirror(max_workers=None, timeout=None):
+    """현행 법률 전체를 로컬 미러로 동기화
+    - 이전 동기화 이후 MST 가 바뀐(개정된) 법률과 새 법률만 내려받음
+    - 목록에서 빠진 MST 의 본문은 삭제
+    - 반환값: {"total", "fetched", "unchanged", "removed", "failed"}
+    """
+    laws, complete = fetch_law_list(None, timeout, max_workers)
+    if not complete or not laws:
+        raise LawFetchError(f"현행 법률 목록을 모두 가져오지 못해 동기화를 중단합니다 (받은 법률 {len(laws)}개)", laws)
+
+    present = _mirrored_msts()
+    to_fetch = [law for law in laws if law["MST"] not in present]
+    print(f"현행 법률 {len(laws)}개 중 새로 받을 법률 {len(to_fetch)}개")
+
+    def fetch(law):
+        mst = law["MST"]
+        xml_data = get_cached_law_xml(mst)
+        if xml_data is None:
+            try:
+                xml_data = download_law_text(mst, timeout, cache=False)
+            except LawFetchError as e:
+                print(e)
+                return False
+        path = _mirror_xml_path(mst)
+        if path is None or not is_law_xml(xml_data):
+            return False
+        write_blob(path, xml_data)
+        return True
+
+    failed = []
+    workers = max(1, max_workers or FETCH_WORKERS)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for law, ok in zip(to_fetch, pool.map(fetch, to_fetch)):
+            if not ok:
+                print(f"미러 저장 실패: {law['법령명']} (MST: {law['MST']})")
+                failed.append(law)
+
+    # 개정 등으로 목록에서 빠진 이전 버전 본문 삭제
+    current = {law["MST"] for law in laws}
+    removed = 0
+    for mst in present - current:
+        try:
+            os.remove(_mirror_xml_path(mst))
+            removed += 1
+        except (OSError, TypeError):
+            pass
+
+    # 받지 못한 법률은 목록에서 빼 두고 다음 동기화 때 다시 시도
+    failed_msts = {law["MST"] for law in failed}
+    manifest = {
+        "synced_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "laws": [law for law in laws if law["MST"] not in failed_msts],
+    }
+    write_file_atomic(_mirror_manifest_path(), json.dumps(manifest, ensure_ascii=False).encode("utf-8"))
+    invalidate_law_list_cache()
+
+    summary = {
+        "total": len(laws),
+        "fetched": len(to_fetch) - len(failed),
+        "unchanged": len(laws) - len(to_fetch),
+        "removed": removed,
+        "failed": len(failed),
+    }
+    print(f"미러 동기화 완료: {summary}")
+    return summary
+
+def search_law_mirror(query, max_workers=None):
+    """로컬 미러에서 본문에 검색어가 포함된 법률 목록 조회 → (법률 목록, True)"""
+    manifest = load_mirror_manifest()
+    if manifest is None:
+        raise LawFetchError("로컬 미러가 없습니다. 먼저 'python law_processor.py sync' 로 동기화하세요.")
+    needle = query.encode("utf-8")
+
+    def contains(law):
+        xml_data = get_mirrored_law_xml(law["MST"])
+        if xml_data is None or needle not in xml_data:
+            return False
+        # 태그 이름이나 속성에만 있는 경우 제외
+        return needle in _XML_MARKUP_PATTERN.sub(b"", xml_data)
+
+    laws = manifest["laws"]
+    with ThreadPoolExecutor(max_workers=max(1, max_workers or FETCH_WORKERS)) as pool:
+        found = [dict(law) for law, hit in zip(laws, pool.map(contains, laws)) if hit]
+    return found, True
+
+class LawSkip(Exception):
+    """법령을 처리하지 않고 건너뛰는 경우 (메시지는 누락 사유)"""
+
+def get_xml_backend():
+    """법령 본문 파싱에 실제로 쓰는 파서 이름 (lxml 또는 etree)"""
+    if lxml_etree is not None and XML_BACKEND in ("auto", "lxml"):
+        return "lxml"
+    return "etree"
+
+def configure_xml_backend(backend):
+    """법령 본문 XML 파서 변경 (auto, lxml, etree) → 실제로 사용할 파서 이름"""
+    global XML_BACKEND
+    if backend not in ("auto", "lxml", "etree"):
+        raise ValueError(f"알 수 없는 XML 파서: {backend}")
+    XML_BACKEND = backend
+    return get_xml_backend()
+
+def _iter_articles_etree(xml_data):
+    open_elements = []
+    open_articles = 0  # 열려 있는 조문단위 수 (그 안의 요소는 조문단위를 넘길 때까지 유지)
+    for event, elem in ET.iterparse(io.BytesIO(xml_data), events=("start", "end")):
+        if event == "start":
+            open_elements.append(elem)
+            if elem.tag == "조문단위":
+                open_articles += 1
+            continue
+        open_elements.pop()
+        if elem.tag == "조문단위":
+            open_articles -= 1
+            yield elem
+        elif open_articles:
+            continue
+        # 조문단위 밖의 요소(부칙단위, 별표 등)는 닫히는 즉시 버림
+        elem.clear()
+        if open_elements:
+            open_elements[-1].remove(elem)
+
+def _iter_articles_lxml(xml_data):
+    # 조문단위 종료 이벤트만 Python 으로 넘어오고, 읽은 조문은 앞쪽 형제째 잘라냄
+    # 네트워크에서 받은 XML 이므로 huge_tree 는 켜지 않음 (lxml 의 크기/깊이 제한 유지)
+    for _, elem in lxml_etree.iterparse(io.BytesIO(xml_data), events=("end",), tag="조문단위"):
+        yield elem
+        elem.clear(keep_tail=True)
+        parent = elem.getparent()
+        if parent is not None:
+            while elem.getprevious() is not None:
+                del parent[0]
+
+def iter_law_articles(xml_data, backend=None):
+    """법령 본문 XML 에서 조문단위를 하나씩 읽어 반환 (스트리밍 파싱)
+    - 반환한 조문단위는 다음 조문단위를 읽기 전에 비우고 트리에서 떼어내므로
+      메모리에는 문서 전체가 아니라 조문 하나 분량의 트리만 남음
+    - 조문단위 밖의 요소(기본정보, 부칙단위, 별표 등)도 읽는 즉시 버림 (etree)
+    - backend 를 생략하면 get_xml_backend() 의 파서 사용, 어느 쪽이든 결과는 같음
+    - XML 이 깨져 있으면 LawSkip
+    """
+    if (backend or get_xml_backend()) == "lxml" and lxml_etree is not None:
+        articles, parse_error = _iter_articles_lxml(xml_data), lxml_etree.XMLSyntaxError
+    else:
+        articles, parse_error = _iter_articles_etree(xml_data), ET.ParseError
+    try:
+        yield from articles
+    except parse_error as e:
+        raise LawSkip(f"XML 파싱 오류 - {str(e)}")
+
+def parse_law_articles(law, xml_data):
+    """법령 본문 XML 의 조문단위 스트림 반환 (처리할 수 없으면 LawSkip)
+    - 첫 조문단위까지만 미리 읽어 조문 유무를 확인하고 나머지는 소비하는 쪽에서 읽음
+    """
+    if not xml_data:
+        if law.get("fetch_error"):
+            raise LawSkip(f"본문을 받지 못함 - {law['fetch_error']}")
+        raise LawSkip("XML 데이터 없음")
+    articles = iter_law_articles(xml_data)
+    first = next(articles, None)
+    if first is None:
+        raise LawSkip("조문단위 없음")
+    return chain([first], articles)
+
+# ---------------------------------------------------------------------------
+# 파싱된 법령
+# 검색과 개정문 생성이 함께 쓰는 조문 구조. XML 에서 필요한 글자와 위치 표시만 뽑아 두고
+# MST 별로 메모리에 캐시하므로 같은 법령은 프로세스에서 한 번만 파싱한다.
+# 디스크 캐시에도 parsed/<MST>.v<버전> 으로 저장해 다음 실행에서는 XML 을 다시 파싱하지 않는다.
+# 검색은 공백을 뺀 글자로 비교하므로 본문마다 처음 검색할 때 한 번 만들어 메모리에만 둔다 (공백제거()).
+# ---------------------------------------------------------------------------
+PARSED_SCHEMA_VERSION = 2  # 조문 구조나 추출 방식이 바뀌면 올림 (이전 버전 파일은 읽지 않고 용량 상한에 따라 삭제됨)
+
+class LawSubitem:
+    """목 - 목번호 원문 ("가.", 없으면 ""), 목내용들 (목내용 요소별 글자, 비어 있으면 None)"""
+    __slots__ = ("목번호", "목내용들", "_공백제거")
+
+    def __init__(self, 목번호, 목내용들):
+        self.목번호 = 목번호
+        self.목내용들 = 목내용들
+        self._공백제거 = None
+
+    def 공백제거(self):
+        """목내용들에서 공백을 뺀 글자들 (처음 부를 때 만들어 둠)"""
+        if self._공백제거 is None:
+            self._공백제거 = tuple(map(clean, self.목내용들))
+        return self._공백제거
+
+class LawItem:
+    """호 - 호번호 원문 ("3.", "2의2."), 호가지번호 (가지번호 속성, 없으면 ""), 호내용, 목들"""
+    __slots__ = ("호번호", "호가지번호", "호내용", "목들", "_공백제거")
+
+    def __init__(self, 호번호, 호가지번호, 호내용, 목들):
+        self.호번호 = 호번호
+        self.호가지번호 = 호가지번호
+        self.호내용 = 호내용
+        self.목들 = 목들
+        self._공백제거 = None
+
+    def 공백제거(self):
+        """호내용에서 공백을 뺀 글자 (처음 부를 때 만들어 둠)"""
+        if self._공백제거 is None:
+            self._공백제거 = clean(self.호내용)
+        return self._공백제거
+
+class LawParagraph:
+    """항 - 항번호 (①→"1" 로 정규화, 없으면 ""), 항내용, 각목외의부분 여부, 호들"""
+    __slots__ = ("항번호", "항내용", "각목외의부분", "호들", "_공백제거")
+
+    def __init__(self, 항번호, 항내용, 각목외의부분, 호들):
+        self.항번호 = 항번호
+        self.항내용 = 항내용
+        self.각목외의부분 = 각목외의부분
+        self.호들 = 호들
+        self._공백제거 = None
+
+    def 공백제거(self):
+        """항내용에서 공백을 뺀 글자 (처음 부를 때 만들어 둠)"""
+        if self._공백제거 is None:
+            self._공백제거 = clean(self.항내용)
+        return self._공백제거
+
+class LawArticle:
+    """조문 - 조문번호, 조문가지번호, 부칙 여부, 조문제목, 조문내용, 항들"""
+    __slots__ = ("조문번호", "조문가지번호", "is_부칙", "조문제목", "조문내용", "항들", "_공백제거")
+
+    def __init__(self, 조문번호, 조문가지번호, is_부칙, 조문제목, 조문내용, 항들):
+        self.조문번호 = 조문번호
+        self.조문가지번호 = 조문가지번호
+        self.is_부칙 = is_부칙
+        self.조문제목 = 조문제목
+        self.조문내용 = 조문내용
+        self.항들 = 항들
+        self._공백제거 = None
+
+    def 공백제거(self):
+        """조문내용에서 공백을 뺀 글자 (처음 부를 때 만들어 둠)"""
+        if self._공백제거 is None:
+            self._공백제거 = clean(self.조문내용)
+        return self._공백제거
+
+def build_law_article(article):
+    """조문단위 요소 → LawArticle"""
+    항들 = []
+    for 항 in article.findall("항"):
+        항번호 = normalize_number(항.findtext("항번호", "").strip())
+        호들 = []
+        각목외의부분 = False
+        for 호 in 항.findall("호"):
+            if 호.attrib.get("구분") == "각목외의부분":
+                각목외의부분 = True
+            목들 = tuple(LawSubitem(목.findtext("목번호", ""), tuple(m.text for m in 목.findall("목내용")))
+                       for 목 in 호.findall("목"))
+            호들.append(LawItem(호.findtext("호번호", ""), 호.attrib.get("가지번호", ""),
+                              호.findtext("호내용", "") or "", 목들))
+        항들.append(LawParagraph(항번호, 항.findtext("항내용", "") or "", 각목외의부분, tuple(호들)))
+    return LawArticle(
+        article.findtext("조문번호", "").strip(),
+        article.findtext("조문가지번호", "").strip(),
+        "부칙" in article.findtext("조문명", "").strip(),
+        article.findtext("조문제목", "") or "",
+        article.findtext("조문내용", "") or "",
+        tuple(항들),
+    )
+
+def iter_law_text_records(articles, include_부칙=True, with_공백제거=False):
+    """조문 목록의 글자를 문서 순서대로 한 번씩 방문해 (location, text, is_부칙) 반환
+    - location: (종류, 조문, 항, 호, 목)
+      종류는 "조문제목", "조문내용", "항내용", "호내용", "목내용"
+      나머지는 글자가 속한 LawArticle, LawParagraph, LawItem, LawSubitem (해당 없으면 None)
+    - 조문제목/조문내용/항내용은 비어 있어도 반환 (조문과 항의 시작을 알 수 있음)
+    - 목내용은 목내용 요소마다 반환 (글자가 없으면 None)
+    - include_부칙 이 False 면 부칙 조문은 하위 항/호/목까지 통째로 건너뜀
+    - with_공백제거 가 True 면 text 대신 (text, 공백을 뺀 text) 반환 (조문제목은 검색에 쓰지 않아 None)
+    """
+    for article in articles:
+        is_부칙 = article.is_부칙
+        if is_부칙 and not include_부칙:
+            continue
+        yield ("조문제목", article, None, None, None), \
+            (article.조문제목, None) if with_공백제거 else article.조문제목, is_부칙
+        yield ("조문내용", article, None, None, None), \
+            (article.조문내용, article.공백제거()) if with_공백제거 else article.조문내용, is_부칙
+        for 항 in article.항들:
+            yield ("항내용", article, 항, None, None), (항.항내용, 항.공백제거()) if with_공백제거 else 항.항내용, is_부칙
+            for 호 in 항.호들:
+                yield ("호내용", article, 항, 호, None), (호.호내용, 호.공백제거()) if with_공백제거 else 호.호내용, is_부칙
+                for 목 in 호.목들:
+                    목내용들 = zip(목.목내용들, 목.공백제거()) if with_공백제거 else 목.목내용들
+                    for 목내용 in 목내용들:
+                        yield ("목내용", article, 항, 호, 목), 목내용, is_부칙
+
+_parsed_laws = OrderedDict()  # (BASE, MST) → (LawArticle, ...)
+_parsed_laws_lock = threading.Lock()
+
+def get_parsed_law(mst):
+    """메모리에 캐시된 파싱된 법령 (없으면 None)"""
+    key = (BASE, mst)
+    with _parsed_laws_lock:
+        articles = _parsed_laws.get(key)
+        if articles is not None:
+            _parsed_laws.move_to_end(key)
+        return articles
+
+def put_parsed_law(mst, articles):
+    if PARSED_CACHE_MAX_ENTRIES <= 0:
+        return
+    key = (BASE, mst)
+    with _parsed_laws_lock:
+        _parsed_laws[key] = articles
+        _parsed_laws.move_to_end(key)
+        while len(_parsed_laws) > PARSED_CACHE_MAX_ENTRIES:
+            _parsed_laws.popitem(last=False)
+
+def invalidate_parsed_law_cache():
+    """파싱된 법령 메모리 캐시 비우기 (디스크 캐시는 그대로)"""
+    with _parsed_laws_lock:
+        _parsed_laws.clear()
+
+def _parsed_law_cache_path(mst):
+    if not re.fullmatch(r"[0-9A-Za-z_-]+", str(mst)):
+        return None
+    return os.path.join(base_cache_dir(CACHE_DIR), "parsed", f"{mst}.v{PARSED_SCHEMA_VERSION}")
+
+def _law_to_rows(articles):
+    # marshal 로 저장할 수 있도록 튜플/문자열/bool/None 만으로 변환
+    return tuple(
+        (article.조문번호, article.조문가지번호, article.is_부칙, article.조문제목, article.조문내용, tuple(
+            (항.항번호, 항.항내용, 항.각목외의부분, tuple(
+                (호.호번호, 호.호가지번호, 호.호내용, tuple((목.목번호, 목.목내용들) for 목 in 호.목들))
+                for 호 in 항.호들))
+            for 항 in article.항들))
+        for article in articles)
+
+def _law_from_rows(rows):
+    return tuple(
+        LawArticle(조문번호, 조문가지번호, is_부칙, 조문제목, 조문내용, tuple(
+            LawParagraph(항번호, 항내용, 각목외의부분, tuple(
+                LawItem(호번호, 호가지번호, 호내용, tuple(LawSubitem(목번호, 목내용들) for 목번호, 목내용들 in 목들))
+                for 호번호, 호가지번호, 호내용, 목들 in 호들))
+            for 항번호, 항내용, 각목외의부분, 호들 in 항들))
+        for 조문번호, 조문가지번호, is_부칙, 조문제목, 조문내용, 항들 in rows)
+
+def get_cached_parsed_law_data(mst):
+    """디스크 캐시에서 파싱된 법령의 marshal 데이터 조회 (없으면 None)"""
+    path = _parsed_law_cache_path(mst) if CACHE_ENABLED else None
+    if path is None:
+        return None
+    data = read_blob(path)
+    if data is not None:
+        try:
+            os.utime(path)  # 최근 사용 시각 갱신 (LRU 삭제 기준)
+        except OSError:
+            pass
+    return data
+
+def _remove_parsed_law_cache(mst):
+    path = _parsed_law_cache_path(mst)
+    print(f"읽을 수 없는 파싱 캐시 삭제: {path}")
+    try:
+        os.remove(path)
+    except (OSError, TypeError):
+        pass
+
+def parsed_law_from_data(mst, data):
+    """marshal 데이터 → 조문 목록 (읽을 수 없으면 디스크 캐시에서 지우고 None)"""
+    try:
+        return _law_from_rows(marshal.loads(data))
+    except (EOFError, ValueError, TypeError):
+        _remove_parsed_law_cache(mst)
+        return None
+
+def get_cached_parsed_law(mst):
+    """디스크 캐시에서 파싱된 법령 조회 (없거나 읽을 수 없으면 None)"""
+    data = get_cached_parsed_law_data(mst)
+    return parsed_law_from_data(mst, data) if data is not None else None
+
+def put_cached_parsed_law(mst, articles):
+    """파싱된 법령을 디스크 캐시에 저장"""
+    path = _parsed_law_cache_path(mst) if CACHE_ENABLED else None
+    if path is None:
+        return
+    try:
+        delta = write_blob(path, marshal.dumps(_law_to_rows(articles)))
+    except OSError as e:
+        print(f"파싱 캐시 저장 실패 (MST: {mst}): {e}")
+        return
+    _add_cache_size(delta)
+
+def load_parsed_law(mst):
+    """파싱된 법령 조회: 메모리 → 디스크 캐시 순 (없으면 None)"""
+    articles = get_parsed_law(mst)
+    if articles is None:
+        articles = get_cached_parsed_law(mst)
+        if articles is not None:
+            put_parsed_law(mst, articles)
+    return articles
+
+def fetch_law_source(law):
+    """파싱된 법령이 있으면 그것을, 없으면 본문 XML 반환 (run_law_pipeline 의 수집 단계용)"""
+    articles = load_parsed_law(law["MST"])
+    return articles if articles is not None else fetch_law_text(law)
+
+def parse_law(law, source, cache=True):
+    """법령 본문 XML → 조문 목록 (LawArticle 튜플, 처리할 수 없으면 LawSkip)
+    - source 가 이미 파싱된 조문 목록이면 그대로 반환
+    - cache 면 파싱 결과를 MST 로 캐시 (다른 MST 의 이전 버전을 대신 받은 법령(law["stale_body"])은 제외)
+    """
+    if isinstance(source, tuple):
+        return source
+    articles = tuple(build_law_article(article) for article in parse_law_articles(law, source))
+    if cache and not law.get("stale_body"):
+        put_parsed_law(law["MST"], articles)
+        put_cached_parsed_law(law["MST"], articles)
+    return articles
+
+_PIPELINE_DONE = object()
+
+def run_law_pipeline(laws, parse, match, max_workers=None, parse_workers=None, match_workers=None, queue_size=None,
+                     fetch=None):
+    """법령별 처리를 수집 → 파싱 → 매칭 단계로 나누어 동시에 실행하고 입력 순서대로 (law, 결과, 누락 사유) 반환
+    - 수집: iter_law_texts (동시 요청 max_workers 개, fetch 는 법령별 조회 함수)
+    - 파싱: parse(law, xml_data) → 중간 결과 / 매칭: match(law, 중간 결과) → 결과
+    - 단계 사이 대기열은 queue_size 개로 제한 (넓은 검색어에서도 메모리 사용량이 일정)
+    - LawSkip 이 발생한 법령은 결과 None 과 누락 사유를, 그 밖의 오류는 그대로 다시 발생
+    """
+    parse_workers = max(1, parse_workers or PARSE_WORKERS)
+    match_workers = max(1, match_workers or MATCH_WORKERS)
+    queue_size = max(1, queue_size or PIPELINE_QUEUE_SIZE)
+    raw_queue = queue.Queue(maxsize=queue_size)
+    parsed_queue = queue.Queue(maxsize=queue_size)
+    results = {}
+    fatal_errors = []
+    results_ready = threading.Condition()
+    stop = threading.Event()
+    parsers_left = [parse_workers]
+
+    def put(q, item):
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(q):
+        while not stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _PIPELINE_DONE
+
+    def finish(idx, law, result, error):
+        with results_ready:
+            results[idx] = (law, result, error)
+            results_ready.notify_all()
+
+    def fetch_stage():
+        try:
+            for idx, (law, xml_data) in enumerate(iter_law_texts(laws, max_workers, fetch)):
+                if not put(raw_queue, (idx, law, xml_data)):
+                    return
+        except BaseException as e:
+            with results_ready:
+                fatal_errors.append(e)
+                results_ready.notify_all()
+        finally:
+            for _ in range(parse_workers):
+                put(raw_queue, _PIPELINE_DONE)
+
+    def parse_stage():
+        try:
+            while True:
+                item = get(raw_queue)
+                if item is _PIPELINE_DONE:
+                    break
+                idx, law, xml_data = item
+                try:
+                    parsed = parse(law, xml_data)
+                except Exception as e:
+                    finish(idx, law, None, e)
+                    continue
+                del xml_data, item  # 파싱이 끝난 원문은 바로 해제
+                if not put(parsed_queue, (idx, law, parsed)):
+                    break
+        finally:
+            with results_ready:
+                parsers_left[0] -= 1
+                last_parser = parsers_left[0] == 0
+            if last_parser:
+                for _ in range(match_workers):
+                    put(parsed_queue, _PIPELINE_DONE)
+
+    def match_stage():
+        while True:
+            item = get(parsed_queue)
+            if item is _PIPELINE_DONE:
+                break
+            idx, law, parsed = item
+            try:
+                finish(idx, law, match(law, parsed), None)
+            except Exception as e:
+                finish(idx, law, None, e)
+
+    threads = [threading.Thread(target=fetch_stage, daemon=True)]
+    threads += [threading.Thread(target=parse_stage, daemon=True) for _ in range(parse_workers)]
+    threads += [threading.Thread(target=match_stage, daemon=True) for _ in range(match_workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        for idx in range(len(laws)):
+            with results_ready:
+                while idx not in results and not fatal_errors:
+                    results_ready.wait()
+                if idx not in results:
+                    raise fatal_errors[0]
+                law, result, error = results.pop(idx)
+            if isinstance(error, LawSkip):
+                yield law, None, str(error)
+            elif error is not None:
+                raise error
+            else:
+                yield law, result, None
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+# ---------------------------------------------------------------------------
+# 프로세스 풀 실행
+# 본문이 캐시되어 있으면 법령별 처리는 순수 Python 연산이라 스레드로는 코어 하나만 쓴다.
+# PROCESS_WORKERS 를 지정하면 수집은 이 프로세스의 스레드가, 파싱/매칭은 작업 프로세스가 맡는다.
+# 작업 프로세스는 spawn 으로 띄우므로 모듈을 "law_processor" 이름으로 import 할 수 있어야 한다.
+# ---------------------------------------------------------------------------
+_process_pool = None
+_process_pool_size = 0
+_process_pool_lock = threading.Lock()
+
+def get_process_pool(processes):
+    """작업 프로세스 풀 (프로세스 수가 바뀌면 새로 만듦, 프로세스는 호출 사이에 재사용)"""
+    global _process_pool, _process_pool_size
+    with _process_pool_lock:
+        if _process_pool is None or _process_pool_size != processes:
+            if _process_pool is not None:
+                _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
+            _process_pool_size = processes
+        return _process_pool
+
+def shutdown_process_pool():
+    """작업 프로세스 풀 종료"""
+    global _process_pool, _process_pool_size
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=True, cancel_futures=True)
+        _process_pool = None
+        _process_pool_size = 0
+
+def _process_settings():
+    # 작업 프로세스는 환경변수로 설정을 다시 읽으므로 configure_* 로 바꾼 값은 작업마다 함께 보냄
+    # (BASE 는 캐시 위치를 정하는 데만 씀 - 작업 프로세스는 본문을 받지 않음)
+    return (BASE, PARSED_CACHE_MAX_ENTRIES, XML_BACKEND,
+            (CACHE_DIR, CACHE_COMPRESSION, CACHE_MAX_BYTES, CACHE_ENABLED))
+
+def _fetch_for_process(law):
+    """작업 프로세스로 보낼 법령 자료: ("parsed", 파싱된 법령의 marshal 데이터) 또는 본문 XML
+    - 본문 수집(재시도, 차단기, 이전 버전 대신 쓰기)은 모두 이 프로세스에서 하고 작업 프로세스는 네트워크를 쓰지 않음
+    - 이전 버전 본문을 대신 받은 법령(stale_body)은 fetch_law_text 에서 표시되므로 여기서는 MST 그대로 조회
+    """
+    articles = get_parsed_law(law["MST"])
+    if articles is not None:
+        return "parsed", marshal.dumps(_law_to_rows(articles))
+    data = get_cached_parsed_law_data(law["MST"])
+    if data is not None:
+        # 읽을 수 없는 캐시는 작업 프로세스로 보내지 않고 지운 뒤 본문을 받음 (marshal 해석만 해 보므로 빠름)
+        try:
+            marshal.loads(data)
+            return "parsed", data
+        except (EOFError, ValueError, TypeError):
+            _remove_parsed_law_cache(law["MST"])
+    return fetch_law_text(law)
+
+def _process_law(settings, law, source, match, match_args):
+    """작업 프로세스에서 실행: 파싱(또는 파싱된 법령 복원) 후 match(조문 목록, *match_args) → (결과, 누락 사유)
+    - source 는 _fetch_for_process 의 반환값 (본문을 받지 못했으면 None → 누락 사유)
+    """
+    global BASE, PARSED_CACHE_MAX_ENTRIES
+    BASE, PARSED_CACHE_MAX_ENTRIES, xml_backend, cache = settings
+    configure_xml_backend(xml_backend)
+    if cache != (CACHE_DIR, CACHE_COMPRESSION, CACHE_MAX_BYTES, CACHE_ENABLED):
+        configure_cache(*cache)
+    try:
+        if isinstance(source, tuple):
+            articles = get_parsed_law(law["MST"])
+            if articles is None:
+                articles = parsed_law_from_data(law["MST"], source[1])
+                if articles is None:
+                    raise LawSkip("파싱 캐시를 읽을 수 없음")
+                put_parsed_law(law["MST"], articles)
+        else:
+            articles = parse_law(law, source)
+        return match(articles, *match_args), None
+    except LawSkip as e:
+        return None, str(e)
+
+def run_law_processes(laws, match, match_args=(), max_workers=None, processes=None):
+    """run_law_pipeline 과 같은 결과를 프로세스 풀로 계산해 입력 순서대로 (law, 결과, 누락 사유) 반환
+    - match 는 match(조문 목록, *match_args) 형태의 모듈 수준 함수 (작업 프로세스로 보내야 하므로)
+    - 수집은 iter_law_texts (동시 요청 max_workers 개), 처리 중인 법령은 프로세스 수의 2배까지만
+    - 결과는 법령 순서대로 합치므로 프로세스 수와 관계없이 같은 결과
+    """
+    processes = max(1, processes or PROCESS_WORKERS or os.cpu_count() or 1)
+    pool = get_process_pool(processes)
+    settings = _process_settings()
+    pending = deque()
+    try:
+        for law, source in iter_law_texts(laws, max_workers, _fetch_for_process):
+            pending.append((law, pool.submit(_process_law, settings, law, source, match, match_args)))
+            if len(pending) >= processes * 2:
+                law, future = pending.popleft()
+                yield (law,) + future.result()
+        while pending:
+            law, future = pending.popleft()
+            yield (law,) + future.result()
+    except BrokenProcessPool:
+        shutdown_process_pool()
+        raise
+    finally:
+        for _, future in pending:
+            future.cancel()
+
 def clean(text):
-    return re.sub(r"\s+", "", text or "")
+    # str.split() 의 공백 기준은 정규식 \s 와 같음 (re.sub 보다 빠름)
+    return "".join((text or "").split())
 
 def normalize_number(text):
     try:
@@ -103,438 +1541,340 @@ def has_rieul_batchim(word):
         return jongseong == 8
     return False
     
-def extract_article_num(loc):
-    """조번호를 추출하여 정수로 변환하는 함수"""
-    article_match = re.search(r'제(\d+)조(?:의(\d+))?', loc)
-    if not article_match:
-        return (0, 0)
-    
-    # 조번호를 정수로 변환 (37 < 357 정렬을 위해)
-    article_num = int(article_match.group(1))
-    article_sub = int(article_match.group(2)) if article_match.group(2) else 0
-    
-    return (article_num, article_sub)
+_TOKEN_ASCII = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789")
+
+def is_token_char(ch):
+    """단어(덩어리)를 이루는 글자인지 - 정규식 [가-힣A-Za-z0-9] 와 같음"""
+    return "가" <= ch <= "힣" or ch in _TOKEN_ASCII
+
+def iter_matching_tokens(text, find_word):
+    """text 를 [가-힣A-Za-z0-9]+ 단어로 나눴을 때 find_word 를 포함하는 단어들 (나오는 순서대로, 단어마다 한 번)
+    - 전체를 나누지 않고 find_word 가 나오는 곳에서만 앞뒤로 단어 경계까지 넓힘
+    - find_word 에 단어 글자가 아닌 것(공백, 문장부호)이 있으면 어느 단어에도 들어갈 수 없으므로 없음
+    """
+    for start, end in iter_matching_token_spans(text, find_word):
+        yield text[start:end]
+
+def iter_matching_token_spans(text, find_word, starts=None):
+    """iter_matching_tokens 의 단어 위치 (start, end) - 단어는 최대 길이로 자르므로 서로 겹치지 않음
+    - starts: find_word 가 나오는 위치를 이미 알면 그 목록 (TermAutomaton.find), 없으면 str.find 로 찾음
+    """
+    if not find_word:
+        for match in re.finditer(r'[가-힣A-Za-z0-9]+', text):
+            yield match.span()
+        return
+    if not all(map(is_token_char, find_word)):
+        return
+    length = len(text)
+    if starts is None:
+        start = text.find(find_word)
+        while start >= 0:
+            end = _token_end(text, start + len(find_word), length)
+            yield _token_start(text, start), end
+            # 같은 단어 안의 다음 검색어는 이미 처리했으므로 단어 끝부터 다시 찾음
+            start = text.find(find_word, end)
+        return
+    end = 0
+    for start in starts:
+        if start < end:
+            continue  # 앞 단어 안에서 나온 검색어
+        end = _token_end(text, start + len(find_word), length)
+        yield _token_start(text, start), end
+
+def _token_start(text, start):
+    while start > 0 and is_token_char(text[start - 1]):
+        start -= 1
+    return start
+
+def _token_end(text, end, length):
+    while end < length and is_token_char(text[end]):
+        end += 1
+    return end
+
+class TermAutomaton:
+    """여러 검색어를 글자를 한 번만 훑어 모두 찾는 Aho–Corasick 오토마톤 (검색어 묶음마다 한 번 만듦)
+    - find(text) → {검색어 번호: [시작 위치, ...]} (겹치는 위치 포함, 위치 순서대로)
+    - 실패 함수를 미리 따라가 둔 상태 전이표를 쓰므로 글자마다 dict 조회 한두 번
+      (처음 상태의 전이는 모든 상태에 복사하지 않고 전이가 없을 때 따로 조회)
+    - 검색어에 없는 글자에서는 처음 상태로 돌아가므로 검색어 글자가 이어진 구간만 정규식으로 골라 훑음
+    """
+
+    def __init__(self, terms):
+        self.terms = tuple(terms)
+        if not all(self.terms):
+            raise ValueError("빈 검색어는 오토마톤에 넣을 수 없습니다")
+        goto = [{}]
+        outputs = [()]
+        for idx, term in enumerate(self.terms):
+            state = 0
+            for ch in term:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    outputs.append(())
+                state = nxt
+            outputs[state] += (idx,)
+        # 실패 함수 (너비 우선) → 상태 전이표 (없는 글자는 실패 상태의 전이, 그래도 없으면 처음 상태의 전이)
+        fail = [0] * len(goto)
+        delta = [dict(transitions) for transitions in goto]
+        root = delta[0]
+        pending = deque(root.values())
+        while pending:
+            state = pending.popleft()
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch) or root.get(ch, 0)
+                outputs[nxt] += outputs[fail[nxt]]
+                pending.append(nxt)
+            if fail[state]:
+                for ch, nxt in delta[fail[state]].items():
+                    delta[state].setdefault(ch, nxt)
+        self._delta = delta
+        self._outputs = outputs
+        self._lengths = [len(term) for term in self.terms]
+        alphabet = "".join(sorted(set("".join(self.terms))))
+        self._segments = re.compile(f"[{re.escape(alphabet)}]{{{min(self._lengths)},}}")
+
+    def find(self, text):
+        delta, outputs, lengths = self._delta, self._outputs, self._lengths
+        root_get = delta[0].get
+        found = {}
+        for segment in self._segments.finditer(text):
+            state = 0
+            offset = segment.start() + 1
+            for pos, ch in enumerate(segment.group(), offset):
+                state = delta[state].get(ch) or root_get(ch, 0)
+                if outputs[state]:
+                    for idx in outputs[state]:
+                        found.setdefault(idx, []).append(pos - lengths[idx])
+        return found
+
+@lru_cache(maxsize=8)
+def get_term_automaton(terms):
+    """검색어 묶음(튜플)별 TermAutomaton (같은 묶음으로 여러 법령을 읽을 때 한 번만 만듦)"""
+    return TermAutomaton(terms)
+
+# 검색어 뒤에 붙은 꼬리 → (조사, 접미사)
+# - 접미사: 덩어리에 포함시키지 않을 것들 (조사와 겹치면 접미사로 처리)
+# - 조사: 규칙에 따른 18가지 조사 (따옴표가 있는 경우는 따옴표를 뗀 조사로)
+_SUFFIX_EXCLUDE = ["의", "에", "에서", "에게",
+                   "등", "등의", "등인", "등만", "등에", "만", "만을", "만이", "만은", "만에", "만으로"]
+_JOSA_LIST = ["을", "를", "과", "와", "이", "가", "이나", "나", "으로", "로", "은", "는",
+              "란", "이란", "라", "이라", "로서", "으로서", "로써", "으로써",
+              "\"란", "\"이란", "\"라", "\"이라"]
+_CHUNK_TAILS = {s: (None, s) for s in _SUFFIX_EXCLUDE}
+for _josa in _JOSA_LIST:
+    _CHUNK_TAILS.setdefault(_josa, (_josa[1:] if _josa.startswith("\"") else _josa, None))
 
 def extract_chunk_and_josa(token, searchword):
-    """검색어를 포함하는 덩어리와 조사를 추출"""
-    # 제외할 접미사 리스트 (덩어리에 포함시키지 않을 것들)
-    suffix_exclude = ["의", "에", "에서", "에게", 
-                     "등", "등의", "등인", "등만", "등에", "만", "만을", "만이", "만은", "만에", "만으로"]
-    
-    # 처리할 조사 리스트 (규칙에 따른 18가지 조사)
-    josa_list = ["을", "를", "과", "와", "이", "가", "이나", "나", "으로", "로", "은", "는", 
-                "란", "이란", "라", "이라", "로서", "으로서", "로써", "으로써",
-                "\"란", "\"이란", "\"라", "\"이라"]  # 따옴표가 있는 경우 추가
-    
-    # 원본 토큰 저장
-    original_token = token
-    suffix = None
-    
-    # 검색어 자체가 토큰인 경우 바로 반환
-    if token == searchword:
-        return token, None, None
-    
-    # 토큰에 검색어가 포함되어 있지 않으면 바로 반환
-    if searchword not in token:
+    """검색어를 포함하는 덩어리와 조사를 추출 → (덩어리, 조사, 접미사)
+    - 토큰이 정확히 "검색어+접미사" 면 (검색어, None, 접미사) (예: "지방법원에")
+    - 토큰이 정확히 "검색어+조사" 면 (검색어, 조사, None) (예: "지방법원을")
+    - 그 밖에는 토큰 전체가 덩어리 (예: "지방법원판사", 검색어가 토큰 중간에 있는 경우)
+    """
+    if token == searchword or not token.startswith(searchword):
         return token, None, None
-    
-    # 토큰이 검색어로 시작하는지 확인
-    if not token.startswith(searchword):
-        # 검색어가 토큰 중간에 있는 경우 (다른 단어의 일부)
+    tail = _CHUNK_TAILS.get(token[len(searchword):])
+    if tail is None:
         return token, None, None
-    
-    # 1. 접미사 제거 시도 (덩어리에 포함시키지 않음)
-    for s in sorted(suffix_exclude, key=len, reverse=True):
-        if token == searchword + s:
-            # 정확히 "검색어+접미사"인 경우 (예: "지방법원에")
-            print(f"접미사 처리: '{token}' = '{searchword}' + '{s}'")  # 디버깅
-            return searchword, None, s
-    
-    # 2. 조사 확인 (조사는 규칙에 따라 처리)
-    for j in sorted(josa_list, key=len, reverse=True):
-        if token == searchword + j:
-            # 정확히 "검색어+조사"인 경우 (예: "지방법원을")
-            print(f"조사 처리: '{token}' = '{searchword}' + '{j}'")  # 디버깅
-            
-            # 특수 케이스: 따옴표가 있는 조사 처리
-            if j.startswith("\""):
-                # 따옴표를 제거한 기본 조사
-                base_josa = j[1:]
-                return searchword, base_josa, None
-            
-            return searchword, j, None
-    
-    # 3. 덩어리 처리 (검색어 뒤에 다른 문자가 있는 경우)
-    if token.startswith(searchword) and len(token) > len(searchword):
-        # 예: "지방법원판사", "지방법원장" 등 (검색어 뒤에 다른 단어가 붙음)
-        print(f"덩어리 전체 처리: '{token}' (검색어: '{searchword}')")  # 디버깅
-        return token, None, None
-    
-    # 기본 반환 - 토큰 전체
-    return token, None, None
+    return searchword, tail[0], tail[1]
 
+# 개정문 조사 규칙 표
+# 조사 → (B 받침 ㄹ, B 받침 ㄹ 외, B 받침 없음) 일 때의 문장 틀 (A = orig, B = replaced)
+# A 받침에 따라서도 달라지는 규칙은 {A 받침 있음: (...), A 받침 없음: (...)}
+# 틀의 {josa} 는 원래 조사 (따옴표 포함), {q} 는 조사가 따옴표로 시작하면 따옴표
+_A을_B로 = '"{orig}"을 "{replaced}"로 한다.'
+_A을_B으로 = '"{orig}"을 "{replaced}"으로 한다.'
+_A를_B로 = '"{orig}"를 "{replaced}"로 한다.'
+_A를_B으로 = '"{orig}"를 "{replaced}"으로 한다.'
+_JOSA_RULES = {
+    None: {True: (_A을_B로, _A을_B으로, _A을_B로),  # 규칙 0 (조사가 없는 경우)
+           False: (_A를_B로, _A를_B으로, _A를_B로)},
+    "을": (_A을_B로, _A을_B으로, '"{orig}을"을 "{replaced}를"로 한다.'),  # 규칙 1
+    "를": ('"{orig}를"을 "{replaced}을"로 한다.', '"{orig}를"을 "{replaced}을"로 한다.', _A를_B로),  # 규칙 2
+    "과": (_A을_B로, _A을_B으로, '"{orig}과"를 "{replaced}와"로 한다.'),  # 규칙 3
+    "와": ('"{orig}와"를 "{replaced}과"로 한다.', '"{orig}와"를 "{replaced}과"로 한다.', _A를_B로),  # 규칙 4
+    "이": (_A을_B로, _A을_B으로, '"{orig}이"를 "{replaced}가"로 한다.'),  # 규칙 5
+    "가": ('"{orig}가"를 "{replaced}이"로 한다.', '"{orig}가"를 "{replaced}이"로 한다.', _A를_B로),  # 규칙 6
+    "이나": (_A을_B로, _A을_B으로, '"{orig}이나"를 "{replaced}나"로 한다.'),  # 규칙 7
+    "나": ('"{orig}나"를 "{replaced}이나"로 한다.', '"{orig}나"를 "{replaced}이나"로 한다.', _A를_B로),  # 규칙 8
+    "으로": ('"{orig}으로"를 "{replaced}로"로 한다.', _A을_B으로, '"{orig}으로"를 "{replaced}로"로 한다.'),  # 규칙 9
+    "로": {True: (_A을_B로, '"{orig}로"를 "{replaced}으로"로 한다.', _A을_B로),  # 규칙 10
+           False: (_A를_B로, '"{orig}로"를 "{replaced}으로"로 한다.', _A를_B로)},
+    "는": ('"{orig}는"을 "{replaced}은"으로 한다.', '"{orig}는"을 "{replaced}은"으로 한다.', _A를_B로),  # 규칙 11
+    "은": (_A을_B로, _A을_B으로, '"{orig}은"을 "{replaced}는"으로 한다.'),  # 규칙 12
+    "란": ('"{orig}{josa}"을 "{replaced}이{q}란"으로 한다.', '"{orig}{josa}"을 "{replaced}이{q}란"으로 한다.',
+           _A를_B로),  # 규칙 13
+    "이란": (_A을_B로, _A을_B으로, '"{orig}{josa}"을 "{replaced}{q}란"으로 한다.'),  # 규칙 14
+    "로서": {True: (_A을_B로, '"{orig}{josa}"를 "{replaced}으로서"로 한다.', _A을_B로),  # 규칙 15
+             False: (_A를_B로, '"{orig}{josa}"를 "{replaced}으로서"로 한다.', _A를_B로)},
+    "로써": {True: (_A을_B로, '"{orig}{josa}"를 "{replaced}으로써"로 한다.', _A을_B로),
+             False: (_A를_B로, '"{orig}{josa}"를 "{replaced}으로써"로 한다.', _A를_B로)},
+    "으로서": ('"{orig}{josa}"를 "{replaced}로서"로 한다.', _A을_B으로, '"{orig}{josa}"를 "{replaced}로서"로 한다.'),  # 규칙 16
+    "으로써": ('"{orig}{josa}"를 "{replaced}로써"로 한다.', _A을_B으로, '"{orig}{josa}"를 "{replaced}로써"로 한다.'),
+    "라": ('"{orig}{josa}"를 "{replaced}이{q}라"로 한다.', '"{orig}{josa}"를 "{replaced}이{q}라"로 한다.',
+           _A를_B로),  # 규칙 17
+    "이라": (_A을_B로, _A을_B으로, '"{orig}{josa}"를 "{replaced}{q}라"로 한다.'),  # 규칙 18
+}
+
+def _compile_josa_rules(rules):
+    """규칙 표 → {(조사, A 받침, B 받침, B ㄹ 받침): 문장 틀}
+    - 따옴표가 붙은 조사 ('"란' 등)도 같은 규칙으로 넣고, 조사와 따옴표는 틀에 미리 채움
+    """
+    table = {}
+    for josa, rule in rules.items():
+        for variant in ([josa] if josa is None else [josa, '"' + josa]):
+            quote_prefix = '"' if variant and variant.startswith('"') else ""
+            for orig_has_batchim in (True, False):
+                cases = rule[orig_has_batchim] if isinstance(rule, dict) else rule
+                for (replaced_has_batchim, replaced_has_rieul), template in zip(
+                        ((True, True), (True, False), (False, False)), cases):
+                    if variant:
+                        template = template.replace("{josa}", variant).replace("{q}", quote_prefix)
+                    table[(variant, orig_has_batchim, replaced_has_batchim, replaced_has_rieul)] = template
+    return table
+
+_JOSA_RULE_TABLE = _compile_josa_rules(_JOSA_RULES)
+
+@lru_cache(maxsize=4096)
 def apply_josa_rule(orig, replaced, josa):
-    """개정문 조사 규칙에 따라 적절한 형식 반환"""
+    """개정문 조사 규칙에 따라 적절한 형식 반환
+    - 받침 여부와 조사로 규칙 표(_JOSA_RULE_TABLE)의 문장 틀을 골라 채움
+    - 같은 (orig, replaced, josa) 는 한 번만 계산
+    """
     # 동일한 단어면 변경할 필요 없음
     if orig == replaced:
-        return f'"{orig}"를 "{replaced}"로 한다.'
-        
-    # 받침 여부 확인
+        return _A를_B로.format(orig=orig, replaced=replaced)
     orig_has_batchim = has_batchim(orig)
-    replaced_has_batchim = has_batchim(replaced)
-    replaced_has_rieul = has_rieul_batchim(replaced)
-    
-    # 조사가 없는 경우 (규칙 0)
-    if josa is None:
-        if not orig_has_batchim:  # 규칙 0-1: A가 받침 없는 경우
-            if not replaced_has_batchim or replaced_has_rieul:  # 규칙 0-1-1, 0-1-2-1
-                return f'"{orig}"를 "{replaced}"로 한다.'
-            else:  # 규칙 0-1-2-2: B의 받침이 ㄹ이 아닌 경우
-                return f'"{orig}"를 "{replaced}"으로 한다.'
-        else:  # 규칙 0-2: A가 받침 있는 경우
-            if not replaced_has_batchim or replaced_has_rieul:  # 규칙 0-2-1, 0-2-2-1
-                return f'"{orig}"을 "{replaced}"로 한다.'
-            else:  # 규칙 0-2-2-2: B의 받침이 ㄹ이 아닌 경우
-                return f'"{orig}"을 "{replaced}"으로 한다.'
-    
-    # 따옴표가 있는 경우 조사에서 따옴표 제거
-    clean_josa = josa
-    if josa and josa.startswith('"'):
-        clean_josa = josa[1:]
-    
-    # 조사별 규칙 처리
-    if clean_josa == "을":  # 규칙 1
-        if replaced_has_batchim:
-            if replaced_has_rieul:  # 규칙 1-1-1
-                return f'"{orig}"을 "{replaced}"로 한다.'
-            else:  # 규칙 1-1-2
-                return f'"{orig}"을 "{replaced}"으로 한다.'
-        else:  # 규칙 1-2
-            return f'"{orig}을"을 "{replaced}를"로 한다.'
-    
-    elif clean_josa == "를":  # 규칙 2
-        if replaced_has_batchim:  # 규칙 2-1
-            return f'"{orig}를"을 "{replaced}을"로 한다.'
-        else:  # 규칙 2-2
-            return f'"{orig}"를 "{replaced}"로 한다.'
-    
-    elif clean_josa == "과":  # 규칙 3
-        if replaced_has_batchim:
-            if replaced_has_rieul:  # 규칙 3-1-1
-                return f'"{orig}"을 "{replaced}"로 한다.'
-            else:  # 규칙 3-1-2
-                return f'"{orig}"을 "{replaced}"으로 한다.'
-        else:  # 규칙 3-2
-            return f'"{orig}과"를 "{replaced}와"로 한다.'
-    
-    elif clean_josa == "와":  # 규칙 4
-        if replaced_has_batchim:  # 규칙 4-1
-            return f'"{orig}와"를 "{replaced}과"로 한다.'
-        else:  # 규칙 4-2
-            return f'"{orig}"를 "{replaced}"로 한다.'
-    
-    elif clean_josa == "이":  # 규칙 5
-        if replaced_has_batchim:
-            if replaced_has_rieul:  # 규칙 5-1-1
-                return f'"{orig}"을 "{replaced}"로 한다.'
-            else:  # 규칙 5-1-2
-                return f'"{orig}"을 "{replaced}"으로 한다.'
-        else:  # 규칙 5-2
-            return f'"{orig}이"를 "{replaced}가"로 한다.'
-    
-    elif clean_josa == "가":  # 규칙 6
-        if replaced_has_batchim:  # 규칙 6-1
-            return f'"{orig}가"를 "{replaced}이"로 한다.'
-        else:  # 규칙 6-2
-            return f'"{orig}"를 "{replaced}"로 한다.'
-    
-    elif clean_josa == "이나":  # 규칙 7
-        if replaced_has_batchim:
-            if replaced_has_rieul:  # 규칙 7-1-1
-                return f'"{orig}"을 "{replaced}"로 한다.'
-            else:  # 규칙 7-1-2
-                return f'"{orig}"을 "{replaced}"으로 한다.'
-        else:  # 규칙 7-2
-            return f'"{orig}이나"를 "{replaced}나"로 한다.'
-    
-    elif clean_josa == "나":  # 규칙 8
-        if replaced_has_batchim:  # 규칙 8-1
-            return f'"{orig}나"를 "{replaced}이나"로 한다.'
-        else:  # 규칙 8-2
-            return f'"{orig}"를 "{replaced}"로 한다.'
-    
-    elif clean_josa == "으로":  # 규칙 9
-        if replaced_has_batchim:
-            if replaced_has_rieul:  # 규칙 9-1-1
-                return f'"{orig}으로"를 "{replaced}로"로 한다.'
-            else:  # 규칙 9-1-2
-                return f'"{orig}"을 "{replaced}"으로 한다.'
-        else:  # 규칙 9-2
-            return f'"{orig}으로"를 "{replaced}로"로 한다.'
-    
-    elif clean_josa == "로":  # 규칙 10
-        if orig_has_batchim:  # 규칙 10-1: A에 받침이 있는 경우
-            if replaced_has_batchim:
-                if replaced_has_rieul:  # 규칙 10-1-1-1
-                    return f'"{orig}"을 "{replaced}"로 한다.'
-                else:  # 규칙 10-1-1-2
-                    return f'"{orig}로"를 "{replaced}으로"로 한다.'
-            else:  # 규칙 10-1-2
-                return f'"{orig}"을 "{replaced}"로 한다.'
-        else:  # 규칙 10-2: A에 받침이 없는 경우
-            if replaced_has_batchim:
-                if replaced_has_rieul:  # 규칙 10-2-1-1
-                    return f'"{orig}"를 "{replaced}"로 한다.'
-                else:  # 규칙 10-2-1-2
-                    return f'"{orig}로"를 "{replaced}으로"로 한다.'
-            else:  # 규칙 10-2-2
-                return f'"{orig}"를 "{replaced}"로 한다.'
-    
-    elif clean_josa == "는":  # 규칙 11
-        if replaced_has_batchim:  # 규칙 11-1
-            return f'"{orig}는"을 "{replaced}은"으로 한다.'
-        else:  # 규칙 11-2
-            return f'"{orig}"를 "{replaced}"로 한다.'
-    
-    elif clean_josa == "은":  # 규칙 12
-        if replaced_has_batchim:
-            if replaced_has_rieul:  # 규칙 12-1-1
-                return f'"{orig}"을 "{replaced}"로 한다.'
-            else:  # 규칙 12-1-2
-                return f'"{orig}"을 "{replaced}"으로 한다.'
-        else:  # 규칙 12-2
-            return f'"{orig}은"을 "{replaced}는"으로 한다.'
-    
-    elif clean_josa == "란":  # 규칙 13
-        if replaced_has_batchim:  # 규칙 13-1
-            quote_prefix = '"' if josa.startswith('"') else ""
-            return f'"{orig}{josa}"을 "{replaced}이{quote_prefix}란"으로 한다.'
-        else:  # 규칙 13-2
-            return f'"{orig}"를 "{replaced}"로 한다.'
-    
-    elif clean_josa == "이란":  # 규칙 14
-        if replaced_has_batchim:
-            if replaced_has_rieul:  # 규칙 14-1-1
-                return f'"{orig}"을 "{replaced}"로 한다.'
-            else:  # 규칙 14-1-2
-                return f'"{orig}"을 "{replaced}"으로 한다.'
-        else:  # 규칙 14-2
-            quote_prefix = '"' if josa.startswith('"') else ""
-            return f'"{orig}{josa}"을 "{replaced}{quote_prefix}란"으로 한다.'
-    
-    elif clean_josa == "로서" or clean_josa == "로써":  # 규칙 15
-        if orig_has_batchim:  # 규칙 15-1: A에 받침이 있는 경우
-            if replaced_has_batchim:
-                if replaced_has_rieul:  # 규칙 15-1-1-1
-                    return f'"{orig}"을 "{replaced}"로 한다.'
-                else:  # 규칙 15-1-1-2
-                    return f'"{orig}{josa}"를 "{replaced}으{clean_josa}"로 한다.'
-            else:  # 규칙 15-1-2
-                return f'"{orig}"을 "{replaced}"로 한다.'
-        else:  # 규칙 15-2: A에 받침이 없는 경우
-            if replaced_has_batchim:
-                if replaced_has_rieul:  # 규칙 15-2-1-1
-                    return f'"{orig}"를 "{replaced}"로 한다.'
-                else:  # 규칙 15-2-1-2
-                    return f'"{orig}{josa}"를 "{replaced}으{clean_josa}"로 한다.'
-            else:  # 규칙 15-2-2
-                return f'"{orig}"를 "{replaced}"로 한다.'
-    
-    elif clean_josa == "으로서" or clean_josa == "으로써":  # 규칙 16
-        if replaced_has_batchim:
-            if replaced_has_rieul:  # 규칙 16-1-1
-                return f'"{orig}{josa}"를 "{replaced}로{clean_josa[2:]}"로 한다.'
-            else:  # 규칙 16-1-2
-                return f'"{orig}"을 "{replaced}"으로 한다.'
-        else:  # 규칙 16-2
-            return f'"{orig}{josa}"를 "{replaced}로{clean_josa[2:]}"로 한다.'
-    
-    elif clean_josa == "라":  # 규칙 17
-        if replaced_has_batchim:  # 규칙 17-1
-            quote_prefix = '"' if josa.startswith('"') else ""
-            return f'"{orig}{josa}"를 "{replaced}이{quote_prefix}라"로 한다.'
-        else:  # 규칙 17-2
-            return f'"{orig}"를 "{replaced}"로 한다.'
-    
-    elif clean_josa == "이라":  # 규칙 18
-        if replaced_has_batchim:
-            if replaced_has_rieul:  # 규칙 18-1-1
-                return f'"{orig}"을 "{replaced}"로 한다.'
-            else:  # 규칙 18-1-2
-                return f'"{orig}"을 "{replaced}"으로 한다.'
-        else:  # 규칙 18-2
-            quote_prefix = '"' if josa.startswith('"') else ""
-            return f'"{orig}{josa}"를 "{replaced}{quote_prefix}라"로 한다.'
-    
-    # 기본 출력 형식
-    if orig_has_batchim:
-        return f'"{orig}"을 "{replaced}"로 한다.'
-    else:
-        return f'"{orig}"를 "{replaced}"로 한다.'
+    template = _JOSA_RULE_TABLE.get((josa, orig_has_batchim, has_batchim(replaced), has_rieul_batchim(replaced)))
+    if template is None:
+        # 규칙에 없는 조사는 기본 출력 형식
+        template = _A을_B로 if orig_has_batchim else _A를_B로
+    return template.format(orig=orig, replaced=replaced)
 
-def format_location(loc):
-    """위치 정보 형식 수정: 항번호가 비어있는 경우와 호번호, 목번호의 period 제거"""
-    # 항번호가 비어있는 경우 "제항" 제거
-    loc = re.sub(r'제(?=항)', '', loc)
-    
-    # 호번호와 목번호 뒤의 period(.) 제거
-    loc = re.sub(r'(\d+)\.호', r'\1호', loc)
-    loc = re.sub(r'([가-힣])\.목', r'\1목', loc)
-    
-    return loc
+_HANGUL_START = ord("가")
+
+class Location(namedtuple("Location", "조 가지 항 호 호가지 목 title outside")):
+    """개정 대상 위치 (group_locations 에서 출력할 때만 문자열로 바꿈)
+    - 조/가지: 조문번호, 조문가지번호 / 항: 정규화한 항번호 ("" 이면 조 단위)
+    - 호/호가지/목: 호번호, 호 가지번호, 목번호 원문 (그 단계의 위치가 아니면 None)
+    - title: 조문 제목, outside: 각 목 외의 부분
+    """
+    __slots__ = ()
+
+    def article_text(self):
+        return make_article_number(self.조, self.가지)
+
+    def item_number(self):
+        """호번호 숫자 (끝의 마침표 제외) - 호가 아니거나 "2의2." 처럼 숫자가 아니면 None"""
+        if self.호 is None:
+            return None
+        호번호 = self.호[:-1] if self.호.endswith(".") and self.호[-2:-1].isdecimal() else self.호
+        return 호번호 if 호번호.isdecimal() else None
+
+    def item_text(self):
+        """호목 부분 ("제3호", "제14호의3", "제3호가목") - 호번호/목번호 끝의 마침표는 뗌"""
+        if self.호 is None:
+            return ""
+        호번호 = self.호[:-1] if self.호.endswith(".") and self.호[-2:-1].isdecimal() else self.호
+        text = f"제{호번호}호의{self.호가지}" if self.호가지 else f"제{호번호}호"
+        if self.목 is not None:
+            목번호 = self.목[:-1] if self.목.endswith(".") and "가" <= self.목[-2:-1] <= "힣" else self.목
+            text += f"{목번호}목"
+        return text
+
+    def text(self):
+        """위치 하나를 그대로 쓴 문자열 (예: "제5조제1항제3호가목", "제5조 제목")"""
+        return (self.article_text() + (" 제목" if self.title else "") + (f"제{self.항}항" if self.항 else "")
+                + (" 각 목 외의 부분" if self.outside else "") + self.item_text())
+
+    def item_key(self):
+        """같은 조항 안에서 호목 정렬 기준 (호번호, 호 가지번호, 목 순서)"""
+        item_number = self.item_number()
+        if item_number is None:
+            item = (0, 0)
+        else:
+            item = (int(item_number), int(self.호가지) if self.호가지 and self.호가지.isdecimal() else 0)
+        subitem = 0
+        if self.title:
+            subitem = ord("제") - _HANGUL_START + 1  # "제목" 의 "목" 앞 글자로 셈
+        elif self.목 is not None:
+            before = self.item_text()[-2:-1]
+            subitem = ord(before) - _HANGUL_START + 1 if "가" <= before <= "힣" else 0
+        return item + (subitem,)
+
+    def sort_key(self):
+        """조 > 항 > 호 > 목 순서 정렬 기준 (같으면 원문 순)"""
+        item_num, item_sub, subitem = self.item_key()
+        return (
+            int(self.조) if self.조.isdecimal() else 0,
+            int(self.가지) if self.가지.isdecimal() and self.가지 != "0" else 0,
+            int(self.항) if self.항.isdecimal() else 0,
+            item_num, item_sub, int(self.outside), subitem, int(self.title),
+            tuple("" if value is None else str(value) for value in self),
+        )
 
 def group_locations(loc_list):
     """위치 정보 그룹화 (조 > 항 > 호 > 목 순서로 사전식 정렬)
     - 조 또는 항이 바뀌면 콤마(,)로 연결
     - 같은 조항 내 호목은 가운뎃점(ㆍ)으로 연결
     - 마지막은 '및'으로 연결
+    - 조번호가 숫자가 아닌 위치는 빼고, 항번호나 호번호가 숫자가 아니면 그 아래 단계는 표시하지 않음
     """
     if not loc_list:
         return ""
     
-    # 각 위치 문자열에 형식 수정 적용
-    formatted_locs = [format_location(loc) for loc in loc_list]
-    
-    # 조항호목 파싱 함수 (모든 정렬 기준 추출)
-    def parse_location(loc):
-        # 조번호 (정수로 변환)
-        article_match = re.search(r'제(\d+)조(?:의(\d+))?', loc)
-        article_num = int(article_match.group(1)) if article_match else 0
-        article_sub = int(article_match.group(2)) if article_match and article_match.group(2) else 0
-        
-        # 항번호 (정수로 변환)
-        clause_match = re.search(r'제(\d+)항', loc)
-        clause_num = int(clause_match.group(1)) if clause_match else 0
-        
-        # 호번호 (정수로 변환)
-        item_match = re.search(r'제(\d+)호(?:의(\d+))?', loc)
-        item_num = int(item_match.group(1)) if item_match else 0
-        item_sub = int(item_match.group(2)) if item_match and item_match.group(2) else 0
-        
-        # 목번호 (가나다 순서)
-        subitem_match = re.search(r'([가-힣])목', loc)
-        subitem_num = ord(subitem_match.group(1)) - ord('가') + 1 if subitem_match else 0
-        
-        # 제목 여부
-        title_match = re.search(r'제목', loc)
-        is_title = 1 if title_match else 0
-        
-        # "각 목 외의 부분" 확인
-        outside_parts = 0
-        if "외의 부분" in loc:
-            outside_parts = 1
-            
-        return (article_num, article_sub, clause_num, item_num, item_sub, outside_parts, subitem_num, is_title)
-    
-    # 위치 정보 정렬 (사전식)
-    sorted_locs = sorted(formatted_locs, key=parse_location)
-    
-    # 조항별 그룹화 준비
-    article_groups = {}  # 조별 그룹화
-    
-    # 1. 먼저 조별로 항목 분류
-    for loc in sorted_locs:
-        # 조번호 추출
-        article_match = re.match(r'(제\d+조(?:의\d+)?)', loc)
-        if not article_match:
+    # 1. 먼저 조별로 항목 분류 (정렬된 순서대로)
+    article_groups = {}  # 조 문자열 → [(항, 제목, 각 목 외의 부분, 호목, 호목 정렬 기준)]
+    article_keys = {}
+    for loc in sorted(loc_list, key=Location.sort_key):
+        if not loc.조.isdecimal():
             continue
-            
-        article_num = article_match.group(1)
-        rest_part = loc[len(article_num):]
-        
-        # 가지번호 확인 (예: 제14호의3)
-        appendix_match = re.search(r'(제\d+호)의(\d+)', rest_part)
-        if appendix_match:
-            # 정확한 호의 가지번호 표시 (예: 제14호의3)
-            rest_part = rest_part.replace(appendix_match.group(0), f"{appendix_match.group(1)}의{appendix_match.group(2)}")
-        
-        # 항번호 확인
-        clause_part = ""
-        clause_match = re.search(r'(제\d+항)', rest_part)
-        if clause_match:
-            clause_part = clause_match.group(1)
-            rest_part = rest_part[rest_part.find(clause_part) + len(clause_part):]
-        
-        # 제목 확인
-        title_part = ""
-        if " 제목" in loc:
-            if " 제목 및 본문" in loc:
-                title_part = " 제목 및 본문"
-            else:
-                title_part = " 제목"
-            
-            # 제목 부분 제거
-            rest_part = rest_part.replace(title_part, "")
-            
-        # "각 목 외의 부분" 확인
-        outside_part = ""
-        if " 각 목 외의 부분" in loc or " 외의 부분" in loc:
-            outside_part = " 각 목 외의 부분"
-            rest_part = rest_part.replace(" 각 목 외의 부분", "").replace(" 외의 부분", "")
-        
-        # 호목 정보 추출
+        article_num = loc.article_text()
+        regular_clause = loc.항.isdecimal()
+        clause_part = f"제{loc.항}항" if regular_clause else ""
+        title_part = " 제목" if loc.title else ""
+        outside_part = " 각 목 외의 부분" if loc.outside else ""
         item_goal_part = ""
-        if "제" in rest_part and ("호" in rest_part or "목" in rest_part):
-            # 호 또는 목 정보가 있는 경우
-            item_match = re.match(r'제\d+호(?:의\d+)?|[가-힣]목', rest_part.strip())
-            if item_match:
-                item_goal_part = rest_part.strip()
-        
-        # 조번호 기준으로 그룹화
+        if (regular_clause or not loc.항) and loc.item_number() is not None:
+            item_goal_part = loc.item_text().strip()
         if article_num not in article_groups:
             article_groups[article_num] = []
-            
-        # 항과 호목 정보 저장
-        article_groups[article_num].append((clause_part, title_part, outside_part, item_goal_part))
+            article_keys[article_num] = loc.sort_key()[:2]
+        article_groups[article_num].append((clause_part, title_part, outside_part, item_goal_part, loc.item_key()))
     
     # 결과 구성
     result_parts = []
     
     # 조별로 처리
-    for article_num, items in sorted(article_groups.items(), key=lambda x: extract_article_num(x[0])):
-        # 항별로 그룹화 시도
+    for article_num, items in sorted(article_groups.items(), key=lambda x: article_keys[x[0]]):
+        # 항별로 그룹화
         clause_groups = {}
         
-        for clause, title, outside, item_goal in items:
+        for clause, title, outside, item_goal, item_key in items:
             key = (clause, title, outside)
             if key not in clause_groups:
                 clause_groups[key] = []
                 
             if item_goal:
-                clause_groups[key].append(item_goal)
+                clause_groups[key].append((item_key, item_goal))
         
         # 같은 항끼리 처리
         article_clause_parts = []
         
         # 항번호 순으로 정렬
-        for (clause, title, outside), item_goals in sorted(clause_groups.items(), 
-                                                        key=lambda x: int(re.search(r'제(\d+)항', x[0][0]).group(1)) if re.search(r'제(\d+)항', x[0][0]) else 0):
-            loc_str = article_num
-            
-            if title:
-                loc_str += title
-                
-            if clause:
-                loc_str += clause
-                
-            if outside:
-                loc_str += outside
-                
-            # 호목 처리
-            if item_goals:
-                # 호목 정렬 후 가운뎃점으로 연결
-                sorted_items = sorted(item_goals, key=lambda x: parse_location(f"{article_num}{clause}{x}"))
-                # 먼저 중복 제거
-                unique_items = []
-                for item in sorted_items:
-                    if item not in unique_items:
-                        unique_items.append(item)
+        for (clause, title, outside), item_goals in sorted(clause_groups.items(),
+                                                        key=lambda x: int(x[0][0][1:-1]) if x[0][0] else 0):
+            loc_str = article_num + title + clause + outside
                 
-                if unique_items:
-                    # 위계 관계가 아닌 동일 레벨의 호목만 가운뎃점으로 연결
-                     items_str = "ㆍ".join([item if item.startswith("제") else f"제{item}" for item in unique_items])
-                    # 위계 관계에서는 가운뎃점 없이 직접 연결
-                     loc_str += f"{items_str}"  # 가운뎃점 제거
+            # 호목 처리: 정렬 후 중복 제거, 같은 레벨의 호목은 가운뎃점으로 연결
+            unique_items = []
+            for _, item in sorted(item_goals, key=lambda x: x[0]):
+                if item not in unique_items:
+                    unique_items.append(item)
+            if unique_items:
+                loc_str += "ㆍ".join(unique_items)
             
             article_clause_parts.append(loc_str)
         
@@ -552,250 +1892,265 @@ def group_locations(loc_list):
     else:
         return ""
 
-def run_amendment_logic(find_word, replace_word):
-    """개정문 생성 로직"""
+def collect_amendment_chunks(articles, pairs, count_부칙=False):
+    """조문 목록을 한 번만 읽으며 (찾을 단어, 바꿀 단어) 쌍마다 덩어리별 위치 모으기
+    → (쌍별 chunk_map 목록, 쌍별 부칙 매치 수 목록, 겹치는 곳)
+    - chunk_map: (덩어리, 바꾼 덩어리, 조사, 접미사) → [Location]
+    - 겹치는 곳: (단어, 그 단어를 찾은 쌍 번호들) → [Location] (같은 단어를 두 쌍 이상이 바꾸는 곳)
+    - 부칙 조문은 개정 대상이 아니므로 읽지 않음 (count_부칙 이면 부칙에서 검색어가 나온 곳 수만 셈)
+    """
+    chunk_maps = [defaultdict(list) for _ in pairs]
+    부칙_매치수 = [0] * len(pairs)
+    제목_매치_조문 = [None] * len(pairs)  # 쌍별로 제목에 검색어가 있어 본문은 처리하지 않는 조문
+    overlaps = defaultdict(list)
+    find_words = tuple(find_word for find_word, _ in pairs)
+    # 검색어가 많으면 검색어마다 본문을 훑는 대신 오토마톤으로 한 번만 훑음
+    automaton = None
+    if len(pairs) >= max(AUTOMATON_MIN_TERMS, 1) and all(find_words):
+        automaton = get_term_automaton(find_words)
+    
+    # 법률의 모든 텍스트 내용을 검색
+    for (종류, article, 항, 호, 목), text, is_부칙 in iter_law_text_records(articles, include_부칙=count_부칙):
+        if not text:
+            continue
+        location = None
+        token_pairs = {}  # 단어 위치 → 그 단어를 찾은 쌍 번호들
+        if automaton is not None:
+            found = automaton.find(text)
+            matches = ((idx, found[idx]) for idx in sorted(found))
+        else:
+            matches = ((idx, None) for idx, find_word in enumerate(find_words) if find_word in text)
+        for idx, starts in matches:
+            find_word, replace_word = pairs[idx]
+            if is_부칙:
+                부칙_매치수[idx] += 1
+                continue  # 부칙은 검색에서 제외
+            
+            if 종류 == "조문내용" and 제목_매치_조문[idx] is article:
+                continue  # 제목에 검색어가 있는 경우 본문은 처리하지 않음
+            if 종류 == "조문제목":
+                제목_매치_조문[idx] = article
+            if location is None:
+                # 위치는 구조 그대로 두고 문자열로는 group_locations 에서만 바꿈
+                # (항에서는 호 중에 각 목 외의 부분이 있으면 함께 표시)
+                location = Location(
+                    article.조문번호, article.조문가지번호,
+                    항.항번호 if 항 is not None else "",
+                    호.호번호 if 호 is not None else None,
+                    호.호가지번호 if 호 is not None else None,
+                    목.목번호 if 목 is not None else None,
+                    종류 == "조문제목",
+                    종류 == "항내용" and 항.각목외의부분,
+                )
+                if 종류 != "조문제목":
+                    print(f"매치 발견: {location.text()}")
+            
+            # 목내용은 여러 줄이지만 단어는 줄을 넘지 않으므로 한꺼번에 찾아도 같음
+            for span in iter_matching_token_spans(text, find_word, starts):
+                token = text[span[0]:span[1]]
+                chunk, josa, suffix = extract_chunk_and_josa(token, find_word)
+                replaced = chunk.replace(find_word, replace_word)
+                chunk_maps[idx][(chunk, replaced, josa, suffix)].append(location)
+                token_pairs.setdefault(span, []).append(idx)
+        for span, indexes in token_pairs.items():
+            if len(indexes) > 1:
+                overlaps[(text[span[0]:span[1]], tuple(indexes))].append(location)
+
+    return chunk_maps, 부칙_매치수, overlaps
+
+def consolidate_amendment_rules(chunk_map):
+    """덩어리별 위치 (collect_amendment_chunks 의 chunk_map) → 개정 규칙 문장 목록"""
+    # 디버깅을 위해 추출된 청크 정보 출력
+    print(f"추출된 청크 수: {len(chunk_map)}")
+    for (chunk, replaced, josa, suffix), locations in chunk_map.items():
+        print(f"청크: '{chunk}', 대체: '{replaced}', 조사: '{josa}', 접미사: '{suffix}', 위치 수: {len(locations)}")
+    
+    # 같은 출력 형식을 가진 항목들을 그룹화
+    rule_map = defaultdict(list)
+    
+    for (chunk, replaced, josa, suffix), locations in chunk_map.items():
+        # "로서/로써", "으로서/으로써" 특수 접미사 처리
+        if josa in ["로서", "로써", "으로서", "으로써"]:  # 조사로 처리
+            # 조사 규칙 적용
+            rule = apply_josa_rule(chunk, replaced, josa)
+        # "등", "등인", "등만", "에" 등의 접미사는 덩어리에서 제외하고 일반 처리
+        elif suffix in ["등", "등의", "등인", "등만", "등에", "에", "에게", "만", "만을", "만이", "만은", "만에", "만으로"]:
+            # 규칙 0 적용 (조사가 없는 경우)
+            rule = apply_josa_rule(chunk, replaced, josa)
+        elif suffix and suffix != "의":  # "의"는 개별 처리하지 않음
+            # 접미사가 있는 경우 접미사를 포함한 단어로 처리
+            orig_with_suffix = chunk + suffix
+            replaced_with_suffix = replaced + suffix
+            rule = apply_josa_rule(orig_with_suffix, replaced_with_suffix, josa)
+        else:
+            # 일반 규칙 적용
+            rule = apply_josa_rule(chunk, replaced, josa)
+            
+        rule_map[rule].extend(locations)
+    
+    # 그룹화된 항목들을 정렬하여 출력
+    consolidated_rules = []
+    for rule, locations in rule_map.items():
+        # 중복 위치 제거 (정렬은 group_locations 에서)
+        unique_locations = set(locations)
+        
+        # 2개 이상의 위치가 있으면 '각각'을 추가
+        if len(unique_locations) > 1 and "각각" not in rule:
+            # "A"를 "B"로 한다 -> "A"를 각각 "B"로 한다 형식으로 변경
+            parts = re.match(r'(".*?")(을|를) (".*?")(으로|로) 한다\.?', rule)
+            if parts:
+                orig = parts.group(1)
+                article = parts.group(2)
+                replace = parts.group(3)
+                suffix = parts.group(4)
+                modified_rule = f'{orig}{article} 각각 {replace}{suffix} 한다.'
+                result_line = f"{group_locations(unique_locations)} 중 {modified_rule}"
+            else:
+                # 정규식 매치 실패 시 원래 문자열 사용
+                result_line = f"{group_locations(unique_locations)} 중 {rule}"
+        else:
+            result_line = f"{group_locations(unique_locations)} 중 {rule}"
+        
+        consolidated_rules.append(result_line)
+
+    return consolidated_rules
+
+def build_amendment_rules(articles, find_word, replace_word, count_부칙=False):
+    """조문 목록 (parse_law 의 LawArticle 들)에서 검색어가 나오는 곳을 찾아 개정 규칙 문장 목록 생성
+    - 검색어가 없으면 None
+    - 부칙 조문은 개정 대상이 아니므로 읽지 않음 (count_부칙 이면 부칙에서 검색어가 나온 곳 수만 출력)
+    """
+    (chunk_map,), (부칙_매치수,), _ = collect_amendment_chunks(articles, ((find_word, replace_word),), count_부칙)
+
+    print(f"조문 개수: {len(articles)}")
+    if count_부칙:
+        print(f"부칙에서 검색어 발견 (개정 대상 제외): {부칙_매치수}곳")
+    
+    # 검색 결과가 없으면 다음 법률로
+    if not chunk_map:
+        return None
+    return consolidate_amendment_rules(chunk_map)
+
+def build_batch_amendment_rules(articles, pairs):
+    """여러 (찾을 단어, 바꿀 단어) 쌍의 개정 규칙 문장을 조문 목록을 한 번만 읽어 생성
+    → (개정 규칙 문장 목록 (쌍 순서대로), 겹치는 곳 설명 목록), 어느 쌍의 검색어도 없으면 None
+    - 겹치는 곳: 같은 단어를 두 쌍 이상이 바꾸는 곳 (예: "지방법원의" 를 지방법원→지역법원, 법원→재판소 가 함께 찾음)
+    """
+    chunk_maps, _, overlaps = collect_amendment_chunks(articles, pairs)
+    print(f"조문 개수: {len(articles)}")
+    if not any(chunk_maps):
+        return None
+    consolidated_rules = []
+    for chunk_map in chunk_maps:
+        if chunk_map:
+            consolidated_rules.extend(consolidate_amendment_rules(chunk_map))
+    overlap_notes = []
+    for (token, indexes), locations in overlaps.items():
+        pair_text = ", ".join(f"{pairs[idx][0]}→{pairs[idx][1]}" for idx in indexes)
+        overlap_notes.append(f"{group_locations(set(locations))}의 \"{token}\": {pair_text}")
+    return consolidated_rules, overlap_notes
+
+def parse_amendment_pairs(text):
+    """여러 줄 입력 → [(찾을 단어, 바꿀 단어)] (같은 쌍은 한 번만)
+    - 한 줄에 한 쌍: "찾을단어 바꿀단어", "찾을단어=바꿀단어", "찾을단어→바꿀단어", "찾을단어,바꿀단어"
+    - 빈 줄과 # 으로 시작하는 줄은 무시
+    - 형식이 맞지 않는 줄이 있으면 ValueError (줄 번호 포함)
+    - 단어 안에 공백이나 다른 구분자가 있으면 ValueError (예: "a = b, c" 를 ("a", "b, c") 로 받지 않음)
+    """
+    separators = ("→", "=", ",")
+    pairs = []
+    for line_no, line in enumerate(text.splitlines(), 1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        for separator in separators:
+            if separator in line:
+                parts = [part.strip() for part in line.split(separator)]
+                break
+        else:
+            parts = line.split()
+        if len(parts) != 2 or not all(parts):
+            raise ValueError(f"{line_no}번째 줄을 (찾을 단어, 바꿀 단어) 로 나눌 수 없습니다: {line}")
+        if any(len(part.split()) > 1 or any(separator in part for separator in separators) for part in parts):
+            raise ValueError(f"{line_no}번째 줄의 단어에 공백이나 구분자(→ = ,)가 들어 있습니다: {line}")
+        pairs.append(tuple(parts))
+    return list(dict.fromkeys(pairs))
+
+def get_batch_law_list(queries, timeout=None, max_workers=None):
+    """여러 검색어의 법률 목록을 합친 목록 (MST 기준으로 한 번씩, 처음 나온 순서대로)
+    - 검색어별 목록은 get_law_list_from_api (캐시 공유)
+    - 만료된 캐시의 목록에서 나온 법령은 "stale_list" 표시를 유지
+    """
+    merged = {}
+    for query in dict.fromkeys(queries):
+        for law in get_law_list_from_api(query, timeout, max_workers):
+            known = merged.get(law["MST"])
+            if known is None:
+                merged[law["MST"]] = law
+            elif law.get("stale_list") and not known.get("stale_list"):
+                merged[law["MST"]] = dict(known, stale_list=True)
+    return list(merged.values())
+
+def is_stale_law(law):
+    """만료된 캐시의 목록(stale_list)이나 이전 버전 본문(stale_body)을 쓴 법령인지 (STALE_NOTICE 표시 대상)"""
+    return bool(law.get("stale_list") or law.get("stale_body"))
+
+def raise_for_fetch_errors(failed_laws, results):
+    """본문을 받지 못한 법령이 있으면 LawFetchError (일부 법령이 빠진 결과를 완료로 보여주지 않음)
+    - 나머지 법령으로 만든 결과는 예외의 results 로 함께 전달 (이전 자료로 만든 결과 포함)
+    """
+    if not failed_laws:
+        return
+    names = ", ".join(law["법령명"] for law in failed_laws[:5])
+    if len(failed_laws) > 5:
+        names += f" 외 {len(failed_laws) - 5}개"
+    raise LawFetchError(f"법령 {len(failed_laws)}개의 본문을 받지 못했습니다: {names}", failed_laws, results)
+
+def run_amendment_logic(find_word, replace_word, max_workers=None, processes=None):
+    """개정문 생성 로직 (max_workers: 법령 본문 동시 수집 개수, processes: 파싱/매칭 프로세스 수)"""
+    return run_batch_amendment_logic([(find_word, replace_word)], max_workers, processes)
+
+def run_batch_amendment_logic(pairs, max_workers=None, processes=None):
+    """여러 (찾을 단어, 바꿀 단어) 쌍의 개정문을 한 번에 생성
+    - 검색어별 법률 목록을 합쳐 각 법률을 한 번만 받아 한 번만 읽음 (법률마다 모든 쌍의 개정 규칙을 한 개정문으로)
+    - 같은 단어를 두 쌍 이상이 바꾸는 곳은 그 법률의 개정문 끝에 ⚠️ 로 표시
+    - max_workers: 법령 본문 동시 수집 개수, processes: 파싱/매칭 프로세스 수
+    - 본문을 받지 못한 법령이 하나라도 있으면 끝까지 처리한 뒤 LawFetchError (나머지 개정문은 e.results)
+    """
+    pairs = tuple(dict.fromkeys(tuple(pair) for pair in pairs))
     amendment_results = []
     skipped_laws = []  # 디버깅을 위해 누락된 법률 추적
+    failed_laws = []  # 본문을 받지 못한 법률
     
-    # 부칙 정보 확인을 위한 변수
-    부칙_검색됨 = False  # 부칙에서 검색어가 발견되었는지 여부
-    
-    laws = get_law_list_from_api(find_word)
+    laws = get_batch_law_list([find_word for find_word, _ in pairs])
     print(f"총 {len(laws)}개 법률이 검색되었습니다.")
     
     # 실제로 출력된 법률을 추적하기 위한 변수
     출력된_법률수 = 0
     
-    for idx, law in enumerate(laws):
+    def match(law, articles):
+        return build_batch_amendment_rules(articles, pairs)
+    
+    # 수집/파싱/매칭은 단계별로 동시에 진행하고 결과는 검색 순서대로 받음 (파싱된 법령은 재사용)
+    if processes or PROCESS_WORKERS:
+        pipeline = run_law_processes(laws, build_batch_amendment_rules, (pairs,), max_workers, processes)
+    else:
+        pipeline = run_law_pipeline(laws, parse_law, match, max_workers, fetch=fetch_law_source)
+    for idx, (law, law_rules, skip_reason) in enumerate(pipeline):
         law_name = law["법령명"]
         mst = law["MST"]
-        print(f"처리 중: {idx+1}/{len(laws)} - {law_name} (MST: {mst})")
+        print(f"처리 완료: {idx+1}/{len(laws)} - {law_name} (MST: {mst})")
         
-        xml_data = get_law_text_by_mst(mst)
-        if not xml_data:
-            skipped_laws.append(f"{law_name}: XML 데이터 없음")
+        if skip_reason:
+            skipped_laws.append(f"{law_name}: {skip_reason}")
+            if law.get("fetch_error"):
+                failed_laws.append(law)
             continue
-            
-        try:
-            tree = ET.fromstring(xml_data)
-        except ET.ParseError as e:
-            skipped_laws.append(f"{law_name}: XML 파싱 오류 - {str(e)}")
-            continue
-            
-        articles = tree.findall(".//조문단위")
-        if not articles:
-            skipped_laws.append(f"{law_name}: 조문단위 없음")
-            continue
-            
-        print(f"조문 개수: {len(articles)}")
-        
-        chunk_map = defaultdict(list)
         
-        # 법률에서 검색어의 모든 출현을 찾기 위한 디버깅 변수
-        found_matches = 0
-        found_in_부칙 = False  # 부칙에서 검색어 발견됨
-        
-        # 법률의 모든 텍스트 내용을 검색
-        for article in articles:
-            # 조문
-            조번호 = article.findtext("조문번호", "").strip()
-            조가지번호 = article.findtext("조문가지번호", "").strip()
-            조문식별자 = make_article_number(조번호, 조가지번호)
-            
-            # 조문의 부칙 여부 확인
-            조문명 = article.findtext("조문명", "").strip()
-            is_부칙 = "부칙" in 조문명
-            
-            # 조문 제목 검색 (추가)
-            조문제목 = article.findtext("조문제목", "") or ""
-            제목에_검색어_있음 = find_word in 조문제목
-            
-            # 조문내용에서 검색
-            조문내용 = article.findtext("조문내용", "") or ""
-            본문에_검색어_있음 = find_word in 조문내용
-            
-            if 제목에_검색어_있음 or 본문에_검색어_있음:
-                found_matches += 1
-                if is_부칙:
-                    found_in_부칙 = True
-                    continue  # 부칙은 검색에서 제외
-                
-                # 위치 정보에 제목 표시 추가
-                location_suffix = ""
-                if 제목에_검색어_있음 and 본문에_검색어_있음:
-                    location_suffix = " 제목 및 본문"
-                elif 제목에_검색어_있음:
-                    location_suffix = " 제목"
-                
-                # 제목 검색어만 처리하도록 수정
-                if 제목에_검색어_있음:
-                      tokens = re.findall(r'[가-힣A-Za-z0-9]+', 조문제목)
-                      for token in tokens:
-                          if find_word in token:
-                               chunk, josa, suffix = extract_chunk_and_josa(token, find_word)
-                               replaced = chunk.replace(find_word, replace_word)
-                               location = f"{조문식별자} 제목"
-                               chunk_map[(chunk, replaced, josa, suffix)].append(location)
-                    # 제목에 검색어가 있는 경우 본문은 처리하지 않음
-                elif 본문에_검색어_있음:  # elif로 변경하여 중복 검색 방지
-                     print(f"매치 발견: {조문식별자}")
-                     tokens = re.findall(r'[가-힣A-Za-z0-9]+', 조문내용)
-                     for token in tokens:
-                        if find_word in token:
-                           chunk, josa, suffix = extract_chunk_and_josa(token, find_word)
-                           replaced = chunk.replace(find_word, replace_word)
-                           location = f"{조문식별자}"
-                           chunk_map[(chunk, replaced, josa, suffix)].append(location)
-
-            # 항 내용 검색
-            for 항 in article.findall("항"):
-                항번호 = normalize_number(항.findtext("항번호", "").strip())
-                항번호_부분 = f"제{항번호}항" if 항번호 else ""
-                
-                # 각 목 외의 부분 확인 (호에서 찾을 수 있음)
-                각목외의부분 = False
-                for 호 in 항.findall("호"):
-                    호속성 = 호.attrib
-                    if 호속성.get("구분") == "각목외의부분":
-                        각목외의부분 = True
-                        break
-                
-                항내용 = 항.findtext("항내용", "") or ""
-                if find_word in 항내용:
-                    found_matches += 1
-                    if is_부칙:
-                        found_in_부칙 = True
-                        continue  # 부칙은 검색에서 제외
-                    
-                    additional_info = ""
-                    if 각목외의부분:
-                        additional_info = " 각 목 외의 부분"
-                        
-                    print(f"매치 발견: {조문식별자}{항번호_부분}{additional_info}")
-                    tokens = re.findall(r'[가-힣A-Za-z0-9]+', 항내용)
-                    for token in tokens:
-                        if find_word in token:
-                            chunk, josa, suffix = extract_chunk_and_josa(token, find_word)
-                            replaced = chunk.replace(find_word, replace_word)
-                            location = f"{조문식별자}{항번호_부분}{additional_info}"
-                            chunk_map[(chunk, replaced, josa, suffix)].append(location)
-                
-                # 호 내용 검색
-                for 호 in 항.findall("호"):
-                    호번호 = 호.findtext("호번호")
-                    
-                    # 가지번호 확인 (예: 제14호의3)
-                    호가지번호 = None
-                    if 호.attrib.get("가지번호"):
-                        호가지번호 = 호.attrib.get("가지번호")
-                    
-                    호내용 = 호.findtext("호내용", "") or ""
-                    if find_word in 호내용:
-                        found_matches += 1
-                        if is_부칙:
-                            found_in_부칙 = True
-                            continue  # 부칙은 검색에서 제외
-                        
-                        # 호번호 표시 (가지번호가 있으면 추가)
-                        호번호_표시 = f"제{호번호}호"
-                        if 호가지번호:
-                            호번호_표시 = f"제{호번호}호의{호가지번호}"
-                            
-                        print(f"매치 발견: {조문식별자}{항번호_부분}{호번호_표시}")
-                        tokens = re.findall(r'[가-힣A-Za-z0-9]+', 호내용)
-                        for token in tokens:
-                            if find_word in token:
-                                chunk, josa, suffix = extract_chunk_and_josa(token, find_word)
-                                replaced = chunk.replace(find_word, replace_word)
-                                location = f"{조문식별자}{항번호_부분}{호번호_표시}"
-                                chunk_map[(chunk, replaced, josa, suffix)].append(location)
-
-                    # 목 내용 검색
-                    for 목 in 호.findall("목"):
-                        목번호 = 목.findtext("목번호")
-                        for m in 목.findall("목내용"):
-                            if not m.text:
-                                continue
-                                
-                            if find_word in m.text:
-                                found_matches += 1
-                                if is_부칙:
-                                    found_in_부칙 = True
-                                    continue  # 부칙은 검색에서 제외
-                                
-                                # 호번호 표시 (가지번호가 있으면 추가)
-                                호번호_표시 = f"제{호번호}호"
-                                if 호가지번호:
-                                    호번호_표시 = f"제{호번호}호의{호가지번호}"
-                                    
-                                print(f"매치 발견: {조문식별자}{항번호_부분}{호번호_표시}{목번호}목")
-                                줄들 = [line.strip() for line in m.text.splitlines() if line.strip()]
-                                for 줄 in 줄들:
-                                    if find_word in 줄:
-                                        tokens = re.findall(r'[가-힣A-Za-z0-9]+', 줄)
-                                        for token in tokens:
-                                            if find_word in token:
-                                                chunk, josa, suffix = extract_chunk_and_josa(token, find_word)
-                                                replaced = chunk.replace(find_word, replace_word)
-                                                location = f"{조문식별자}{항번호_부분}{호번호_표시}{목번호}목"
-                                                chunk_map[(chunk, replaced, josa, suffix)].append(location)
-
         # 검색 결과가 없으면 다음 법률로
-        if not chunk_map:
+        if law_rules is None:
             continue
-        
-        # 디버깅을 위해 추출된 청크 정보 출력
-        print(f"추출된 청크 수: {len(chunk_map)}")
-        for (chunk, replaced, josa, suffix), locations in chunk_map.items():
-            print(f"청크: '{chunk}', 대체: '{replaced}', 조사: '{josa}', 접미사: '{suffix}', 위치 수: {len(locations)}")
-        
-        # 같은 출력 형식을 가진 항목들을 그룹화
-        rule_map = defaultdict(list)
-        
-        for (chunk, replaced, josa, suffix), locations in chunk_map.items():
-            # "로서/로써", "으로서/으로써" 특수 접미사 처리
-            if josa in ["로서", "로써", "으로서", "으로써"]:  # 조사로 처리
-                # 조사 규칙 적용
-                rule = apply_josa_rule(chunk, replaced, josa)
-            # "등", "등인", "등만", "에" 등의 접미사는 덩어리에서 제외하고 일반 처리
-            elif suffix in ["등", "등의", "등인", "등만", "등에", "에", "에게", "만", "만을", "만이", "만은", "만에", "만으로"]:
-                # 규칙 0 적용 (조사가 없는 경우)
-                rule = apply_josa_rule(chunk, replaced, josa)
-            elif suffix and suffix != "의":  # "의"는 개별 처리하지 않음
-                # 접미사가 있는 경우 접미사를 포함한 단어로 처리
-                orig_with_suffix = chunk + suffix
-                replaced_with_suffix = replaced + suffix
-                rule = apply_josa_rule(orig_with_suffix, replaced_with_suffix, josa)
-            else:
-                # 일반 규칙 적용
-                rule = apply_josa_rule(chunk, replaced, josa)
-                
-            rule_map[rule].extend(locations)
-        
-        # 그룹화된 항목들을 정렬하여 출력
-        consolidated_rules = []
-        for rule, locations in rule_map.items():
-            # 중복 위치 제거 및 정렬
-            unique_locations = sorted(set(locations))
-            
-            # 2개 이상의 위치가 있으면 '각각'을 추가
-            if len(unique_locations) > 1 and "각각" not in rule:
-                # "A"를 "B"로 한다 -> "A"를 각각 "B"로 한다 형식으로 변경
-                parts = re.match(r'(".*?")(을|를) (".*?")(으로|로) 한다\.?', rule)
-                if parts:
-                    orig = parts.group(1)
-                    article = parts.group(2)
-                    replace = parts.group(3)
-                    suffix = parts.group(4)
-                    modified_rule = f'{orig}{article} 각각 {replace}{suffix} 한다.'
-                    result_line = f"{group_locations(unique_locations)} 중 {modified_rule}"
-                else:
-                    # 정규식 매치 실패 시 원래 문자열 사용
-                    result_line = f"{group_locations(unique_locations)} 중 {rule}"
-            else:
-                result_line = f"{group_locations(unique_locations)} 중 {rule}"
-            
-            consolidated_rules.append(result_line)
+        consolidated_rules, overlap_notes = law_rules
         
         # 출력 준비
         if consolidated_rules:
@@ -804,6 +2159,8 @@ def run_amendment_logic(find_word, replace_word):
             
             # HTML 형식으로 출력 (br 태그 사용)
             amendment = f"{prefix} {law_name} 일부를 다음과 같이 개정한다.<br>"
+            if is_stale_law(law):
+                amendment = f"⚠️ {STALE_NOTICE}<br>" + amendment
           
             # 각 규칙마다 br 태그로 줄바꿈 추가
             for i, rule in enumerate(consolidated_rules):
@@ -812,6 +2169,8 @@ def run_amendment_logic(find_word, replace_word):
                     amendment += "<br>"
                 else:
                     amendment += "<br>"  # 마지막 규칙은 줄바꿈 한 번
+            for note in overlap_notes:
+                amendment += f"⚠️ 여러 쌍이 같은 단어를 바꿈: {note}<br>"
             
             amendment_results.append(amendment)
         else:
@@ -822,89 +2181,128 @@ def run_amendment_logic(find_word, replace_word):
         print("---누락된 법률 목록---")
         for law in skipped_laws:
             print(law)
+    raise_for_fetch_errors(failed_laws, amendment_results)
         
     # 함수의 리턴문
     return amendment_results if amendment_results else ["⚠️ 개정 대상 조문이 없습니다."]
   
-def run_search_logic(query, unit="법률"):
-    """검색 로직 실행 함수"""
-    result_dict = {}
+def build_search_results(articles, query):
+    """조문 목록 (parse_law 의 LawArticle 들)에서 검색어가 포함된 조문을 하이라이트한 HTML 조각 목록 생성
+    - 공백을 무시하고 비교 (본문마다 한 번 만들어 두는 공백제거 글자 사용), 하이라이트는 찾은 원문 범위에 표시
+    """
     keyword_clean = clean(query)
-    for law in get_law_list_from_api(query):
-        mst = law["MST"]
-        xml_data = get_law_text_by_mst(mst)
-        if not xml_data:
-            continue
-        tree = ET.fromstring(xml_data)
-        articles = tree.findall(".//조문단위")
-        law_results = []
-        for article in articles:
-            조번호 = article.findtext("조문번호", "").strip()
-            조가지번호 = article.findtext("조문가지번호", "").strip()
-            조문식별자 = make_article_number(조번호, 조가지번호)
-            조문내용 = article.findtext("조문내용", "") or ""
-            항들 = article.findall("항")
-            출력덩어리 = []
-            조출력 = keyword_clean in clean(조문내용)
-            첫_항출력됨 = False
-            if 조출력:
-                출력덩어리.append(highlight(조문내용, query))
-            for 항 in 항들:
-                항번호 = normalize_number(항.findtext("항번호", "").strip())
-                항내용 = 항.findtext("항내용", "") or ""
-                항출력 = keyword_clean in clean(항내용)
-                항덩어리 = []
-                하위검색됨 = False
-                for 호 in 항.findall("호"):
-                    호내용 = 호.findtext("호내용", "") or ""
-                    호출력 = keyword_clean in clean(호내용)
-                    if 호출력:
+    law_results = []
+    # 조문별, 그 안에서 항별로 묶어 처리 (조문제목/조문내용 기록은 항이 None)
+    records = iter_law_text_records(articles, with_공백제거=True)
+    for article, records in groupby(records, key=lambda record: record[0][1]):
+        조문내용 = article.조문내용
+        조문_하이라이트 = mark_matches(조문내용, article.공백제거(), keyword_clean)
+        출력덩어리 = []
+        조출력 = keyword_clean in article.공백제거()
+        첫_항출력됨 = False
+        if 조출력:
+            출력덩어리.append(조문_하이라이트)
+        for 항, 항_records in groupby(records, key=lambda record: record[0][2]):
+            if 항 is None:
+                continue
+            항출력 = keyword_clean in 항.공백제거()
+            항덩어리 = []
+            하위검색됨 = False
+            for (종류, *_), (text, text_공백제거), _ in 항_records:
+                if 종류 == "호내용":
+                    if keyword_clean in text_공백제거:
                         하위검색됨 = True
-                        항덩어리.append("&nbsp;&nbsp;" + highlight(호내용, query))
-                    for 목 in 호.findall("목"):
-                        for m in 목.findall("목내용"):
-                            if m.text and keyword_clean in clean(m.text):
-                                줄들 = [line.strip() for line in m.text.splitlines() if line.strip()]
-                                줄들 = [highlight(line, query) for line in 줄들]
-                                if 줄들:
-                                    하위검색됨 = True
-                                    항덩어리.append(
-                                        "<div style='margin:0;padding:0'>" +
-                                        "<br>".join("&nbsp;&nbsp;&nbsp;&nbsp;" + line for line in 줄들) +
-                                        "</div>"
-                                    )
-                if 항출력 or 하위검색됨:
-                    if not 조출력 and not 첫_항출력됨:
-                        출력덩어리.append(f"{highlight(조문내용, query)} {highlight(항내용, query)}")
-                        첫_항출력됨 = True
-                    elif not 첫_항출력됨:
-                        출력덩어리.append(highlight(항내용, query))
-                        첫_항출력됨 = True
-                    else:
-                        출력덩어리.append(highlight(항내용, query))
-                    출력덩어리.extend(항덩어리)
-            if 출력덩어리:
-                law_results.append("<br>".join(출력덩어리))
+                        항덩어리.append("&nbsp;&nbsp;" + mark_matches(text, text_공백제거, keyword_clean))
+                elif 종류 == "목내용":
+                    if text and keyword_clean in text_공백제거:
+                        # 줄바꿈에 걸친 검색어도 줄마다 표시되도록 하이라이트한 뒤 줄을 나눔
+                        줄들 = mark_matches(text, text_공백제거, keyword_clean).splitlines()
+                        줄들 = [line.strip() for line in 줄들 if line.strip()]
+                        if 줄들:
+                            하위검색됨 = True
+                            항덩어리.append(
+                                "<div style='margin:0;padding:0'>" +
+                                "<br>".join("&nbsp;&nbsp;&nbsp;&nbsp;" + line for line in 줄들) +
+                                "</div>"
+                            )
+            if 항출력 or 하위검색됨:
+                항_하이라이트 = mark_matches(항.항내용, 항.공백제거(), keyword_clean)
+                if not 조출력 and not 첫_항출력됨:
+                    출력덩어리.append(f"{조문_하이라이트} {항_하이라이트}")
+                    첫_항출력됨 = True
+                elif not 첫_항출력됨:
+                    출력덩어리.append(항_하이라이트)
+                    첫_항출력됨 = True
+                else:
+                    출력덩어리.append(항_하이라이트)
+                출력덩어리.extend(항덩어리)
+        if 출력덩어리:
+            law_results.append("<br>".join(출력덩어리))
+    return law_results
+
+def run_search_logic(query, unit="법률", max_workers=None, processes=None):
+    """검색 로직 실행 함수 (max_workers: 법령 본문 동시 수집 개수, processes: 파싱/매칭 프로세스 수)
+    - 본문을 받지 못한 법령이 하나라도 있으면 끝까지 처리한 뒤 LawFetchError (나머지 검색 결과는 e.results)
+    """
+    result_dict = {}
+    failed_laws = []
+    laws = get_law_list_from_api(query)
+
+    def match(law, articles):
+        return build_search_results(articles, query)
+
+    # 수집/파싱/매칭은 단계별로 동시에 진행하고 결과는 검색 순서대로 받음 (파싱된 법령은 재사용)
+    if processes or PROCESS_WORKERS:
+        pipeline = run_law_processes(laws, build_search_results, (query,), max_workers, processes)
+    else:
+        pipeline = run_law_pipeline(laws, parse_law, match, max_workers, fetch=fetch_law_source)
+    for law, law_results, skip_reason in pipeline:
+        if skip_reason:
+            if law.get("fetch_error"):
+                failed_laws.append(law)
+            continue
         if law_results:
-            result_dict[law["법령명"]] = law_results
+            law_name = law["법령명"]
+            if is_stale_law(law):
+                law_name += " (⚠️ 캐시된 이전 자료)"
+                law_results.insert(0, f"⚠️ {STALE_NOTICE}")
+            result_dict[law_name] = law_results
+    raise_for_fetch_errors(failed_laws, result_dict)
     return result_dict
 
 # 전체 파일 실행 시 필요한 코드
 if __name__ == "__main__":
     import sys
     
-    if len(sys.argv) < 3:
+    if len(sys.argv) < 3 and sys.argv[1:] != ["sync"]:
         print("사용법: python law_processor.py <명령> <검색어> [바꿀단어]")
-        print("  명령: search, amend")
+        print("  명령: search, amend, batch, sync")
         print("  예시1: python law_processor.py search 지방법원")
         print("  예시2: python law_processor.py amend 지방법원 지역법원")
+        print("  예시3: python law_processor.py batch 지방법원=지역법원 행정기관=행정청")
+        print("         python law_processor.py batch 단어목록.txt  (한 줄에 '찾을단어 바꿀단어' 한 쌍, - 이면 표준입력)")
+        print("  예시4: python law_processor.py sync  (현행 법률 전체를 로컬 미러로 동기화)")
+        print("  LAW_OFFLINE=1 을 지정하면 search, amend 가 로컬 미러만 사용합니다.")
         sys.exit(1)
     
     command = sys.argv[1]
-    search_word = sys.argv[2]
+    search_word = sys.argv[2] if len(sys.argv) > 2 else None
+
+    def run_with_partial_results(run, *args):
+        # 일부 법률의 본문을 받지 못했으면 경고를 먼저 출력하고 나머지 결과를 사용
+        try:
+            return run(*args)
+        except LawFetchError as e:
+            if e.results is None:
+                raise
+            print(f"⚠️ {e}")
+            return e.results
     
-    if command == "search":
-        results = run_search_logic(search_word)
+    if command == "sync":
+        sync_law_mirror()
+    
+    elif command == "search":
+        results = run_with_partial_results(run_search_logic, search_word)
         for law_name, snippets in results.items():
             print(f"## {law_name}")
             for snippet in snippets:
@@ -917,7 +2315,30 @@ if __name__ == "__main__":
             sys.exit(1)
         
         replace_word = sys.argv[3]
-        results = run_amendment_logic(search_word, replace_word)
+        results = run_with_partial_results(run_amendment_logic, search_word, replace_word)
+        
+        for result in results:
+            print(result)
+            print("\n")
+    
+    elif command == "batch":
+        if len(sys.argv) == 3 and sys.argv[2] == "-":
+            pair_text = sys.stdin.read()
+        elif len(sys.argv) == 3 and os.path.isfile(sys.argv[2]):
+            with open(sys.argv[2], encoding="utf-8") as f:
+                pair_text = f.read()
+        else:
+            pair_text = "\n".join(sys.argv[2:])
+        try:
+            pairs = parse_amendment_pairs(pair_text)
+        except ValueError as e:
+            print(e)
+            sys.exit(1)
+        if not pairs:
+            print("찾을 단어와 바꿀 단어를 입력하세요.")
+            sys.exit(1)
+        
+        results = run_with_partial_results(run_batch_amendment_logic, pairs)
         
         for result in results:
             print(result)
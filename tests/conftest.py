@@ -0,0 +1,75 @@
+"""law_processor 테스트 공용 fixture
+
+모든 테스트는 law_mock_server 의 대체 서버와 테스트마다 새로 만든 캐시 디렉터리를 사용한다.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+import law_mock_server  # noqa: E402
+import law_processor  # noqa: E402
+
+@pytest.fixture(scope="session", autouse=True)
+def _shutdown_process_pool():
+    yield
+    law_processor.shutdown_process_pool()
+
+@pytest.fixture
+def lp(tmp_path, monkeypatch):
+    """설정을 테스트용으로 바꾼 law_processor (캐시는 tmp_path, 재시도 대기와 속도 제한은 최소)"""
+    monkeypatch.setattr(law_processor, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(law_processor, "MIRROR_DIR", str(tmp_path / "cache" / "mirror"))
+    monkeypatch.setattr(law_processor, "_cache_size", None)
+    monkeypatch.setattr(law_processor, "CACHE_ENABLED", True)
+    monkeypatch.setattr(law_processor, "OFFLINE", False)
+    monkeypatch.setattr(law_processor, "PROCESS_WORKERS", 0)
+    monkeypatch.setattr(law_processor, "RATE_LIMIT", 0)
+    monkeypatch.setattr(law_processor, "RETRY_MAX", 3)
+    monkeypatch.setattr(law_processor, "RETRY_BACKOFF", 0.01)
+    monkeypatch.setattr(law_processor, "RETRY_BACKOFF_MAX", 0.02)
+    monkeypatch.setattr(law_processor, "BREAKER_THRESHOLD", 5)
+    monkeypatch.setattr(law_processor, "LIST_CACHE_TTL", 3600.0)
+
+    def reset():
+        law_processor.configure_http()  # 연결 수를 새로 세도록 세션을 닫음
+        law_processor.invalidate_law_list_cache()
+        law_processor.invalidate_parsed_law_cache()
+        law_processor.reset_circuit_breakers()
+
+    reset()
+    yield law_processor
+    reset()
+
+@pytest.fixture
+def start_server(lp, monkeypatch):
+    """대체 서버를 띄우고 BASE 를 그 주소로 바꾸는 함수 (테스트가 끝나면 종료)"""
+    servers = []
+
+    def start(**kwargs):
+        kwargs.setdefault("laws", 24)
+        kwargs.setdefault("articles", 6)
+        kwargs.setdefault("seed", 1)
+        kwargs.setdefault("term_rate", 0.1)
+        server = law_mock_server.start_server(**kwargs)
+        servers.append(server)
+        monkeypatch.setattr(lp, "BASE", server.base_url)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+_LAW_XML = ('<?xml version="1.0" encoding="UTF-8"?>\n<법령><기본정보><법령ID>1</법령ID>'
+            '<법령명_한글>시험법</법령명_한글></기본정보><조문>{}</조문></법령>')
+
+@pytest.fixture
+def parse_articles(lp):
+    """조문단위 XML 조각들 → 파싱된 조문 목록 (캐시에 남기지 않음)"""
+    def parse(*units):
+        xml = _LAW_XML.format("".join(f"<조문단위>{unit}</조문단위>" for unit in units))
+        return lp.parse_law({"MST": "1", "법령명": "시험법"}, xml.encode("utf-8"), cache=False)
+    return parse
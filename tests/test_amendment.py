@@ -0,0 +1,36 @@
+"""여러 쌍 개정문 입력과 겹침 검사 테스트"""
+import pytest
+
+import law_processor
+
+ARTICLES = ("<조문번호>1</조문번호><조문여부>조문</조문여부><조문제목>목적</조문제목>"
+            "<조문내용>제1조(목적) 법원장은 법원을 관리한다.</조문내용>",
+            "<조문번호>2</조문번호><조문여부>조문</조문여부><조문제목>임기</조문제목>"
+            "<조문내용>제2조(임기) 법원장의 임기는 4년으로 한다.</조문내용>")
+
+@pytest.mark.parametrize("text", ["법원→재판소", "법원 = 재판소", "법원, 재판소", "  법원   재판소  "])
+def test_parse_pairs_separators(text):
+    assert law_processor.parse_amendment_pairs(text) == [("법원", "재판소")]
+
+def test_parse_pairs_skips_comments_and_duplicates():
+    text = "# 찾을 단어 → 바꿀 단어\n\n지방법원→지역법원\n법원=재판소\n지방법원 → 지역법원\n"
+    assert law_processor.parse_amendment_pairs(text) == [("지방법원", "지역법원"), ("법원", "재판소")]
+
+@pytest.mark.parametrize("line", ["법원", "법원→", "법원 재판소 법원장", "법원=재판소=법정",
+                                  "a = b, c", "지방 법원 → 지역법원", "법원 → 재판 소"])
+def test_parse_pairs_rejects_bad_line(line):
+    with pytest.raises(ValueError, match="2번째 줄"):
+        law_processor.parse_amendment_pairs("검사→검찰관\n" + line)
+
+def test_batch_reports_overlapping_pairs(parse_articles):
+    articles = parse_articles(*ARTICLES)
+    pairs = [("법원", "재판소"), ("법원장", "재판소장")]
+    rules, overlap_notes = law_processor.build_batch_amendment_rules(articles, pairs)
+    assert rules == [rule for pair in pairs for rule in law_processor.build_amendment_rules(articles, *pair)]
+    assert overlap_notes == ['제1조의 "법원장은": 법원→재판소, 법원장→재판소장',
+                             '제2조의 "법원장의": 법원→재판소, 법원장→재판소장']
+
+def test_batch_without_overlap(parse_articles):
+    articles = parse_articles(*ARTICLES)
+    rules, overlap_notes = law_processor.build_batch_amendment_rules(articles, [("법원장", "재판소장"), ("임기", "재임기간")])
+    assert rules and overlap_notes == []
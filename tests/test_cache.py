@@ -0,0 +1,82 @@
+"""디스크 캐시 테스트 (파일 형식, 무결성 확인, 용량 상한)"""
+import hashlib
+import os
+
+import pytest
+
+DATA = "<법령><조문내용>제1조(목적) 지방법원은 법원이다.</조문내용></법령>".encode("utf-8") * 50
+
+@pytest.mark.parametrize("compression", ["none", "zlib", "lzma"])
+def test_blob_round_trip(lp, compression):
+    blob = lp.encode_blob(DATA, compression)
+    assert blob.startswith(b"LAW1") and blob[36:] != b""
+    assert lp.decode_blob(blob) == DATA
+    assert lp.decode_blob(lp.encode_blob(b"", compression)) == b""
+    if compression != "none":
+        assert len(blob) < len(DATA)
+
+@pytest.mark.parametrize("compression", ["none", "zlib", "lzma"])
+def test_law_xml_round_trip(lp, monkeypatch, compression):
+    monkeypatch.setattr(lp, "CACHE_COMPRESSION", compression)
+    lp.put_cached_law_xml("123", DATA)
+    assert lp.get_cached_law_xml("123") == DATA
+    assert lp.get_cached_mst_by_law_id("123") is None
+
+def test_decode_rejects_damaged_blob(lp):
+    blob = lp.encode_blob(DATA, "zlib")
+    bad_digest = blob[:5] + hashlib.sha256(b"other").digest() + blob[37:]
+    flipped = blob[:-1] + bytes([blob[-1] ^ 0xFF])
+    for damaged in (blob[:len(blob) // 2], blob[:20], b"", b"LAW0" + blob[4:], blob[:4] + b"?" + blob[5:],
+                    bad_digest, flipped):
+        assert lp.decode_blob(damaged) is None
+    # 압축하지 않은 본문이 바뀌어도 sha256 로 걸러냄
+    plain = lp.encode_blob(DATA, "none")
+    assert lp.decode_blob(plain[:-1] + b"!") is None
+    assert lp.decode_blob(plain[:-10]) is None
+
+def test_read_blob_removes_corrupt_file(lp, tmp_path):
+    path = tmp_path / "blob"
+    path.write_bytes(lp.encode_blob(DATA, "lzma"))
+    assert lp.read_blob(str(path)) == DATA
+    path.write_bytes(lp.encode_blob(DATA, "lzma")[:-7])  # 쓰다 끊긴 파일
+    assert lp.read_blob(str(path)) is None
+    assert not path.exists()
+    assert lp.read_blob(str(path)) is None
+
+def test_corrupt_cached_law_is_removed(lp):
+    lp.put_cached_law_xml("123", DATA)
+    path = lp._law_xml_cache_path("123")
+    with open(path, "r+b") as f:
+        f.seek(5)
+        f.write(b"\0" * 32)  # sha256 훼손
+    assert lp.get_cached_law_xml("123") is None
+    assert not os.path.exists(path)
+
+def write_aged(lp, mst, size, mtime):
+    lp.put_cached_law_xml(mst, os.urandom(size))
+    path = lp._law_xml_cache_path(mst)
+    os.utime(path, (mtime, mtime))
+    return path
+
+def test_evict_removes_least_recently_used(lp, monkeypatch):
+    monkeypatch.setattr(lp, "CACHE_COMPRESSION", "none")
+    paths = [write_aged(lp, str(mst), 1000, 1000000 + mst) for mst in range(10)]
+    size = os.path.getsize(paths[0])
+    # 가장 오래 안 쓴 파일이 최근에 쓰이면 (get_cached_law_xml 이 mtime 갱신) 삭제 순서가 바뀜
+    assert lp.get_cached_law_xml("0") is not None
+    lp.evict_law_cache(size * 6)
+    remaining = [os.path.exists(path) for path in paths]
+    assert remaining == [True, False, False, False, False, False, True, True, True, True]
+    assert lp._cache_size == size * 5 <= int(size * 6 * 0.9)
+    lp.evict_law_cache(size * 100)
+    assert sum(os.path.exists(path) for path in paths) == 5
+
+def test_put_evicts_over_limit(lp, monkeypatch):
+    monkeypatch.setattr(lp, "CACHE_COMPRESSION", "none")
+    monkeypatch.setattr(lp, "CACHE_MAX_BYTES", 10000)
+    paths = [write_aged(lp, str(mst), 2000, 1000000 + mst) for mst in range(4)]
+    assert all(os.path.exists(path) for path in paths)
+    lp.put_cached_law_xml("9", os.urandom(3000))
+    assert [os.path.exists(path) for path in paths] == [False, False, True, True]
+    assert lp.get_cached_law_xml("9") is not None
+    assert lp._cache_size <= 9000
@@ -0,0 +1,294 @@
+"""법령 수집 경로 테스트: 연결 재사용, 결과 순서, 목록 캐시, 동시 요청 합치기, 실패 처리"""
+import os
+import threading
+import time
+
+import pytest
+
+import law_mock_server
+
+QUERY = "법원"
+
+def test_pooled_session_reuses_connections(lp, start_server):
+    server = start_server(laws=60)
+    lp.run_search_logic(QUERY, max_workers=8)
+    assert server.stats["lawService"] > 30
+    # 요청마다 새로 연결하지 않고 풀의 keep-alive 연결만 사용
+    assert server.stats["connections"] <= lp.HTTP_POOL_SIZE
+
+def test_results_keep_search_order(lp, start_server):
+    start_server(laws=40, jitter=0.02)
+    names = [law["법령명"] for law in lp.get_law_list_from_api(QUERY)]
+    sequential = lp.run_search_logic(QUERY, max_workers=1)
+    parallel = lp.run_search_logic(QUERY, max_workers=8)
+    assert list(parallel.items()) == list(sequential.items())
+    assert list(parallel) == [name for name in names if name in parallel]
+
+    amendments = lp.run_amendment_logic(QUERY, "재판소", max_workers=8)
+    assert amendments == lp.run_amendment_logic(QUERY, "재판소", max_workers=1)
+    amended = [name for amendment in amendments for name in names if f" {name} 일부를" in amendment]
+    assert amended == [name for name in names if name in amended]
+
+def test_law_list_and_parsed_laws_are_cached(lp, start_server):
+    server = start_server()
+    first = lp.run_search_logic(QUERY)
+    stats = dict(server.stats)
+    assert lp.run_search_logic(QUERY) == first
+    assert lp.run_amendment_logic(QUERY, "재판소")
+    assert server.stats == stats
+
+def test_list_cache_expires(lp, start_server, monkeypatch):
+    server = start_server()
+    monkeypatch.setattr(lp, "LIST_CACHE_TTL", 0.05)
+    lp.get_law_list_from_api(QUERY)
+    time.sleep(0.1)
+    lp.get_law_list_from_api(QUERY)
+    assert server.stats["lawSearch"] == 2
+
+def test_concurrent_requests_share_one_fetch(lp, start_server):
+    server = start_server(latency=0.2)
+    barrier = threading.Barrier(4)
+    results = []
+
+    def worker():
+        barrier.wait()
+        laws = lp.get_law_list_from_api(QUERY)
+        results.append((laws, lp.get_law_text_by_mst(laws[0]["MST"])))
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 4
+    assert all(result == results[0] for result in results)
+    assert server.stats["lawSearch"] == 1
+    assert server.stats["lawService"] == 1
+    assert lp._law_flight.in_flight() == 0
+
+def test_incomplete_law_list_raises(lp, start_server):
+    start_server(error_rate=1.0)
+    with pytest.raises(lp.LawFetchError):
+        lp.get_law_list_from_api(QUERY)
+
+def test_failed_law_bodies_raise_with_laws(lp, start_server):
+    server = start_server()
+    laws = lp.get_law_list_from_api(QUERY)
+    server.error_rate = 1.0
+    for run in (lambda: lp.run_amendment_logic(QUERY, "재판소"), lambda: lp.run_search_logic(QUERY)):
+        lp.reset_circuit_breakers()
+        with pytest.raises(lp.LawFetchError) as info:
+            run()
+        assert [law["MST"] for law in info.value.laws] == [law["MST"] for law in laws]
+        # 빈 결과를 "개정 대상 조문이 없습니다" 로 돌려주지 않음
+        assert not info.value.results
+
+def test_partly_failed_law_bodies_raise(lp, start_server, monkeypatch):
+    monkeypatch.setattr(lp, "RETRY_MAX", 0)
+    monkeypatch.setattr(lp, "BREAKER_THRESHOLD", 0)
+    server = start_server(laws=60)
+    laws = lp.get_law_list_from_api(QUERY)
+    server.error_rate = 0.3
+    with pytest.raises(lp.LawFetchError) as info:
+        lp.run_amendment_logic(QUERY, "재판소")
+    assert 0 < len(info.value.laws) < len(laws)
+    partial = info.value.results
+    failed_names = {law["법령명"] for law in info.value.laws}
+    assert partial and not any(f" {name} 일부를" in amendment for amendment in partial for name in failed_names)
+    # 받은 본문은 캐시되므로 서버가 회복되면 나머지만 받음
+    server.error_rate = 0.0
+    server.reset_stats()
+    amendments = lp.run_amendment_logic(QUERY, "재판소")
+    assert server.stats["lawService"] == len(info.value.laws)
+    # 번호(①②…)를 뺀 개정문은 빠진 법률만 빼면 같음
+    strip_prefix = lambda amendment: amendment.split(" ", 1)[1]
+    assert [strip_prefix(a) for a in partial] == [
+        strip_prefix(a) for a in amendments if not any(f" {name} 일부를" in a for name in failed_names)]
+
+def test_stale_results_kept_when_some_bodies_fail(lp, start_server, monkeypatch):
+    server = start_server()
+    monkeypatch.setattr(lp, "LIST_CACHE_TTL", 0.05)
+    laws = lp.get_law_list_from_api(QUERY)
+    for law in laws[1:]:
+        lp.fetch_law_text(law)
+    time.sleep(0.1)
+    server.error_rate = 1.0
+    with pytest.raises(lp.LawFetchError) as info:
+        lp.run_search_logic(QUERY)
+    assert [law["MST"] for law in info.value.laws] == [laws[0]["MST"]]
+    results = info.value.results
+    assert results and laws[0]["법령명"] not in {name.split(" (⚠️")[0] for name in results}
+    assert all(sections[0] == f"⚠️ {lp.STALE_NOTICE}" for sections in results.values())
+
+def test_breaker_counts_requests_not_attempts(lp, start_server):
+    server = start_server(error_rate=1.0)
+    url = f"{lp.BASE}/DRF/lawService.do?MST=200000"
+    breaker = lp.get_circuit_breaker(url)
+    for _ in range(lp.BREAKER_THRESHOLD - 1):
+        assert lp.http_get(url).status_code == 503
+    assert breaker.state == "closed"
+    assert server.stats["requests"] == (lp.BREAKER_THRESHOLD - 1) * (lp.RETRY_MAX + 1)
+
+    lp.http_get(url)
+    assert breaker.state == "open"
+    requests_sent = server.stats["requests"]
+    with pytest.raises(lp.CircuitOpenError):
+        lp.http_get(url)
+    assert server.stats["requests"] == requests_sent
+
+def test_breaker_half_open_trial(lp, start_server, monkeypatch):
+    monkeypatch.setattr(lp, "BREAKER_COOLDOWN", 0.05)
+    server = start_server(error_rate=1.0)
+    url = f"{lp.BASE}/DRF/lawService.do?MST=200000"
+    for _ in range(lp.BREAKER_THRESHOLD):
+        lp.http_get(url)
+    breaker = lp.get_circuit_breaker(url)
+    assert breaker.state == "open"
+    time.sleep(0.1)
+    server.error_rate = 0.0
+    assert lp.http_get(url).status_code == 200
+    assert breaker.state == "closed"
+
+def test_stale_law_list_when_refresh_fails(lp, start_server, monkeypatch):
+    server = start_server()
+    monkeypatch.setattr(lp, "LIST_CACHE_TTL", 0.05)
+    fresh = lp.get_law_list_from_api(QUERY)
+    amendments = lp.run_amendment_logic(QUERY, "재판소")
+    time.sleep(0.1)
+    server.error_rate = 1.0
+    stale = lp.get_law_list_from_api(QUERY)
+    assert [law["MST"] for law in stale] == [law["MST"] for law in fresh]
+    assert all(law["stale_list"] and not law.get("stale_body") for law in stale)
+    # 본문은 파싱된 캐시로 처리하고 개정문마다 이전 자료 안내 표시
+    stale_amendments = lp.run_amendment_logic(QUERY, "재판소")
+    assert stale_amendments == [f"⚠️ {lp.STALE_NOTICE}<br>" + amendment for amendment in amendments]
+
+def test_stale_law_body_from_previous_version(lp, start_server):
+    server = start_server()
+    law = lp.get_law_list_from_api(QUERY)[0]
+    xml_data = lp.fetch_law_text(law)
+    assert not law.get("stale_body")
+
+    # 개정되어 MST 가 바뀐 법령을 받지 못하면 같은 법령ID 의 이전 버전 사용
+    server.error_rate = 1.0
+    revised = dict(law, MST="999999")
+    assert lp.fetch_law_text(revised) == xml_data
+    assert revised["stale_body"]
+
+def test_missing_law_body_without_stale_copy_raises(lp, start_server):
+    server = start_server()
+    law = lp.get_law_list_from_api(QUERY)[0]
+    server.error_rate = 1.0
+    with pytest.raises(lp.LawFetchError):
+        lp.fetch_law_text(law)
+    assert not law.get("stale_body")
+
+def test_stand_in_server_uses_separate_cache(lp, start_server):
+    start_server()
+    lp.run_amendment_logic(QUERY, "재판소")
+    cache_dir = lp.base_cache_dir(lp.CACHE_DIR)
+    assert cache_dir != lp.CACHE_DIR
+    for name in ("xml", "parsed", "by_id"):
+        assert not os.path.exists(os.path.join(lp.CACHE_DIR, name))
+        assert os.listdir(os.path.join(cache_dir, name))
+
+def test_sync_against_stand_in_keeps_default_mirror(lp, start_server):
+    mirror_xml = os.path.join(lp.MIRROR_DIR, "xml", "100.law")
+    lp.write_file_atomic(mirror_xml, lp.encode_blob(b"<law/>"))
+    start_server()
+    summary = lp.sync_law_mirror()
+    assert summary["failed"] == 0 and summary["removed"] == 0
+    assert os.path.exists(mirror_xml)
+
+def test_configure_fetch_policy_keeps_burst(lp, monkeypatch):
+    monkeypatch.setattr(lp, "RATE_BURST", 40)
+    lp.configure_fetch_policy(rate_limit=5)
+    assert (lp.RATE_LIMIT, lp.RATE_BURST) == (5, 40)
+    lp.configure_fetch_policy(burst=0)
+    assert lp.RATE_BURST == 5
+    lp.configure_fetch_policy(rate_limit=0)
+
+def test_breaker_trial_released_after_interrupt(lp, start_server, monkeypatch):
+    monkeypatch.setattr(lp, "BREAKER_COOLDOWN", 0.05)
+    server = start_server(error_rate=1.0)
+    url = f"{lp.BASE}/DRF/lawService.do?MST=200000"
+    for _ in range(lp.BREAKER_THRESHOLD):
+        lp.http_get(url)
+    time.sleep(0.1)
+
+    def interrupt(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    # 시험 요청이 결과를 기록하기 전에 중단되어도 다음 요청이 다시 시험할 수 있어야 함
+    with monkeypatch.context() as patch:
+        patch.setattr(lp, "_wait_for_rate_limit", interrupt)
+        with pytest.raises(KeyboardInterrupt):
+            lp.http_get(url)
+    server.error_rate = 0.0
+    assert lp.http_get(url).status_code == 200
+    assert lp.get_circuit_breaker(url).state == "closed"
+
+def test_exact_body_under_stale_list_is_parsed_cached(lp, start_server, monkeypatch):
+    server = start_server()
+    monkeypatch.setattr(lp, "LIST_CACHE_TTL", 0.05)
+    laws = lp.get_law_list_from_api(QUERY)
+    for law in laws:
+        lp.fetch_law_text(law)  # 본문만 받아 두고 파싱은 아직 안 함
+    time.sleep(0.1)
+    server.error_rate = 1.0
+    amendments = lp.run_amendment_logic(QUERY, "재판소")
+    assert amendments and all(lp.STALE_NOTICE in amendment for amendment in amendments)
+    # 목록만 이전 자료이고 본문은 그 MST 그대로이므로 파싱 결과를 캐시
+    assert all(lp.get_cached_parsed_law(law["MST"]) is not None for law in laws)
+
+def test_parse_law_without_cache(lp):
+    corpus = law_mock_server.build_corpus(laws=1, articles=3)
+    articles = lp.parse_law({"MST": corpus[0]["MST"]}, corpus[0]["xml"], cache=False)
+    assert articles
+    assert lp.load_parsed_law(corpus[0]["MST"]) is None
+
+def test_processes_use_parsed_cache_under_stale_list(lp, start_server, monkeypatch):
+    server = start_server()
+    monkeypatch.setattr(lp, "LIST_CACHE_TTL", 0.05)
+    amendments = lp.run_amendment_logic(QUERY, "재판소")
+    # 본문 XML 은 지우고 파싱된 법령만 디스크에 남김
+    xml_dir = os.path.join(lp.base_cache_dir(lp.CACHE_DIR), "xml")
+    for name in os.listdir(xml_dir):
+        os.remove(os.path.join(xml_dir, name))
+    lp.invalidate_parsed_law_cache()
+    time.sleep(0.1)
+    server.error_rate = 1.0
+    server.reset_stats()
+    stale_amendments = lp.run_amendment_logic(QUERY, "재판소", processes=2)
+    assert stale_amendments == [f"⚠️ {lp.STALE_NOTICE}<br>" + amendment for amendment in amendments]
+    assert server.stats["lawService"] == 0
+
+def test_processes_keep_stale_body_and_fetch_errors(lp, start_server):
+    server = start_server()
+    laws = lp.get_law_list_from_api(QUERY)[:2]
+    lp.fetch_law_text(laws[0])
+    server.error_rate = 1.0
+    # 첫 법령은 개정되어 MST 가 바뀐 것으로, 둘째 법령은 캐시된 본문이 없는 것으로
+    revised = [dict(laws[0], MST="999999"), laws[1]]
+    results = list(lp.run_law_processes(revised, lp.build_search_results, (QUERY,), processes=2))
+    (law, law_results, skip_reason), (failed, _, failed_reason) = results
+    assert law["stale_body"] and law_results and skip_reason is None
+    assert lp.get_cached_parsed_law("999999") is None
+    assert failed["fetch_error"] and failed_reason.startswith("본문을 받지 못함")
+
+def test_processes_report_unreadable_parsed_cache_without_body(lp, start_server):
+    server = start_server()
+    laws = lp.get_law_list_from_api(QUERY)
+    amendments = lp.run_amendment_logic(QUERY, "재판소")
+    # 첫 법령: 파싱 캐시는 읽을 수 없고 본문 XML 도 없음
+    mst = laws[0]["MST"]
+    lp.write_blob(lp._parsed_law_cache_path(mst), b"not marshal")
+    os.remove(lp._law_xml_cache_path(mst))
+    lp.invalidate_parsed_law_cache()
+    server.error_rate = 1.0
+    with pytest.raises(lp.LawFetchError) as info:
+        lp.run_amendment_logic(QUERY, "재판소", processes=2)
+    assert [law["MST"] for law in info.value.laws] == [mst]
+    name = laws[0]["법령명"]
+    assert len(info.value.results) == len([a for a in amendments if f" {name} 일부를" not in a])
+    assert not os.path.exists(lp._parsed_law_cache_path(mst))
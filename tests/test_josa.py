@@ -0,0 +1,39 @@
+"""조사 규칙 테스트
+
+data/josa_rules.json 의 [조사, 찾을 단어, 바꿀 단어, 개정 문장] 은 규칙 표로 바꾸기 전의 apply_josa_rule 이 낸 결과다.
+규칙 표의 모든 (조사, A 받침, B 받침, B ㄹ 받침) 조합과 따옴표가 붙은 조사, 규칙에 없는 조사, 같은 단어를 포함한다.
+"""
+import json
+import os
+from itertools import product
+
+import pytest
+
+import law_processor
+
+with open(os.path.join(os.path.dirname(__file__), "data", "josa_rules.json"), encoding="utf-8") as f:
+    KNOWN_RULES = json.load(f)
+
+def rule_key(josa, orig, replaced):
+    return (josa, law_processor.has_batchim(orig), law_processor.has_batchim(replaced),
+            law_processor.has_rieul_batchim(replaced))
+
+def test_rule_table_keys():
+    josas = [josa for josa in law_processor._JOSA_RULES if josa is not None]
+    variants = [None] + josas + ['"' + josa for josa in josas]
+    batchim_cases = [(True, True), (True, False), (False, False)]
+    expected = {(josa, orig_has_batchim) + case
+                for josa, orig_has_batchim, case in product(variants, (True, False), batchim_cases)}
+    assert set(law_processor._JOSA_RULE_TABLE) == expected
+
+def test_known_rules_cover_rule_table():
+    covered = {rule_key(josa, orig, replaced) for josa, orig, replaced, _ in KNOWN_RULES if orig != replaced}
+    assert set(law_processor._JOSA_RULE_TABLE) <= covered
+    # 규칙에 없는 조사와 같은 단어도 포함
+    assert any(josa not in law_processor._JOSA_RULES and (josa or "").lstrip('"') not in law_processor._JOSA_RULES
+               for josa, *_ in KNOWN_RULES)
+    assert any(orig == replaced for _, orig, replaced, _ in KNOWN_RULES)
+
+@pytest.mark.parametrize("josa, orig, replaced, expected", KNOWN_RULES)
+def test_apply_josa_rule(josa, orig, replaced, expected):
+    assert law_processor.apply_josa_rule(orig, replaced, josa) == expected
@@ -0,0 +1,79 @@
+"""개정 위치(Location) 정렬/묶기와 검색어 뒤 꼬리(조사, 접미사) 분류 테스트"""
+import random
+
+import pytest
+
+import law_processor
+from law_processor import Location
+
+def loc(조, 가지="", 항="", 호=None, 호가지=None, 목=None, title=False, outside=False):
+    return Location(조, 가지, 항, 호, 호가지, 목, title, outside)
+
+ORDERED = [
+    loc("2"),
+    loc("2", title=True),
+    loc("2", 항="1", outside=True),
+    loc("2", 항="1", 호="3."),
+    loc("2", 항="1", 호="3.", 목="가."),
+    loc("2", 항="1", 호="3.", 목="나."),
+    loc("2", 항="1", 호="3.", 호가지="2"),
+    loc("2", 항="1", 호="12."),
+    loc("2", 항="2"),
+    loc("2", "2"),
+    loc("10"),
+]
+
+def test_sort_key_orders_by_number_not_text():
+    shuffled = ORDERED[:]
+    random.Random(0).shuffle(shuffled)
+    assert sorted(shuffled, key=Location.sort_key) == ORDERED
+    assert [location.text() for location in ORDERED] == [
+        "제2조", "제2조 제목", "제2조제1항 각 목 외의 부분", "제2조제1항제3호", "제2조제1항제3호가목",
+        "제2조제1항제3호나목", "제2조제1항제3호의2", "제2조제1항제12호", "제2조제2항", "제2조의2", "제10조"]
+
+def test_group_locations():
+    shuffled = ORDERED[::-1] + ORDERED[:3]
+    assert law_processor.group_locations(shuffled) == (
+        "제2조, 제2조 제목, 제2조제1항 각 목 외의 부분, 제2조제1항제3호ㆍ제3호가목ㆍ제3호나목ㆍ제3호의2ㆍ제12호 "
+        "및 제2조제2항, 제2조의2 및 제10조")
+    assert law_processor.group_locations([]) == ""
+    # 조번호가 숫자가 아니면 빼고, 호번호가 숫자가 아니면 호 아래는 표시하지 않음
+    assert law_processor.group_locations([loc("부칙"), loc("3", 항="1", 호="3의2.")]) == "제3조제1항"
+
+def test_subitem_without_number():
+    # 목번호가 없는 목은 "None목" 이 아니라 "목" 으로 표시
+    assert loc("3", 항="1", 호="2.", 목="").item_text() == "제2호목"
+    assert law_processor.group_locations([loc("3", 항="1", 호="2.", 목=""), loc("3", 항="1", 호="2.", 목="가.")]) \
+        == "제3조제1항제2호가목ㆍ제2호목"
+
+def test_amendment_with_unnumbered_subitem(parse_articles):
+    articles = parse_articles("<조문번호>3</조문번호><조문여부>조문</조문여부><조문내용>제3조(관할)</조문내용>"
+                              "<항><항번호>①</항번호><항내용>① 다음 각 호와 같다.</항내용>"
+                              "<호><호번호>2.</호번호><호내용>2. 다음 각 목</호내용>"
+                              "<목><목내용>지방법원의 장</목내용></목></호></항>")
+    rules = law_processor.build_amendment_rules(articles, "지방법원", "지역법원")
+    assert rules == ['제3조제1항제2호목 중 "지방법원"을 "지역법원"으로 한다.']
+
+@pytest.mark.parametrize("token, expected", [
+    ("지방법원", ("지방법원", None, None)),
+    ("지방법원을", ("지방법원", "을", None)),
+    ("지방법원으로서", ("지방법원", "으로서", None)),
+    ("지방법원\"란", ("지방법원", "란", None)),
+    ("지방법원\"이라", ("지방법원", "이라", None)),
+    ("지방법원에", ("지방법원", None, "에")),
+    ("지방법원등의", ("지방법원", None, "등의")),
+    ("지방법원만으로", ("지방법원", None, "만으로")),
+    ("지방법원장", ("지방법원장", None, None)),
+    ("지방법원의장", ("지방법원의장", None, None)),
+    ("서울지방법원", ("서울지방법원", None, None)),
+])
+def test_extract_chunk_and_josa(token, expected):
+    assert law_processor.extract_chunk_and_josa(token, "지방법원") == expected
+
+def test_chunk_tails_table():
+    # 접미사는 조사보다 우선, 따옴표가 있는 조사는 따옴표를 뗀 조사로
+    assert all(law_processor._CHUNK_TAILS[suffix] == (None, suffix) for suffix in law_processor._SUFFIX_EXCLUDE)
+    for josa in law_processor._JOSA_LIST:
+        if josa not in law_processor._SUFFIX_EXCLUDE:
+            assert law_processor._CHUNK_TAILS[josa] == (josa.lstrip('"'), None)
+    assert len(law_processor._CHUNK_TAILS) == len(set(law_processor._SUFFIX_EXCLUDE + law_processor._JOSA_LIST))
@@ -0,0 +1,83 @@
+"""로컬 미러 테스트: 바뀐 법률만 받는 증분 동기화와 OFFLINE 검색"""
+import os
+
+import pytest
+
+MARK = "개정시험문구"
+
+def mirrored_msts(lp):
+    return {name[:-len(".law")] for name in os.listdir(os.path.join(lp.base_cache_dir(lp.MIRROR_DIR), "xml"))}
+
+def revise(server, law, mst):
+    """법률을 새 MST 의 개정 버전으로 교체 (법령ID 는 그대로)"""
+    xml = law["xml"].replace("</조문내용>".encode("utf-8"), f" {MARK}</조문내용>".encode("utf-8"), 1)
+    revised = dict(law, MST=mst, xml=xml, text=xml.decode("utf-8"))
+    server.corpus[server.corpus.index(law)] = revised
+    del server.by_mst[law["MST"]]
+    server.by_mst[mst] = revised
+    return revised
+
+@pytest.fixture
+def synced(lp, start_server):
+    server = start_server()
+    summary = lp.sync_law_mirror()
+    assert summary == {"total": 24, "fetched": 24, "unchanged": 0, "removed": 0, "failed": 0}
+    server.reset_stats()
+    return server
+
+def test_sync_fetches_only_changed_laws(lp, synced):
+    server = synced
+    revised = revise(server, server.corpus[3], "900001")
+    dropped = server.corpus.pop(10)
+    del server.by_mst[dropped["MST"]]
+    added = dict(server.corpus[0], MST="900002", 법령ID="9999", 법령명="새로 만든 법률")
+    server.corpus.append(added)
+    server.by_mst[added["MST"]] = added
+
+    summary = lp.sync_law_mirror()
+    assert summary == {"total": 24, "fetched": 2, "unchanged": 22, "removed": 2, "failed": 0}
+    assert server.stats["lawService"] == 2
+    assert mirrored_msts(lp) == {law["MST"] for law in server.corpus}
+    assert [law["MST"] for law in lp.load_mirror_manifest()["laws"]] == [law["MST"] for law in server.corpus]
+    assert lp.get_mirrored_law_xml(revised["MST"]) == revised["xml"]
+
+    server.reset_stats()
+    assert lp.sync_law_mirror()["fetched"] == 0
+    assert server.stats["lawService"] == 0
+
+def test_sync_aborted_without_full_list(lp, synced):
+    server = synced
+    revise(server, server.corpus[5], "900003")
+    server.error_rate = 1.0
+    with pytest.raises(lp.LawFetchError):
+        lp.sync_law_mirror()  # 목록을 못 받으면 미러를 건드리지 않음
+    assert len(mirrored_msts(lp)) == 24
+    server.error_rate = 0.0
+    lp.reset_circuit_breakers()
+    assert lp.sync_law_mirror()["fetched"] == 1
+    assert "900003" in mirrored_msts(lp)
+
+def test_offline_search_uses_mirror(lp, synced, monkeypatch):
+    server = synced
+    revise(server, server.corpus[7], "900004")
+    lp.sync_law_mirror()
+    online = {query: lp.run_search_logic(query) for query in ("지방법원", MARK)}
+    amendments = lp.run_amendment_logic("법원", "재판소")
+
+    monkeypatch.setattr(lp, "OFFLINE", True)
+    monkeypatch.setattr(lp, "CACHE_ENABLED", False)
+    lp.invalidate_law_list_cache()
+    lp.invalidate_parsed_law_cache()
+    server.reset_stats()
+    found, complete = lp.search_law_mirror(MARK)
+    assert complete and [law["MST"] for law in found] == ["900004"]
+    assert lp.search_law_mirror("<조문내용>")[0] == []  # 태그 안의 글자는 찾지 않음
+    assert all(online.values()) and amendments
+    assert {query: lp.run_search_logic(query) for query in online} == online
+    assert lp.run_amendment_logic("법원", "재판소") == amendments
+    assert server.stats["requests"] == 0
+
+def test_offline_without_mirror(lp, monkeypatch):
+    monkeypatch.setattr(lp, "OFFLINE", True)
+    with pytest.raises(lp.LawFetchError, match="로컬 미러가 없습니다"):
+        lp.search_law_mirror("법원")
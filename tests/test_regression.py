@@ -0,0 +1,80 @@
+"""출력 회귀 테스트
+
+data/regression.json 은 최적화 이전 law_processor 로 같은 대체 서버 corpus 에서 만든 검색 결과와 개정문이다.
+처리 방식(스레드/프로세스, 검색어별/오토마톤, 한 쌍/여러 쌍)을 바꿔도 출력은 같아야 한다.
+"""
+import json
+import os
+
+import pytest
+
+import law_mock_server
+
+SEARCHES = ["지방법원", "법원", "행정기관", "공무원", "없는단어"]
+AMENDS = [("지방법원", "지역법원"), ("법원", "재판소"), ("행정기관", "행정청"), ("검사", "검찰관"),
+          ("공무원", "직원"), ("법원", "법원"), ("지방자치단체", "지자체")]
+ENGINE_PAIRS = [("지방법원", "지역법원"), ("법원", "재판소"), ("행정기관", "행정청"), ("검사", "검찰관"),
+                ("공무원", "직원"), ("법원", "법원"), ("장관", "대신"), ("원", "청"), ("의", "에")]
+
+def run_all(lp, **kwargs):
+    results = {}
+    for query in SEARCHES:
+        results["search:" + query] = lp.run_search_logic(query, **kwargs)
+    for find_word, replace_word in AMENDS:
+        results[f"amend:{find_word}>{replace_word}"] = lp.run_amendment_logic(find_word, replace_word, **kwargs)
+    return results
+
+def test_output_matches_regression_data(lp, start_server):
+    with open(os.path.join(os.path.dirname(__file__), "data", "regression.json"), encoding="utf-8") as f:
+        expected = json.load(f)
+    start_server()
+    assert run_all(lp) == expected
+
+def test_processes_match_threads(lp, start_server):
+    start_server()
+    threaded = run_all(lp)
+    lp.invalidate_parsed_law_cache()
+    assert run_all(lp, processes=2) == threaded
+
+@pytest.fixture(scope="module")
+def corpus_articles():
+    import law_processor
+    laws = []
+    for seed in (1, 2):
+        for law in law_mock_server.build_corpus(laws=30, articles=20, term_rate=0.2, seed=seed):
+            laws.append(law_processor.parse_law({"MST": law["MST"]}, law["xml"], cache=False))
+    return laws
+
+def test_automaton_matches_per_term_scan(lp, monkeypatch, corpus_articles):
+    for articles in corpus_articles:
+        monkeypatch.setattr(lp, "AUTOMATON_MIN_TERMS", 10 ** 9)
+        per_term = lp.build_batch_amendment_rules(articles, ENGINE_PAIRS)
+        monkeypatch.setattr(lp, "AUTOMATON_MIN_TERMS", 1)
+        assert lp.build_batch_amendment_rules(articles, ENGINE_PAIRS) == per_term
+
+def test_batch_matches_separate_pairs(lp, corpus_articles):
+    pairs = [("지방법원", "지역법원"), ("행정기관", "행정청"), ("공무원", "직원")]
+    for articles in corpus_articles:
+        separate = [lp.build_amendment_rules(articles, *pair) for pair in pairs]
+        batch = lp.build_batch_amendment_rules(articles, pairs)
+        if not any(separate):
+            assert batch is None
+            continue
+        rules, overlap_notes = batch
+        assert rules == [rule for pair_rules in separate if pair_rules for rule in pair_rules]
+        assert overlap_notes == []
+
+def test_term_automaton_matches_str_find(corpus_articles):
+    import law_processor
+    terms = sorted({find_word for find_word, _ in ENGINE_PAIRS})
+    automaton = law_processor.TermAutomaton(terms)
+    for articles in corpus_articles[:10]:
+        for _, text, _ in law_processor.iter_law_text_records(articles):
+            if not text:
+                continue
+            expected = {}
+            for idx, term in enumerate(terms):
+                starts = [i for i in range(len(text)) if text.startswith(term, i)]
+                if starts:
+                    expected[idx] = starts
+            assert {idx: list(starts) for idx, starts in automaton.find(text).items()} == expected
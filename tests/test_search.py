@@ -0,0 +1,44 @@
+"""검색 결과 하이라이트 테스트 (공백, 줄바꿈에 걸친 검색어)"""
+import pytest
+
+import law_processor
+
+@pytest.mark.parametrize("text, expected", [
+    ("지방법원", "<mark>지방법원</mark>"),
+    ("관할 지방 법원의 장", "관할 <mark>지방 법원</mark>의 장"),
+    ("지 방\t법  원과 지방법원", "<mark>지 방\t법  원</mark>과 <mark>지방법원</mark>"),
+    ("관할 지방\n  법원의 장", "관할 <mark>지방</mark>\n  <mark>법원</mark>의 장"),
+    ("지방\r\n\r\n법원", "<mark>지방</mark>\r\n\r\n<mark>법원</mark>"),
+    ("지방행정기관", "지방행정기관"),
+    ("", ""),
+])
+def test_highlight_ignores_whitespace(text, expected):
+    assert law_processor.highlight(text, "지방법원") == expected
+    assert law_processor.highlight(text, "지방 법원") == expected
+
+def test_highlight_without_query():
+    assert law_processor.highlight("지방 법원", " ") == "지방 법원"
+
+ARTICLE = ("<조문번호>3</조문번호><조문여부>조문</조문여부><조문제목>관할</조문제목><조문내용>제3조(관할)</조문내용>"
+           "<항><항번호>①</항번호><항내용>① 사건은 지방 법원이 관할한다.</항내용></항>"
+           "<항><항번호>②</항번호><항내용>② 다음 각 호와 같다.</항내용>"
+           "<호><호번호>1.</호번호><호내용>1. 다음 각 목의 사람</호내용>"
+           "<목><목번호>가.</목번호><목내용><![CDATA[가. 관할 지방\n  법원의 장\n  1) 지방검찰청의 장]]></목내용></목>"
+           "</호></항>")
+
+def test_search_marks_spaced_match_in_paragraph(parse_articles):
+    articles = parse_articles(ARTICLE)
+    [result] = law_processor.build_search_results(articles, "지방법원")
+    assert result.startswith("제3조(관할) ① 사건은 <mark>지방 법원</mark>이 관할한다.<br>② 다음 각 호와 같다.<br>")
+
+def test_search_marks_match_across_line_break_in_subitem(parse_articles):
+    articles = parse_articles(ARTICLE)
+    [result] = law_processor.build_search_results(articles, "지방법원")
+    # 목 안의 줄은 하나씩 들여써서 표시하고, 검색어도 줄마다 따로 표시
+    assert result.endswith("<div style='margin:0;padding:0'>&nbsp;&nbsp;&nbsp;&nbsp;가. 관할 <mark>지방</mark><br>"
+                           "&nbsp;&nbsp;&nbsp;&nbsp;<mark>법원</mark>의 장<br>"
+                           "&nbsp;&nbsp;&nbsp;&nbsp;1) 지방검찰청의 장</div>")
+    assert result.count("<mark>") == 3
+
+def test_search_without_match(parse_articles):
+    assert law_processor.build_search_results(parse_articles(ARTICLE), "행정기관") == []
@@ -0,0 +1,33 @@
+"""XML 파서(lxml, etree)별 조문 파싱 결과 비교"""
+import pytest
+
+import law_mock_server
+import law_processor
+
+pytest.importorskip("lxml")
+
+def element_tree(elem):
+    return (elem.tag, elem.text, [element_tree(child) for child in elem])
+
+@pytest.fixture(scope="module")
+def corpus():
+    return law_mock_server.build_corpus(laws=15, articles=12, seed=3)
+
+def test_lxml_matches_etree(corpus):
+    for law in corpus:
+        expected = [element_tree(elem) for elem in law_processor.iter_law_articles(law["xml"], "etree")]
+        assert expected
+        assert [element_tree(elem) for elem in law_processor.iter_law_articles(law["xml"], "lxml")] == expected
+
+def test_lxml_builds_same_articles(corpus):
+    for law in corpus[:5]:
+        # 파싱 캐시에 저장하는 행 형식으로 비교 (LawArticle 은 값 비교를 하지 않음)
+        rows = [law_processor._law_to_rows([law_processor.build_law_article(elem)
+                                            for elem in law_processor.iter_law_articles(law["xml"], backend)])
+                for backend in ("etree", "lxml")]
+        assert rows[0] == rows[1]
+
+@pytest.mark.parametrize("backend", ["etree", "lxml"])
+def test_broken_xml_is_skipped(corpus, backend):
+    with pytest.raises(law_processor.LawSkip, match="XML 파싱 오류"):
+        list(law_processor.iter_law_articles(corpus[0]["xml"][:-200], backend))